@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the AI analysis path (/ai-analyze-resume)
+
+Runs fully offline: the OpenAI-compatible stand-in from llm_stub.py is started
+on a local port, the backend is pointed at it through OPENROUTER_BASE_URL and
+driven in-process over ASGI. Use --url to benchmark an already running backend
+instead (configure that backend's OPENROUTER_BASE_URL yourself).
+
+    python benchmarks/bench_ai_path.py --requests 200 --concurrency 1,8,32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+import uvicorn
+
+SAMPLE_RESUME = """Jane Doe
+jane.doe@example.com | +1 555 123 4567 | linkedin.com/in/janedoe | github.com/janedoe
+
+Summary
+Backend engineer with 6 years of experience building Python and Java services.
+
+Skills
+Python, FastAPI, Java, Spring, SQL, PostgreSQL, Docker, Kubernetes, AWS, Redis, Git
+
+Experience
+Senior Software Engineer, Acme Corp  |  2020 - Present
+- Designed REST and GraphQL APIs serving 20M requests per day
+- Cut p99 latency by 40% by introducing Redis caching
+- Led migration of 30 services to Kubernetes on AWS
+
+Education
+B.Sc. Computer Science, State University | 2018
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub(port: int) -> uvicorn.Server:
+    """Start llm_stub.app on a background thread and wait until it accepts requests"""
+    import llm_stub
+
+    server = uvicorn.Server(uvicorn.Config(llm_stub.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("LLM stub did not start")
+        time.sleep(0.05)
+    return server
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, total: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+    form = {
+        "job_category": "Technology",
+        "job_role": "Backend Developer",
+        "text": SAMPLE_RESUME,
+    }
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                response = await client.post("/ai-analyze-resume", data=form)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else 0.0,
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "max_ms": round(max(latencies), 1) if latencies else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark a running backend instead of the in-process app")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per concurrency level")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--latency-ms", type=float, default=300, help="Stub base latency")
+    parser.add_argument("--jitter-ms", type=float, default=50, help="Stub latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stub injected error rate")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=120.0)
+    else:
+        os.environ["STUB_LATENCY_MS"] = str(args.latency_ms)
+        os.environ["STUB_JITTER_MS"] = str(args.jitter_ms)
+        os.environ["STUB_ERROR_RATE"] = str(args.error_rate)
+        os.environ["STUB_SEED"] = "7"
+        port = _free_port()
+        start_stub(port)
+        os.environ["OPENROUTER_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+        os.environ.setdefault("OPENROUTER_API_KEY", "stub")
+        import main as backend
+
+        # Keep benchmark analyses out of the real dashboard storage
+        scratch = tempfile.mkdtemp(prefix="cvision-bench-")
+        backend._ANALYSES_JSON = os.path.join(scratch, "analyses.json")
+        backend._UPLOADS_DIR = scratch
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=backend.app), base_url="http://bench", timeout=120.0
+        )
+
+    results = []
+    async with client:
+        for level in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            result = await run_level(client, level, args.requests)
+            results.append(result)
+            print(
+                f"c={result['concurrency']:>3}  {result['throughput_rps']:>8.2f} req/s  "
+                f"p50={result['p50_ms']:>8.1f} ms  p99={result['p99_ms']:>8.1f} ms  errors={result['errors']}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "ai_path", "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the standard analysis pipeline, stage by stage
+
+Generates a reproducible corpus of synthetic resumes (short, medium and long)
+in PDF, DOCX and plain text, and job-description fixtures from roles.json,
+then times every stage the analyzer runs:
+
+    extract.pdf / extract.docx / extract.txt   extract_text_from_upload
+    normalize_tokenize                         normalize_text + tokenize
+    keyword_match                              score_keyword_match
+    sections_format                            score_sections + score_format
+    build_docx                                 build_resume_docx
+    analyze_resume.<format>                    POST /analyze-resume (in-process ASGI)
+
+Results are written as JSON (with the commit they were measured at) so runs
+can be compared across commits:
+
+    python benchmarks/bench_e2e.py --output before.json
+    python benchmarks/bench_e2e.py --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import UploadFile
+
+import main as backend
+from bench_pdf_extract import text_pdf
+from main import ResumeBuildRequest
+
+LENGTHS = {"short": (1, 2), "medium": (3, 4), "long": (6, 5)}  # (jobs, bullets per job)
+VERBS = ["Built", "Designed", "Led", "Migrated", "Automated", "Reduced", "Improved", "Shipped", "Owned", "Mentored"]
+OBJECTS = [
+    "the billing service", "a data pipeline", "CI/CD workflows", "the public REST API", "dashboards for analytics",
+    "a caching layer", "the onboarding flow", "model training jobs", "infrastructure as code", "the search backend",
+]
+OUTCOMES = ["cutting latency by 40%", "saving $200k a year", "for 2M users", "with zero downtime", "ahead of schedule", ""]
+SOFT_SKILLS = ["Communication", "Leadership", "Mentoring", "Collaboration"]
+FILLER = "Strong ownership, clear written communication and a bias for shipping are expected."
+
+
+def load_roles():
+    with open(os.path.join(BACKEND_DIR, "roles.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def job_descriptions(roles, rng: random.Random):
+    """One job-description fixture per role: title, most required skills, filler"""
+    fixtures = []
+    for category, category_roles in roles.items():
+        for role, skills in category_roles.items():
+            asked = rng.sample(skills, k=max(1, int(len(skills) * 0.7)))
+            text = (
+                f"We are hiring a {role} to join our {category} team. "
+                f"You will work with {', '.join(asked[:-1])} and {asked[-1]}. "
+                f"Experience with {rng.choice(skills)} in production is a plus. {FILLER}"
+            )
+            fixtures.append({"category": category, "role": role, "skills": skills, "description": text})
+    return fixtures
+
+
+def synthetic_payload(rng: random.Random, fixture: dict, length: str, index: int) -> ResumeBuildRequest:
+    """A builder payload that mentions a random share of the role's skills"""
+    jobs, bullets = LENGTHS[length]
+    known = rng.sample(fixture["skills"], k=max(1, int(len(fixture["skills"]) * rng.uniform(0.3, 0.9))))
+
+    def bullet():
+        line = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(known)} {rng.choice(OUTCOMES)}"
+        return line.strip()
+
+    return ResumeBuildRequest(**{
+        "personalInfo": {
+            "fullName": f"Candidate {index}",
+            "email": f"candidate{index}@example.com",
+            "phone": "+1 555 0100",
+            "location": "Remote",
+            "linkedin": f"linkedin.com/in/candidate{index}",
+        },
+        "summary": f"{fixture['role']} with {jobs * 2} years of experience in {', '.join(known[:3])}.",
+        "experience": [
+            {
+                "company": f"Company {j}",
+                "position": fixture["role"],
+                "startDate": str(2010 + 2 * j),
+                "endDate": str(2012 + 2 * j),
+                "description": f"Worked on {rng.choice(OBJECTS)}.",
+                "responsibilities": [bullet() for _ in range(bullets)],
+                "achievements": [bullet() for _ in range(max(1, bullets // 2))],
+            }
+            for j in range(jobs)
+        ],
+        "education": [{"school": "State University", "degree": "BSc", "field": "Computer Science", "graduationDate": "2010"}],
+        "projects": [{"name": f"Project {index}", "technologies": ", ".join(known[:2]), "description": bullet()}] if length != "short" else [],
+        "skills": {"technical": known, "soft": rng.sample(SOFT_SKILLS, 2), "tools": ["Git"]},
+        "template": rng.choice(backend.RESUME_TEMPLATES),
+    })
+
+
+def build_corpus(count: int, seed: int):
+    """Reproducible (payload, fixture, files) triples; files maps format -> (filename, bytes)"""
+    rng = random.Random(seed)
+    fixtures = job_descriptions(load_roles(), rng)
+    corpus = []
+    for i in range(count):
+        fixture = fixtures[i % len(fixtures)]
+        length = list(LENGTHS)[i % len(LENGTHS)]
+        payload = synthetic_payload(rng, fixture, length, i)
+        text = backend.resume_payload_text(payload)
+        files = {
+            "pdf": (f"resume_{i}.pdf", text_pdf(text.splitlines())),
+            "docx": (f"resume_{i}.docx", backend.build_resume_docx(payload)),
+            "txt": (f"resume_{i}.txt", text.encode("utf-8")),
+        }
+        corpus.append({"length": length, "payload": payload, "fixture": fixture, "text": text, "files": files})
+    return corpus
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "per_sec": round(len(samples) / sum(samples), 1) if sum(samples) else None,
+    }
+
+
+def timed(samples, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    samples.append(time.perf_counter() - start)
+    return result
+
+
+def run_stages(corpus, repeat: int):
+    stages = {}
+
+    def stage(name):
+        return stages.setdefault(name, [])
+
+    for _ in range(repeat):
+        for doc in corpus:
+            for fmt, (filename, data) in doc["files"].items():
+                timed(stage(f"extract.{fmt}"), backend.extract_text_from_upload, UploadFile(file=io.BytesIO(data), filename=filename))
+            text, skills = doc["text"], doc["fixture"]["skills"]
+            timed(stage("normalize_tokenize"), lambda: backend.tokenize(backend.normalize_text(text)))
+            timed(stage("keyword_match"), backend.score_keyword_match, text, skills)
+            timed(stage("sections_format"), lambda: (backend.score_sections(text), backend.score_format(text, len(text))))
+            timed(stage("build_docx"), backend.build_resume_docx, doc["payload"])
+    return stages
+
+
+async def run_endpoint(corpus, repeat: int):
+    stages = {}
+    transport = httpx.ASGITransport(app=backend.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60.0) as client:
+        for _ in range(repeat):
+            for doc in corpus:
+                for fmt, (filename, data) in doc["files"].items():
+                    form = {
+                        "job_category": doc["fixture"]["category"],
+                        "job_role": doc["fixture"]["role"],
+                        "custom_job_description": doc["fixture"]["description"],
+                    }
+                    start = time.perf_counter()
+                    response = await client.post("/analyze-resume", data=form, files={"file": (filename, data)})
+                    stages.setdefault(f"analyze_resume.{fmt}", []).append(time.perf_counter() - start)
+                    response.raise_for_status()
+                    # Keep the persisted list constant-size so every request writes the same amount
+                    backend.resume_analyses_storage.clear()
+    return stages
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=24, help="Synthetic resumes to generate")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.docs, args.seed)
+    by_length = {length: sum(1 for d in corpus if d["length"] == length) for length in LENGTHS}
+    print(f"{len(corpus)} resumes {by_length}, {len({d['fixture']['role'] for d in corpus})} roles")
+
+    # Uploads and analyses go to a scratch directory, not the real storage
+    saved_storage = list(backend.resume_analyses_storage)
+    scratch = tempfile.mkdtemp(prefix="bench_e2e_")
+    backend._UPLOADS_DIR = scratch
+    backend._ANALYSES_JSON = os.path.join(scratch, "analyses.json")
+    backend.resume_analyses_storage.clear()
+    try:
+        # One untimed pass so lazy imports and caches are not billed to the first sample
+        run_stages(corpus[:3], 1)
+        asyncio.run(run_endpoint(corpus[:1], 1))
+        stages = run_stages(corpus, args.repeat)
+        stages.update(asyncio.run(run_endpoint(corpus, args.repeat)))
+    finally:
+        backend.resume_analyses_storage[:] = saved_storage
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    results = {
+        "benchmark": "e2e",
+        "commit": current_commit(),
+        "documents": len(corpus),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "stages": {name: summarize(samples) for name, samples in stages.items()},
+    }
+    previous = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f).get("stages", {})
+
+    for name, row in results["stages"].items():
+        line = f"{name:<22} mean={row['mean_ms']:9.3f}ms  p50={row['p50_ms']:9.3f}ms  p95={row['p95_ms']:9.3f}ms"
+        if name in previous and row["mean_ms"]:
+            line += f"  vs {previous[name]['mean_ms']:.3f}ms ({previous[name]['mean_ms'] / row['mean_ms']:.2f}x)"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
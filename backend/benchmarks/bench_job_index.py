@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the local BM25 job index (job_index.py)
+
+Generates a synthetic posting corpus from mock_jobs.json vocabulary, ingests
+it in batches into a temporary index and reports ingest rate, load time and
+search latency percentiles for typical queries.
+
+    python benchmarks/bench_job_index.py --docs 200000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from job_index import JobIndex
+
+QUERIES = [
+    ("software engineer", "", "full_time"),
+    ("python", "remote", "full_time"),
+    ("react typescript frontend", "", "full_time"),
+    ("machine learning", "san francisco", "full_time"),
+    ("devops kubernetes", "", "contract"),
+    ("", "seattle", "full_time"),
+    ("data analyst sql", "", "part_time"),
+]
+
+
+def synthetic_jobs(count: int, seed: int = 42):
+    with open(os.path.join(BACKEND_DIR, "mock_jobs.json"), "r", encoding="utf-8") as f:
+        templates = json.load(f)
+    words = sorted({w for t in templates for w in t["description"].split()})
+    rng = random.Random(seed)
+    for i in range(count):
+        base = rng.choice(templates)
+        yield {
+            **base,
+            "id": f"syn-{i}",
+            "company": rng.choice(templates)["company"],
+            "location": rng.choice(templates)["location"],
+            "type": rng.choice(templates)["type"],
+            "description": " ".join(rng.choice(words) for _ in range(rng.randint(30, 90))),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query (cache cleared)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = {"benchmark": "job_index", "docs": args.docs, "queries": []}
+    with tempfile.TemporaryDirectory(prefix="cvision-index-") as path:
+        index = JobIndex(path, flush_threshold=args.batch)
+        start = time.perf_counter()
+        batch = []
+        for job in synthetic_jobs(args.docs):
+            batch.append(job)
+            if len(batch) >= args.batch:
+                index.add(batch)
+                batch = []
+        index.add(batch)
+        index.flush()
+        ingest = time.perf_counter() - start
+        results["ingest_docs_per_sec"] = round(args.docs / ingest, 1)
+        print(f"ingested {args.docs} docs in {ingest:.1f}s ({results['ingest_docs_per_sec']} docs/s), {index.stats()}")
+        index.close()
+
+        start = time.perf_counter()
+        index = JobIndex(path)
+        results["load_seconds"] = round(time.perf_counter() - start, 3)
+        print(f"reopened index in {results['load_seconds']}s")
+
+        for keyword, location, job_type in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                index._changed()  # drop the query cache so every run is cold
+                t = time.perf_counter()
+                page = index.search(keyword, location, job_type, page=0)
+                timings.append((time.perf_counter() - t) * 1000)
+            t = time.perf_counter()
+            index.search(keyword, location, job_type, page=1)
+            cached_ms = (time.perf_counter() - t) * 1000
+            row = {
+                "keyword": keyword,
+                "location": location,
+                "job_type": job_type,
+                "hits": page["total_jobs"],
+                "p50_ms": round(statistics.median(timings), 2),
+                "max_ms": round(max(timings), 2),
+                "next_page_ms": round(cached_ms, 3),
+            }
+            results["queries"].append(row)
+            print(
+                f"{keyword or '<browse>':<28} {location or '-':<14} {job_type:<10} hits={row['hits']:>7} "
+                f"p50={row['p50_ms']:>8.2f} ms  max={row['max_ms']:>8.2f} ms  next page={row['next_page_ms']:.3f} ms"
+            )
+        index.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
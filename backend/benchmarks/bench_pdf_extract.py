@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the PDF text extraction backends (pdf_text.py)
+
+Runs every registered backend, plus the default fallback policy, over a
+corpus of PDFs and reports pages/sec and agreement with the reference
+``pdfminer`` output (similarity of the word sequences, 1.0 = same words in
+the same order). Without ``--corpus`` a synthetic corpus of resume-like
+PDFs is generated, including two-column pages and documents whose words
+are positioned without space glyphs (as LaTeX output often is).
+
+    python benchmarks/bench_pdf_extract.py --corpus ~/resumes --repeat 3
+
+With ``--parallel`` it instead compares sequential extraction against the
+page-range process pool (``PageParallelism``) on synthetic documents of
+growing page counts, cold (first document on a fresh pool) and warm, to
+find the PDF_PARALLEL_MIN_PAGES where the pool starts to pay off:
+
+    python benchmarks/bench_pdf_extract.py --parallel --workers 4
+"""
+
+import argparse
+import difflib
+import glob
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from pdf_text import PDF_EXTRACTORS, PageParallelism, extract_pdf_text, resolve_chain
+
+WORDS = (
+    "python javascript react docker kubernetes aws sql postgresql redis api design led team built "
+    "improved latency pipeline deployed service customers revenue analytics dashboard tests migrated "
+    "architecture backend frontend mentoring reduced cost automated monitoring data model training"
+).split()
+SECTIONS = ["Summary", "Skills", "Experience", "Education", "Projects", "Certifications"]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _line_ops(x: float, y: float, text: str, glued: bool) -> str:
+    if not glued:
+        return f"BT /F1 10 Tf {x} {y} Td ({_escape(text)}) Tj ET\n"
+    # Words placed by kerning offsets instead of space glyphs
+    parts = " -250 ".join(f"({_escape(w)})" for w in text.split())
+    return f"BT /F1 10 Tf {x} {y} Td [{parts}] TJ ET\n"
+
+
+def synthetic_pdf(rng: random.Random, pages: int, columns: int, glued: bool) -> bytes:
+    """A minimal valid PDF with resume-like text in one or two columns"""
+    contents = []
+    for _ in range(pages):
+        ops = []
+        for col in range(columns):
+            x = 50 + col * 270
+            y = 760
+            while y > 60:
+                if rng.random() < 0.12:
+                    ops.append(_line_ops(x, y, rng.choice(SECTIONS), glued))
+                else:
+                    n = rng.randint(4, 9 if columns == 2 else 14)
+                    ops.append(_line_ops(x, y, "- " + " ".join(rng.choice(WORDS) for _ in range(n)), glued))
+                y -= 14
+        contents.append("".join(ops).encode("latin-1"))
+    return write_pdf(contents)
+
+
+def text_pdf(lines, lines_per_page: int = 50) -> bytes:
+    """A PDF showing the given lines top to bottom, one text line each"""
+    contents = []
+    for start in range(0, max(1, len(lines)), lines_per_page):
+        ops = [_line_ops(50, 760 - 14 * i, line, False) for i, line in enumerate(lines[start:start + lines_per_page]) if line]
+        contents.append("".join(ops).encode("latin-1", "replace"))
+    return write_pdf(contents)
+
+
+def write_pdf(contents) -> bytes:
+    """Wrap page content streams (Helvetica as /F1) into a PDF file"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for content in contents:
+        page_id = len(objects) + 1
+        kids.append(f"{page_id} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        )
+        objects.append(content)
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        if isinstance(obj, bytes):
+            out += f"{number} 0 obj\n<< /Length {len(obj)} >>\nstream\n".encode() + obj + b"\nendstream\nendobj\n"
+        else:
+            out += f"{number} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{off:010d} 00000 n \n" for off in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def synthetic_corpus(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield f"synthetic-{i}.pdf", synthetic_pdf(rng, pages=rng.choice([1, 1, 2, 3]), columns=rng.choice([1, 1, 2]), glued=i % 5 == 4)
+
+
+def agreement(text: str, reference: str) -> float:
+    a, b = text.split(), reference.split()
+    if not a and not b:
+        return 1.0
+    return difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def bench_parallel(args):
+    rng = random.Random(7)
+    extractor = PDF_EXTRACTORS["pdfminer"]
+    results = {"benchmark": "pdf_parallel", "workers": args.workers, "page_counts": []}
+    print(f"{'pages':>6} {'sequential':>11} {'cold':>9} {'warm':>9} {'speedup':>8}")
+    for pages in args.page_counts:
+        data = synthetic_pdf(rng, pages=pages, columns=1, glued=False)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            expected = extractor.extract(data)
+        sequential = (time.perf_counter() - start) / args.repeat
+
+        pool = PageParallelism(min_pages=1, workers=args.workers, pages_per_task=args.pages_per_task, max_pages=pages)
+        try:
+            start = time.perf_counter()
+            assert pool.extract(extractor, data) == expected
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                assert pool.extract(extractor, data) == expected
+            warm = (time.perf_counter() - start) / args.repeat
+        finally:
+            pool.shutdown()
+        row = {"pages": pages, "sequential_s": round(sequential, 3), "cold_s": round(cold, 3), "warm_s": round(warm, 3),
+               "speedup": round(sequential / warm, 2)}
+        results["page_counts"].append(row)
+        print(f"{pages:>6} {sequential:>10.3f}s {cold:>8.3f}s {warm:>8.3f}s {row['speedup']:>7.2f}x")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of PDF files (default: synthetic corpus)")
+    parser.add_argument("--docs", type=int, default=20, help="Synthetic documents to generate")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--parallel", action="store_true", help="Compare sequential and page-parallel extraction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pages-per-task", type=int, default=16)
+    parser.add_argument("--page-counts", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    args = parser.parse_args()
+
+    if args.parallel:
+        results = bench_parallel(args)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        return
+
+    if args.corpus:
+        corpus = []
+        for path in sorted(glob.glob(os.path.join(os.path.expanduser(args.corpus), "*.pdf"))):
+            with open(path, "rb") as f:
+                corpus.append((os.path.basename(path), f.read()))
+    else:
+        corpus = list(synthetic_corpus(args.docs))
+    if not corpus:
+        sys.exit("No PDFs found")
+
+    reference = {name: PDF_EXTRACTORS["pdfminer"].extract(data) for name, data in corpus}
+    total_pages = sum(pages for _, pages in reference.values())
+    print(f"{len(corpus)} documents, {total_pages} pages")
+
+    runs = {name: (lambda data, e=extractor: e.extract(data)[0]) for name, extractor in PDF_EXTRACTORS.items()}
+    runs["policy (default chain)"] = lambda data: extract_pdf_text(data, resolve_chain())[0]
+
+    results = {"benchmark": "pdf_extract", "documents": len(corpus), "pages": total_pages, "backends": []}
+    for name, run in runs.items():
+        texts = {}
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for doc, data in corpus:
+                texts[doc] = run(data)
+        elapsed = time.perf_counter() - start
+        scores = [agreement(texts[doc], reference[doc][0]) for doc, _ in corpus]
+        row = {
+            "backend": name,
+            "pages_per_sec": round(total_pages * args.repeat / elapsed, 1),
+            "mean_agreement": round(sum(scores) / len(scores), 4),
+            "min_agreement": round(min(scores), 4),
+        }
+        results["backends"].append(row)
+        print(f"{name:<24} {row['pages_per_sec']:>8.1f} pages/s  agreement mean={row['mean_agreement']:.3f} min={row['min_agreement']:.3f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
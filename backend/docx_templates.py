@@ -0,0 +1,73 @@
+"""Prepared base documents for the DOCX resume builder.
+
+Creating a ``docx.Document()`` parses the bundled default template (styles
+alone are ~800 KB of XML) and ``Document.save`` re-serializes and
+re-compresses every part, even though a generated resume only ever changes
+``word/document.xml``. ``PreparedDocx`` does that work once per template:
+
+- the template's base document (styles, numbering, margins and any fixed
+  header content already applied) is parsed once and its package is shared,
+  read-only, by every document created from it;
+- ``new_document`` clones only the small ``w:document`` element, and
+  style-name lookups against the shared styles are memoized;
+- ``render`` appends the serialized body to a pre-built zip of all other
+  parts, so the static parts are never serialized or compressed again.
+
+Builders must only edit the document body. Anything that adds parts or
+relationships (images, hyperlinks, headers) mutates the shared package and
+is not supported.
+"""
+
+import copy
+import io
+import zipfile
+
+from docx.document import Document
+from docx.opc.oxml import serialize_part_xml
+
+
+class PreparedDocx:
+    """A base document whose static parts are parsed and zipped once"""
+
+    def __init__(self, base: Document):
+        self._part = base.part
+        self._element = copy.deepcopy(base.element)
+        self._partname = self._part.partname.membername
+        self._memoize_style_lookups()
+
+        saved = io.BytesIO()
+        base.save(saved)
+        static = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(saved.getvalue())) as src, \
+                zipfile.ZipFile(static, "w", zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                if info.filename != self._partname:
+                    dst.writestr(info, src.read(info.filename))
+        self._static_zip = static.getvalue()
+
+    def _memoize_style_lookups(self):
+        # Resolving a style by name scans every style in styles.xml; the
+        # shared styles never change, so each name is resolved once
+        lookup = self._part.get_style_id
+        memo = {}
+
+        def get_style_id(style_or_name, style_type):
+            if not isinstance(style_or_name, str):
+                return lookup(style_or_name, style_type)
+            key = (style_or_name, style_type)
+            if key not in memo:
+                memo[key] = lookup(style_or_name, style_type)
+            return memo[key]
+
+        self._part.get_style_id = get_style_id
+
+    def new_document(self) -> Document:
+        """A fresh copy of the base document sharing the prepared package"""
+        return Document(copy.deepcopy(self._element), self._part)
+
+    def render(self, document: Document) -> bytes:
+        """Serialize a document created by ``new_document`` to .docx bytes"""
+        buffer = io.BytesIO(self._static_zip)
+        with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as z:
+            z.writestr(self._partname, serialize_part_xml(document.element))
+        return buffer.getvalue()
@@ -0,0 +1,102 @@
+"""Fast plain-text extraction from DOCX files.
+
+``docx.Document`` builds python-docx's full object model (and parses the
+large styles part) only for us to read ``doc.paragraphs``, which also skips
+tables, text boxes, headers and footers. Resumes put a lot in exactly those
+places: contact details in headers, skills in tables, sidebars in text boxes.
+
+``extract_docx_text`` opens the package with ``zipfile`` and stream-parses
+the headers, the main document and the footers with ``iterparse``, emitting
+one line per paragraph in document order. Table cells and text-box
+paragraphs are paragraphs too, so they come out in place. Run content is
+mapped the way python-docx maps it (tabs, line breaks, non-breaking
+hyphens), so plain documents read back exactly as before.
+"""
+
+from typing import BinaryIO, Iterator, List, Union
+import io
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_P = _W + "p"
+_T = _W + "t"
+_RUN_CONTENT = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+_BR = _W + "br"
+_BR_TYPE = _W + "type"
+
+_HEADER_RE = re.compile(r"word/header\d*\.xml$")
+_FOOTER_RE = re.compile(r"word/footer\d*\.xml$")
+
+
+def _part_number(name: str) -> int:
+    digits = re.search(r"(\d+)\.xml$", name)
+    return int(digits.group(1)) if digits else 0
+
+
+def _paragraph_lines(stream) -> Iterator[str]:
+    """Text of every paragraph in a WordprocessingML part, in document order"""
+    paragraphs: List[List[str]] = []
+    # Depth inside mc:Fallback, which repeats the mc:Choice content (e.g. VML text boxes)
+    fallback_depth = 0
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if tag == _MC_FALLBACK:
+            fallback_depth += 1 if event == "start" else -1
+            if event == "end":
+                elem.clear()
+            continue
+        if fallback_depth:
+            continue
+        if event == "start":
+            if tag == _P:
+                paragraphs.append([])
+            continue
+        if not paragraphs:
+            continue
+        if tag == _T:
+            paragraphs[-1].append(elem.text or "")
+        elif tag == _BR:
+            if elem.get(_BR_TYPE, "textWrapping") == "textWrapping":
+                paragraphs[-1].append("\n")
+        elif tag in _RUN_CONTENT:
+            paragraphs[-1].append(_RUN_CONTENT[tag])
+        elif tag == _P:
+            yield "".join(paragraphs.pop())
+            # Drop the finished subtree so memory stays flat on long documents
+            elem.clear()
+
+
+def extract_docx_text(data: Union[bytes, BinaryIO]) -> str:
+    """Headers, body (including tables and text boxes) and footers, one paragraph per line.
+
+    ``data`` is the document's bytes or a seekable binary file, which is read in place.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        data = io.BytesIO(data)
+    else:
+        data.seek(0)
+    with zipfile.ZipFile(data) as package:
+        names = package.namelist()
+        headers = sorted((n for n in names if _HEADER_RE.match(n)), key=_part_number)
+        footers = sorted((n for n in names if _FOOTER_RE.match(n)), key=_part_number)
+        lines: List[str] = []
+        seen_parts = set()
+        for name in headers + ["word/document.xml"] + footers:
+            with package.open(name) as stream:
+                part_lines = tuple(_paragraph_lines(stream))
+            if name in headers or name in footers:
+                # First-page/even/default variants usually repeat the same text
+                if not any(line.strip() for line in part_lines) or part_lines in seen_parts:
+                    continue
+                seen_parts.add(part_lines)
+            lines.extend(part_lines)
+    return "\n".join(lines)
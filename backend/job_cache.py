@@ -0,0 +1,179 @@
+"""Stale-while-revalidate result cache for job searches.
+
+Entries are fresh for ``fresh_ttl`` seconds and then served as stale for up
+to ``stale_ttl`` seconds while a single background task refreshes them.
+Concurrent misses for the same key share one upstream call, and a hit on
+page N can warm page N+1 before the user scrolls to it.
+"""
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+import asyncio
+import re
+import time
+
+
+def normalize_job_query(keyword: str, location: str, job_type: str, page: int) -> Tuple[str, str, str, int]:
+    """Cache key for a job search: case- and whitespace-insensitive, page-aware"""
+    def norm(value: str) -> str:
+        return re.sub(r"\s+", " ", (value or "").strip().lower())
+    return norm(keyword), norm(location), norm(job_type), int(page)
+
+
+class SWRCache:
+    """In-memory LRU cache with fresh/stale TTLs and background revalidation"""
+
+    def __init__(
+        self,
+        fresh_ttl: float = 300.0,
+        stale_ttl: float = 3600.0,
+        max_entries: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}
+        self._tasks: Set["asyncio.Task"] = set()
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "prefetches": 0,
+            "errors": 0,
+        }
+        # Bumped whenever the set of cached values changes (a store with the same value does not)
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Tuple[Optional[Any], Optional[float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        stored_at, value = entry
+        age = self._clock() - stored_at
+        if age > self.fresh_ttl + self.stale_ttl:
+            del self._entries[key]
+            self.generation += 1
+            return None, None
+        self._entries.move_to_end(key)
+        return value, age
+
+    def _store(self, key: Hashable, value: Any):
+        previous = self._entries.get(key)
+        if previous is None or previous[1] != value:
+            self.generation += 1
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.generation += 1
+
+    def contains(self, key: Hashable) -> bool:
+        return self._lookup(key)[0] is not None or key in self._inflight
+
+    async def _fetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool],
+    ) -> Any:
+        # Single-flight: concurrent callers for the same key await one upstream call
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetcher()
+            if cacheable(value):
+                self._store(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            self.stats["errors"] += 1
+            future.set_exception(e)
+            # Mark retrieved so a failure with no waiters is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _spawn(self, coro: Awaitable[Any]):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+
+        def _done(t: "asyncio.Task"):
+            self._tasks.discard(t)
+            if not t.cancelled():
+                t.exception()
+
+        task.add_done_callback(_done)
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Return the cached value for ``key``, fetching or revalidating as needed"""
+        value, age = self._lookup(key)
+        if value is not None:
+            if age <= self.fresh_ttl:
+                self.stats["hits"] += 1
+            else:
+                self.stats["stale_hits"] += 1
+                if key not in self._inflight:
+                    self.stats["refreshes"] += 1
+                    self._spawn(self._fetch(key, fetcher, cacheable))
+            return value
+        self.stats["misses"] += 1
+        return await self._fetch(key, fetcher, cacheable)
+
+    def prefetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ):
+        """Warm ``key`` in the background unless it is already cached or loading"""
+        if self.contains(key):
+            return
+        self.stats["prefetches"] += 1
+        self._spawn(self._fetch(key, fetcher, cacheable))
+
+    def prune(self):
+        """Drop expired entries (bumps ``generation`` if any were dropped)"""
+        oldest = self._clock() - self.fresh_ttl - self.stale_ttl
+        expired = [key for key, (stored_at, _) in self._entries.items() if stored_at < oldest]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self.generation += 1
+
+    def values(self) -> List[Any]:
+        """Currently cached values, fresh or stale; call from the event loop that owns the cache"""
+        self.prune()
+        return [value for _, value in self._entries.values()]
+
+    def clear(self):
+        self._entries.clear()
+        self.generation += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus derived hit rate, for the stats endpoint"""
+        served = self.stats["hits"] + self.stats["stale_hits"]
+        lookups = served + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            "fresh_ttl": self.fresh_ttl,
+            "stale_ttl": self.stale_ttl,
+        }
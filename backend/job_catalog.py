@@ -0,0 +1,105 @@
+"""Indexed in-memory job catalog used for the mock/fallback job source.
+
+The catalog is loaded once from a JSON data file and indexed by id, by
+token (title, company and tags) and by location and type facets, so that
+searches and detail lookups do not rescan every posting.
+
+Keyword and location filters keep substring semantics: a query matches when
+it occurs inside a field, case-insensitively. The token index narrows the
+candidates (every token of a substring query is contained in some token of
+the matching field) and only those candidates are checked exactly.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+import json
+import re
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+# Frontend job_type values -> catalog "type" values
+JOB_TYPE_MAP = {
+    "internship": "Internship",
+    "part_time": "Part-time",
+    "contract": "Contract",
+    "full_time": "Full-time",
+}
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+class JobCatalog:
+    """Job postings with id, token and facet indexes"""
+
+    def __init__(self, jobs: Iterable[Dict]):
+        self.jobs: List[Dict] = list(jobs)
+        self.by_id: Dict[str, Dict] = {}
+        self._token_postings: Dict[str, Set[int]] = {}
+        self._location_postings: Dict[str, Set[int]] = {}
+        self._type_postings: Dict[str, Set[int]] = {}
+        self._search_text: List[List[str]] = []
+        for pos, job in enumerate(self.jobs):
+            self.by_id[str(job["id"])] = job
+            fields = [job.get("title", ""), job.get("company", "")] + list(job.get("tags", []))
+            lowered = [f.lower() for f in fields]
+            self._search_text.append(lowered)
+            for token in {t for f in lowered for t in _tokens(f)}:
+                self._token_postings.setdefault(token, set()).add(pos)
+            self._location_postings.setdefault(job.get("location", "").lower(), set()).add(pos)
+            self._type_postings.setdefault(job.get("type", ""), set()).add(pos)
+        self._vocabulary = sorted(self._token_postings)
+        self._all = set(range(len(self.jobs)))
+        # Per-instance memo of query token -> positions of postings containing it
+        self._containing = lru_cache(maxsize=1024)(self._containing_uncached)
+
+    @classmethod
+    def from_file(cls, path: str) -> "JobCatalog":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def get(self, job_id) -> Optional[Dict]:
+        return self.by_id.get(str(job_id))
+
+    def _containing_uncached(self, query_token: str) -> frozenset:
+        hits: Set[int] = set()
+        for token in self._vocabulary:
+            if query_token in token:
+                hits |= self._token_postings[token]
+        return frozenset(hits)
+
+    def _keyword_matches(self, keyword: str) -> Set[int]:
+        keyword_lower = keyword.lower()
+        candidates = set(self._all)
+        for token in set(_tokens(keyword_lower)):
+            candidates &= self._containing(token)
+            if not candidates:
+                return candidates
+        return {
+            pos for pos in candidates
+            if any(keyword_lower in field for field in self._search_text[pos])
+        }
+
+    def _location_matches(self, location: str) -> Set[int]:
+        location_lower = location.lower()
+        hits: Set[int] = set()
+        for value, positions in self._location_postings.items():
+            if location_lower in value:
+                hits |= positions
+        return hits
+
+    def search(self, keyword: str = "", location: str = "", job_type: str = "full_time") -> List[Dict]:
+        """Postings matching all given filters, in catalog order"""
+        matches = self._all
+        if location:
+            matches = matches & self._location_matches(location)
+        # "full_time" is the frontend default and means "any type"
+        if job_type and job_type != "full_time":
+            matches = matches & self._type_postings.get(JOB_TYPE_MAP.get(job_type, "Full-time"), set())
+        if keyword and matches:
+            matches = matches & self._keyword_matches(keyword)
+        return [self.jobs[pos] for pos in sorted(matches)]
@@ -0,0 +1,898 @@
+"""Local on-disk job index with BM25 ranking.
+
+Postings (in the frontend job format produced by ``request_adzuna_jobs`` or
+stored in ``mock_jobs.json``) are ingested into an inverted index made of
+immutable segments, in the spirit of Lucene:
+
+- ``add`` buffers documents in an in-memory segment that is searchable
+  immediately; ``flush`` writes it to disk as a new segment.
+- ``add`` of an existing id is an update; ``delete`` tombstones a document.
+  Tombstones are recorded per segment in ``manifest.json`` and physically
+  dropped when segments are merged.
+- ``maybe_merge`` folds the smallest segments together once there are more
+  than ``max_segments``; ``merge`` compacts everything into one segment.
+
+The manifest is replaced atomically and old segment files are removed only
+after it stops referencing them, so a crash leaves a consistent index.
+The server and this CLI can share an index directory: writers serialize on
+``write.lock``, readers reload ``manifest.json`` when its version changes,
+and merged-away segments linger for ``retire_after`` seconds so a reader
+that has not reloaded yet never loses files it still uses.
+Scoring is vectorized with NumPy over the packed postings and only the
+top results are ordered; ranked pages are cached per query until the index
+changes, which keeps paging through a result set cheap.
+
+Command line usage (run from ``backend/``)::
+
+    python job_index.py ingest-mock
+    python job_index.py ingest-adzuna results.json --country gb
+    python job_index.py search "python developer" --location remote
+    python job_index.py merge
+    python job_index.py stats
+"""
+
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import argparse
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+from job_catalog import JOB_TYPE_MAP
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "our", "the", "this", "to", "we", "with", "you", "your", "will",
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_BOOST = 3
+# Ranked results kept per cached query; deeper pages recompute with a larger window
+RANK_WINDOW = 200
+
+_EMPTY = np.zeros(0, dtype=np.int32)
+
+
+def analyze(text: str) -> List[str]:
+    """Lowercase, tokenize and drop stopwords"""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def document_terms(job: Dict) -> List[str]:
+    """Indexed terms of a posting; title terms are repeated to weight them higher"""
+    terms = analyze(job.get("title", "")) * TITLE_BOOST
+    terms += analyze(job.get("company", ""))
+    terms += analyze(" ".join(job.get("tags", []) or []))
+    terms += analyze(" ".join(job.get("categories", []) or []))
+    terms += analyze(job.get("description", ""))
+    return terms
+
+
+def _write_json_atomic(path: str, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class _SegmentBase:
+    """Shared bookkeeping of memory and disk segments"""
+
+    name: str
+    ids: List[str]
+
+    def __init__(self):
+        self.deleted: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def live_count(self) -> int:
+        return len(self.ids) - len(self.deleted)
+
+    def live_mask(self) -> np.ndarray:
+        mask = np.ones(len(self.ids), dtype=bool)
+        if self.deleted:
+            mask[np.fromiter(self.deleted, dtype=np.int64, count=len(self.deleted))] = False
+        return mask
+
+    def live_doc_freq(self, term: str) -> int:
+        """Live documents containing ``term`` (tombstoned ones do not count)"""
+        if not self.deleted:
+            return self.doc_freq(term)
+        entry = self.posting(term)
+        if entry is None:
+            return 0
+        return int(np.count_nonzero(self.live_mask()[entry[0]]))
+
+    def norms(self, avgdl: float) -> np.ndarray:
+        """Per-document BM25 length normalization for the current average length"""
+        scale = BM25_K1 * BM25_B / avgdl if avgdl else 0.0
+        return BM25_K1 * (1 - BM25_B) + scale * self.length_array()
+
+    # Implemented by subclasses
+    def length_array(self) -> np.ndarray: ...
+    def seq_array(self) -> np.ndarray: ...
+    def posting(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]: ...
+    def doc_freq(self, term: str) -> int: ...
+    def facet(self, kind: str, value: str) -> np.ndarray: ...
+    def length(self, local: int) -> int: ...
+    def doc(self, local: int) -> Dict: ...
+
+
+class MemorySegment(_SegmentBase):
+    """Write buffer: searchable in memory until flushed to a DiskSegment"""
+
+    def __init__(self):
+        super().__init__()
+        self.name = "buffer"
+        self.docs: List[Optional[Dict]] = []
+        self.ids = []
+        self.lengths = array("i")
+        self.countries: List[str] = []
+        self.seqs = array("q")
+        self.facets: Dict[str, Dict[str, array]] = {"location": {}, "type": {}, "country": {}}
+        self.postings: Dict[str, Tuple[array, array]] = {}
+
+    def append(self, doc: Dict, country: str, seq: int) -> int:
+        local = len(self.docs)
+        terms = document_terms(doc)
+        self.docs.append(doc)
+        self.ids.append(str(doc["id"]))
+        self.lengths.append(len(terms))
+        self.countries.append(country)
+        self.seqs.append(seq)
+        counts: Dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = (array("i"), array("i"))
+            entry[0].append(local)
+            entry[1].append(tf)
+        values = {
+            "location": set(analyze(doc.get("location", ""))),
+            "type": {doc.get("type", "")},
+            "country": {country},
+        }
+        for kind, keys in values.items():
+            for key in keys:
+                self.facets[kind].setdefault(key, array("i")).append(local)
+        return local
+
+    def length_array(self) -> np.ndarray:
+        return np.frombuffer(self.lengths, dtype=np.int32).astype(np.float64)
+
+    def seq_array(self) -> np.ndarray:
+        return np.frombuffer(self.seqs, dtype=np.int64)
+
+    def posting(self, term: str):
+        entry = self.postings.get(term)
+        if entry is None:
+            return None
+        return np.frombuffer(entry[0], dtype=np.int32), np.frombuffer(entry[1], dtype=np.int32)
+
+    def doc_freq(self, term: str) -> int:
+        entry = self.postings.get(term)
+        return len(entry[0]) if entry else 0
+
+    def facet(self, kind: str, value: str) -> np.ndarray:
+        locals_ = self.facets[kind].get(value)
+        return np.frombuffer(locals_, dtype=np.int32) if locals_ else _EMPTY
+
+    def length(self, local: int) -> int:
+        return self.lengths[local]
+
+    def doc(self, local: int) -> Dict:
+        return self.docs[local]
+
+    def live_docs(self) -> Iterable[Tuple[Dict, str, int]]:
+        for local, doc in enumerate(self.docs):
+            if local not in self.deleted:
+                yield doc, self.countries[local], self.seqs[local]
+
+
+class DiskSegment(_SegmentBase):
+    """Immutable flushed segment.
+
+    Files per segment ``<name>``:
+
+    - ``<name>.meta.json``: ids, countries, stored-doc offsets, facet and term
+      dictionaries (key -> [start, count] into the packed arrays);
+    - ``<name>.npz``: packed int arrays (lengths, sequence numbers, posting
+      doc ids and frequencies, facet doc ids);
+    - ``<name>.docs.jsonl``: stored postings, read by offset on demand.
+    """
+
+    def __init__(self, directory: str, name: str):
+        super().__init__()
+        self.name = name
+        self.directory = directory
+        with open(self._path(".meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.ids = meta["ids"]
+        self.countries = meta["countries"]
+        self.offsets = meta["offsets"]
+        self.term_dict: Dict[str, List[int]] = meta["terms"]
+        self.facet_dict: Dict[str, Dict[str, List[int]]] = meta["facets"]
+        with np.load(self._path(".npz")) as packed:
+            self._lengths = packed["lengths"].astype(np.float64)
+            self._seqs = packed["seqs"]
+            self._doc_ids = packed["doc_ids"]
+            self._tfs = packed["tfs"]
+            self._facet_ids = packed["facet_ids"]
+        # Held open for the segment's lifetime, so stored documents stay readable
+        # after another process retires and removes the files
+        self._docs_file = open(self._path(".docs.jsonl"), "rb")
+        self._docs_end = os.fstat(self._docs_file.fileno()).st_size
+        self._docs_lock = threading.Lock()
+
+    def _path(self, suffix: str) -> str:
+        return os.path.join(self.directory, f"{self.name}{suffix}")
+
+    @classmethod
+    def write(cls, directory: str, name: str, docs: Iterable[Tuple[Dict, str, int]]) -> "DiskSegment":
+        """Build a segment from (doc, country, seq) triples and open it"""
+        buffer = MemorySegment()
+        offsets: List[int] = []
+        with open(os.path.join(directory, f"{name}.docs.jsonl"), "wb") as out:
+            for doc, country, seq in docs:
+                offsets.append(out.tell())
+                out.write(json.dumps(doc, ensure_ascii=False).encode("utf-8") + b"\n")
+                buffer.append(doc, country, seq)
+                buffer.docs[-1] = None  # stored on disk; keep memory flat
+
+        def pack(groups: Dict[str, Tuple[array, ...]], columns: int):
+            entries: Dict[str, List[int]] = {}
+            packed = [array("i") for _ in range(columns)]
+            for key in sorted(groups):
+                group = groups[key]
+                entries[key] = [len(packed[0]), len(group[0])]
+                for column, values in zip(packed, group):
+                    column.extend(values)
+            return entries, packed
+
+        terms, (doc_ids, tfs) = pack(buffer.postings, 2)
+        facets: Dict[str, Dict[str, List[int]]] = {}
+        facet_ids = array("i")
+        for kind, groups in buffer.facets.items():
+            entries, (ids_,) = pack({k: (v,) for k, v in groups.items()}, 1)
+            facets[kind] = {k: [start + len(facet_ids), count] for k, (start, count) in entries.items()}
+            facet_ids.extend(ids_)
+
+        with open(os.path.join(directory, f"{name}.npz"), "wb") as out:
+            np.savez(
+                out,
+                lengths=np.frombuffer(buffer.lengths, dtype=np.int32),
+                seqs=np.frombuffer(buffer.seqs, dtype=np.int64),
+                doc_ids=np.frombuffer(doc_ids, dtype=np.int32),
+                tfs=np.frombuffer(tfs, dtype=np.int32),
+                facet_ids=np.frombuffer(facet_ids, dtype=np.int32),
+            )
+        _write_json_atomic(os.path.join(directory, f"{name}.meta.json"), {
+            "ids": buffer.ids,
+            "countries": buffer.countries,
+            "offsets": offsets,
+            "terms": terms,
+            "facets": facets,
+        })
+        return cls(directory, name)
+
+    def length_array(self) -> np.ndarray:
+        return self._lengths
+
+    def seq_array(self) -> np.ndarray:
+        return self._seqs
+
+    def posting(self, term: str):
+        entry = self.term_dict.get(term)
+        if entry is None:
+            return None
+        start, count = entry
+        return self._doc_ids[start:start + count], self._tfs[start:start + count]
+
+    def doc_freq(self, term: str) -> int:
+        entry = self.term_dict.get(term)
+        return entry[1] if entry else 0
+
+    def facet(self, kind: str, value: str) -> np.ndarray:
+        entry = self.facet_dict.get(kind, {}).get(value)
+        if entry is None:
+            return _EMPTY
+        start, count = entry
+        return self._facet_ids[start:start + count]
+
+    def length(self, local: int) -> int:
+        return int(self._lengths[local])
+
+    def _read(self, local: int) -> bytes:
+        start = self.offsets[local]
+        end = self.offsets[local + 1] if local + 1 < len(self.offsets) else self._docs_end
+        with self._docs_lock:
+            self._docs_file.seek(start)
+            return self._docs_file.read(end - start)
+
+    def doc(self, local: int) -> Dict:
+        return json.loads(self._read(local))
+
+    def live_docs(self) -> Iterable[Tuple[Dict, str, int]]:
+        for local in range(len(self.ids)):
+            if local not in self.deleted:
+                yield json.loads(self._read(local)), self.countries[local], int(self._seqs[local])
+
+    def close(self):
+        self._docs_file.close()
+
+
+def _remove_segment_files(directory: str, name: str) -> bool:
+    """Delete a segment's files; False if any could not be removed (yet)"""
+    removed = True
+    for suffix in (".meta.json", ".npz", ".docs.jsonl"):
+        try:
+            os.remove(os.path.join(directory, f"{name}{suffix}"))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            removed = False
+    return removed
+
+
+class _WriteLock:
+    """Exclusive lock on a file, shared by every process that writes the index"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        f = open(self.path, "a+b")
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                f.seek(0)
+                while True:
+                    try:
+                        # LK_LOCK retries for ~10 s before giving up; keep waiting
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            else:
+                import fcntl
+
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            f.close()
+            raise
+        self._file = f
+
+    def release(self):
+        f, self._file = self._file, None
+        if f is None:
+            return
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        finally:
+            f.close()
+
+
+class JobIndex:
+    """Segmented BM25 index over job postings, persisted under ``path``.
+
+    Several processes may open the same directory (server workers, the
+    ingestion CLI). A process that mutates the index holds ``write.lock``
+    from its first change until the buffer is flushed; readers notice a new
+    manifest within ``refresh_interval`` seconds and reload it. Segments a
+    merge folds away stay on disk for ``retire_after`` seconds, so readers
+    that have not reloaded yet can still open them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_threshold: int = 1000,
+        max_segments: int = 8,
+        refresh_interval: float = 2.0,
+        retire_after: float = 600.0,
+    ):
+        self.path = path
+        self.flush_threshold = flush_threshold
+        self.max_segments = max_segments
+        self.refresh_interval = refresh_interval
+        self.retire_after = retire_after
+        self.segments: List[DiskSegment] = []
+        self.buffer = MemorySegment()
+        # id -> (segment, local doc) of the live version of each posting
+        self._live: Dict[str, Tuple[_SegmentBase, int]] = {}
+        self._next_seq = 0
+        self._next_segment = 0
+        self._total_length = 0
+        self._generation = 0
+        # Version of the manifest this process last loaded or wrote, and its file signature
+        self._manifest_version = 0
+        self._manifest_signature: Optional[Tuple[int, int, int]] = None
+        self._next_refresh = 0.0
+        # Segments folded away by merges: [{"name", "retired_at"}], removed after retire_after
+        self._retired: List[Dict] = []
+        self._write_lock = _WriteLock(os.path.join(path, "write.lock"))
+        self._writing = False
+        self._lock = threading.RLock()
+        # query -> (ranked window, total hits)
+        self._query_cache: "OrderedDict[Tuple, Tuple[List[Tuple[_SegmentBase, int]], int]]" = OrderedDict()
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    # ---- persistence ----
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.path, "manifest.json")
+
+    def _manifest_stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self._manifest_path())
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _read_manifest(self) -> Optional[Dict]:
+        signature = self._manifest_stat()
+        if signature is None:
+            return None
+        with open(self._manifest_path(), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self._manifest_signature = signature
+        return manifest
+
+    def _load(self):
+        manifest = self._read_manifest()
+        if manifest is not None:
+            self._apply_manifest(manifest)
+
+    def _apply_manifest(self, manifest: Dict):
+        """Point the index at the manifest's segments, reusing the ones already open"""
+        opened = {s.name: s for s in self.segments}
+        segments = []
+        for entry in manifest.get("segments", []):
+            segment = opened.get(entry["name"]) or DiskSegment(self.path, entry["name"])
+            segments.append((segment, set(entry.get("deleted", []))))
+        # Everything opened; swap (segments dropped here are closed when garbage collected,
+        # so iterations still running in other threads can finish)
+        self.segments = []
+        self._live = {}
+        self._total_length = 0
+        for segment, deleted in segments:
+            segment.deleted = deleted
+            self.segments.append(segment)
+            for local, doc_id in enumerate(segment.ids):
+                if local not in deleted:
+                    self._make_live(doc_id, segment, local)
+        self._next_seq = manifest.get("next_seq", 0)
+        self._next_segment = manifest.get("next_segment", 0)
+        self._manifest_version = manifest.get("version", 0)
+        self._retired = list(manifest.get("retired", []))
+        self._changed()
+
+    def _maybe_refresh(self):
+        """Reload the manifest if another process has written a new one"""
+        if self._writing or time.monotonic() < self._next_refresh:
+            return
+        self._next_refresh = time.monotonic() + self.refresh_interval
+        if self._manifest_stat() == self._manifest_signature:
+            return
+        try:
+            manifest = self._read_manifest()
+            if manifest is not None and manifest.get("version", 0) != self._manifest_version:
+                self._apply_manifest(manifest)
+        except (OSError, ValueError):
+            # Caught mid-change; keep serving the current state and retry next time
+            self._manifest_signature = None
+
+    def _begin_write(self):
+        if self._writing:
+            return
+        self._write_lock.acquire()
+        self._writing = True
+        try:
+            # Start from what other writers left behind
+            manifest = self._read_manifest()
+            if manifest is not None and manifest.get("version", 0) != self._manifest_version:
+                self._apply_manifest(manifest)
+        except BaseException:
+            self._end_write()
+            raise
+
+    def _end_write(self):
+        """Release the write lock once nothing is left in the buffer"""
+        if not self._writing or self.buffer.live_count:
+            return
+        self.buffer = MemorySegment()
+        self._writing = False
+        self._write_lock.release()
+
+    def _make_live(self, doc_id: str, segment: _SegmentBase, local: int):
+        self._supersede(doc_id)
+        self._live[doc_id] = (segment, local)
+        self._total_length += segment.length(local)
+
+    def _supersede(self, doc_id: str):
+        previous = self._live.pop(doc_id, None)
+        if previous is not None:
+            segment, local = previous
+            segment.deleted.add(local)
+            self._total_length -= segment.length(local)
+
+    def _write_manifest(self):
+        self._manifest_version += 1
+        _write_json_atomic(self._manifest_path(), {
+            "version": self._manifest_version,
+            "next_seq": self._next_seq,
+            "next_segment": self._next_segment,
+            "segments": [
+                {"name": s.name, "docs": len(s), "deleted": sorted(s.deleted)}
+                for s in self.segments
+            ],
+            "retired": self._retired,
+        })
+        self._manifest_signature = self._manifest_stat()
+
+    def _remove_retired(self):
+        """Delete the files of segments retired more than ``retire_after`` seconds ago"""
+        cutoff = time.time() - self.retire_after
+        kept = []
+        for entry in self._retired:
+            if entry["retired_at"] > cutoff or not _remove_segment_files(self.path, entry["name"]):
+                kept.append(entry)
+        if len(kept) != len(self._retired):
+            self._retired = kept
+            self._write_manifest()
+
+    def _new_segment_name(self) -> str:
+        name = f"seg_{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    def _changed(self):
+        self._generation += 1
+        self._query_cache.clear()
+
+    def _adopt(self, segment: DiskSegment):
+        """Point live ids at ``segment``; its documents are already counted"""
+        for local, doc_id in enumerate(segment.ids):
+            self._live[doc_id] = (segment, local)
+
+    # ---- mutation ----
+
+    def add(self, docs: Iterable[Dict], country: str = "us") -> int:
+        """Add or update postings; returns how many were ingested
+
+        Takes the write lock, which is held until the buffer is flushed.
+        """
+        added = 0
+        with self._lock:
+            self._begin_write()
+            for doc in docs:
+                if doc.get("id") is None:
+                    continue
+                local = self.buffer.append(doc, (country or "").lower(), self._next_seq)
+                self._next_seq += 1
+                self._make_live(str(doc["id"]), self.buffer, local)
+                added += 1
+            self._changed()
+            if len(self.buffer) >= self.flush_threshold:
+                self.flush()
+            self._end_write()
+        return added
+
+    def delete(self, ids: Iterable) -> int:
+        """Tombstone postings by id; returns how many were live"""
+        removed = 0
+        with self._lock:
+            self._begin_write()
+            try:
+                for doc_id in ids:
+                    if str(doc_id) in self._live:
+                        self._supersede(str(doc_id))
+                        removed += 1
+                if removed:
+                    self._changed()
+                    if self.buffer.live_count:
+                        # Disk postings replaced by buffered updates are tombstoned too; saving
+                        # those tombstones before the updates would lose both on a restart
+                        self.flush()
+                    else:
+                        self._write_manifest()
+            finally:
+                self._end_write()
+        return removed
+
+    def flush(self):
+        """Write buffered postings to a new on-disk segment and release the write lock"""
+        with self._lock:
+            if self.buffer.live_count:
+                segment = DiskSegment.write(self.path, self._new_segment_name(), self.buffer.live_docs())
+                self.segments.append(segment)
+                self._adopt(segment)
+                self.buffer = MemorySegment()
+                self._write_manifest()
+                self._changed()
+                self.maybe_merge()
+            self._end_write()
+
+    def _merge_segments(self, chosen: List[DiskSegment]):
+        def live_docs():
+            for segment in chosen:
+                yield from segment.live_docs()
+
+        merged = DiskSegment.write(self.path, self._new_segment_name(), live_docs())
+        chosen_names = {s.name for s in chosen}
+        position = min(i for i, s in enumerate(self.segments) if s.name in chosen_names)
+        remaining = [s for s in self.segments if s.name not in chosen_names]
+        remaining.insert(position, merged)
+        self.segments = remaining
+        self._adopt(merged)
+        # Other processes may still read the old segments; retire them instead of deleting
+        self._retired.extend({"name": s.name, "retired_at": time.time()} for s in chosen)
+        self._write_manifest()
+        self._remove_retired()
+        self._changed()
+
+    def maybe_merge(self):
+        """Merge the two smallest segments while there are more than ``max_segments``"""
+        with self._lock:
+            if len(self.segments) <= self.max_segments:
+                return
+            self._begin_write()
+            try:
+                while len(self.segments) > self.max_segments:
+                    smallest = sorted(self.segments, key=lambda s: s.live_count)[:2]
+                    self._merge_segments(smallest)
+            finally:
+                self._end_write()
+
+    def merge(self):
+        """Flush and compact the whole index into a single segment"""
+        with self._lock:
+            self._begin_write()
+            try:
+                self.flush()
+                if len(self.segments) > 1 or any(s.deleted for s in self.segments):
+                    self._merge_segments(list(self.segments))
+            finally:
+                self._end_write()
+
+    def close(self):
+        with self._lock:
+            for segment in self.segments:
+                segment.close()
+            if self._writing:
+                self._writing = False
+                self._write_lock.release()
+
+    # ---- search ----
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._maybe_refresh()
+            return len(self._live)
+
+    def _all_segments(self) -> List[_SegmentBase]:
+        return self.segments + [self.buffer]
+
+    def _candidates(self, segment: _SegmentBase, location: str, job_type: str) -> np.ndarray:
+        """Boolean mask of live local docs passing the filters"""
+        mask = segment.live_mask()
+        if location:
+            # A country code (Adzuna's "us", "gb", ...) or all words of the location
+            place = np.zeros(len(segment), dtype=bool)
+            terms = analyze(location)
+            if terms:
+                place[segment.facet("location", terms[0])] = True
+                for term in terms[1:]:
+                    term_mask = np.zeros(len(segment), dtype=bool)
+                    term_mask[segment.facet("location", term)] = True
+                    place &= term_mask
+            place[segment.facet("country", location)] = True
+            mask &= place
+        # "full_time" is the frontend default and means "any type"
+        if job_type and job_type != "full_time":
+            typed = np.zeros(len(segment), dtype=bool)
+            typed[segment.facet("type", JOB_TYPE_MAP.get(job_type, "Full-time"))] = True
+            mask &= typed
+        return mask
+
+    def _rank(self, keyword: str, location: str, job_type: str, window: int):
+        terms = list(dict.fromkeys(analyze(keyword)))
+        segments = self._all_segments()
+        total_docs = max(1, len(self._live))
+        avgdl = self._total_length / total_docs
+        # Over live documents only, so df <= N and every idf stays positive
+        df = {t: sum(s.live_doc_freq(t) for s in segments) for t in terms}
+        total = 0
+        pooled: List[Tuple[float, int, _SegmentBase, int]] = []
+
+        for segment in segments:
+            if not len(segment):
+                continue
+            mask = self._candidates(segment, location, job_type)
+            scores = np.zeros(len(segment), dtype=np.float64)
+            if terms:
+                norms = segment.norms(avgdl)
+                matched = np.zeros(len(segment), dtype=bool)
+                for term in terms:
+                    entry = segment.posting(term)
+                    if entry is None:
+                        continue
+                    docs, tfs = entry
+                    idf = np.log(1 + (total_docs - df[term] + 0.5) / (df[term] + 0.5))
+                    tf = tfs.astype(np.float64)
+                    scores[docs] += idf * (BM25_K1 + 1) * tf / (tf + norms[docs])
+                    matched[docs] = True
+                mask &= matched
+            # Without terms every score is 0 and postings come newest first
+            hits = np.flatnonzero(mask)
+            total += len(hits)
+            seqs = segment.seq_array()
+            if len(hits) > window:
+                # Keep this segment's best ``window`` hits before the global merge
+                best = np.argpartition(-scores[hits], window - 1)[:window] if terms else \
+                    np.argpartition(-seqs[hits], window - 1)[:window]
+                hits = hits[best]
+            pooled.extend(zip(scores[hits].tolist(), seqs[hits].tolist(), [segment] * len(hits), hits.tolist()))
+
+        # Highest score first, ties broken by recency
+        pooled.sort(key=lambda h: (h[0], h[1]), reverse=True)
+        return [(segment, local) for _, _, segment, local in pooled[:window]], total
+
+    def _ranked(self, keyword: str, location: str, job_type: str, needed: int):
+        key = (keyword, location, job_type)
+        cached = self._query_cache.get(key)
+        if cached is not None and (len(cached[0]) >= needed or len(cached[0]) == cached[1]):
+            self._query_cache.move_to_end(key)
+            return cached
+        window = max(RANK_WINDOW, needed)
+        if cached is not None:
+            window = max(window, 2 * len(cached[0]))
+        result = self._rank(keyword, location, job_type, window)
+        self._query_cache[key] = result
+        if len(self._query_cache) > 256:
+            self._query_cache.popitem(last=False)
+        return result
+
+    def search(
+        self,
+        keyword: str = "",
+        location: str = "",
+        job_type: str = "full_time",
+        page: int = 0,
+        per_page: int = 10,
+    ) -> Dict:
+        """Ranked page of postings in the same shape as ``get_enhanced_mock_jobs``"""
+        page = max(0, page)
+        start = page * per_page
+        with self._lock:
+            self._maybe_refresh()
+            ranked, total = self._ranked(
+                (keyword or "").strip().lower(),
+                (location or "").strip().lower(),
+                job_type or "",
+                start + per_page,
+            )
+            jobs = [dict(segment.doc(local)) for segment, local in ranked[start:start + per_page]]
+        return {
+            "page_count": (total + per_page - 1) // per_page,
+            "page": page,
+            "jobs": jobs,
+            "total_jobs": total,
+            "source": "Local Index",
+        }
+
+    @property
+    def generation(self) -> int:
+        """Changes whenever the set of live postings changes"""
+        with self._lock:
+            self._maybe_refresh()
+            return self._generation
+
+    def iter_docs(self) -> Iterable[Dict]:
+        """Every live posting (reads stored documents from disk)"""
+        with self._lock:
+            self._maybe_refresh()
+            segments = list(self._all_segments())
+        for segment in segments:
+            for doc, _, _ in segment.live_docs():
+                yield doc
+
+    def get(self, doc_id) -> Optional[Dict]:
+        with self._lock:
+            self._maybe_refresh()
+            hit = self._live.get(str(doc_id))
+            return dict(hit[0].doc(hit[1])) if hit else None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._maybe_refresh()
+            return {
+                "documents": len(self._live),
+                "segments": len(self.segments),
+                "buffered": self.buffer.live_count,
+                "deleted": sum(len(s.deleted) for s in self.segments),
+                "generation": self._generation,
+                "retired": len(self._retired),
+            }
+
+
+def _default_index_dir() -> str:
+    return os.environ.get(
+        "JOB_INDEX_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "storage", "job_index"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local job index")
+    parser.add_argument("--index", default=_default_index_dir(), help="Index directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("ingest-mock", help="Ingest mock_jobs.json")
+    adzuna = sub.add_parser("ingest-adzuna", help="Ingest an Adzuna search response (or a list of them)")
+    adzuna.add_argument("file")
+    adzuna.add_argument("--country", default="us")
+    delete = sub.add_parser("delete", help="Delete postings by id")
+    delete.add_argument("ids", nargs="+")
+    search = sub.add_parser("search", help="Run a query")
+    search.add_argument("keyword", nargs="?", default="")
+    search.add_argument("--location", default="")
+    search.add_argument("--job-type", default="full_time")
+    search.add_argument("--page", type=int, default=0)
+    sub.add_parser("merge", help="Compact all segments into one")
+    sub.add_parser("stats", help="Show index statistics")
+    args = parser.parse_args()
+
+    index = JobIndex(args.index)
+    if args.command == "ingest-mock":
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_jobs.json")
+        with open(path, "r", encoding="utf-8") as f:
+            print(f"Ingested {index.add(json.load(f))} postings")
+        index.flush()
+    elif args.command == "ingest-adzuna":
+        from main import posting_skill_tagger, transform_adzuna_job
+
+        with open(args.file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        pages = data if isinstance(data, list) else [data]
+        jobs = posting_skill_tagger().tag(
+            transform_adzuna_job(job, f"{n}_{idx}")
+            for n, page in enumerate(pages)
+            for idx, job in enumerate(page.get("results", []))
+        )
+        print(f"Ingested {index.add(jobs, country=args.country)} postings")
+        index.flush()
+    elif args.command == "delete":
+        print(f"Deleted {index.delete(args.ids)} postings")
+    elif args.command == "search":
+        print(json.dumps(index.search(args.keyword, args.location, args.job_type, args.page), indent=2))
+    elif args.command == "merge":
+        index.merge()
+    print(json.dumps(index.stats()))
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
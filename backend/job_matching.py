@@ -0,0 +1,148 @@
+"""Resume-to-posting similarity with a hashed TF-IDF model in NumPy.
+
+Postings are vectorized once into a sparse column-major matrix (feature ->
+postings), so scoring a resume only touches the postings that share one of
+its features. Scores for a batch of resumes come from one ``np.bincount``
+over the gathered columns, and the top ``k`` per resume from
+``np.argpartition``; nothing is done per posting in Python.
+
+Features are unigrams and bigrams hashed with CRC32 (stable across processes,
+unlike ``hash``) into ``n_features`` buckets. Weights are sublinear TF times
+smoothed IDF, L2-normalized, so scores are cosine similarities in [0, 1].
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import zlib
+
+import numpy as np
+
+from job_index import analyze
+
+
+def _terms(text: str) -> List[str]:
+    tokens = analyze(text)
+    return tokens + [f"{tokens[i]} {tokens[i + 1]}" for i in range(len(tokens) - 1)]
+
+
+def posting_text(job: Dict) -> str:
+    """Text a posting is matched on; title and tags are repeated to weight them"""
+    tags = " ".join(job.get("tags", []) or [])
+    title = job.get("title", "")
+    return " \n".join([title, title, tags, tags, job.get("company", ""), job.get("description", "")])
+
+
+class HashedTfidfVectorizer:
+    """Stateless hashing of terms plus an IDF vector fitted on the postings"""
+
+    def __init__(self, n_features: int = 1 << 18):
+        if n_features & (n_features - 1):
+            raise ValueError("n_features must be a power of two")
+        self.n_features = n_features
+        self._mask = n_features - 1
+        self.idf = np.ones(n_features, dtype=np.float32)
+
+    def counts(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted unique feature ids and their raw counts"""
+        ids = np.fromiter(
+            (zlib.crc32(term.encode("utf-8")) & self._mask for term in _terms(text)),
+            dtype=np.int64,
+        )
+        if not len(ids):
+            return ids, np.zeros(0, dtype=np.float32)
+        features, counts = np.unique(ids, return_counts=True)
+        return features, counts.astype(np.float32)
+
+    def fit_idf(self, doc_features: Iterable[np.ndarray], n_docs: int):
+        df = np.zeros(self.n_features, dtype=np.float64)
+        for features in doc_features:
+            df[features] += 1
+        self.idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+    def weight(self, features: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        weights = (1 + np.log(counts)) * self.idf[features]
+        norm = np.linalg.norm(weights)
+        return weights / norm if norm else weights
+
+    def transform(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        features, counts = self.counts(text)
+        return features, self.weight(features, counts)
+
+
+class PostingMatrix:
+    """Precomputed TF-IDF vectors of a set of postings, stored column-major"""
+
+    def __init__(self, jobs: Sequence[Dict], vectorizer: Optional[HashedTfidfVectorizer] = None):
+        self.jobs = list(jobs)
+        self.vectorizer = vectorizer or HashedTfidfVectorizer()
+        raw = [self.vectorizer.counts(posting_text(job)) for job in self.jobs]
+        self.vectorizer.fit_idf((features for features, _ in raw), len(self.jobs))
+
+        rows, cols, vals = [], [], []
+        for row, (features, counts) in enumerate(raw):
+            rows.append(np.full(len(features), row, dtype=np.int32))
+            cols.append(features)
+            vals.append(self.vectorizer.weight(features, counts))
+        rows_ = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+        cols_ = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        vals_ = np.concatenate(vals) if vals else np.zeros(0, dtype=np.float32)
+
+        # CSC layout: postings of feature f are rows[indptr[f]:indptr[f + 1]]
+        order = np.argsort(cols_, kind="stable")
+        self.rows = rows_[order]
+        self.values = vals_[order].astype(np.float32)
+        self.indptr = np.zeros(self.vectorizer.n_features + 1, dtype=np.int64)
+        np.add.at(self.indptr, cols_ + 1, 1)
+        np.cumsum(self.indptr, out=self.indptr)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def score_batch(self, queries: Sequence[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Cosine scores of each query vector against every posting, shape (len(queries), len(self))"""
+        n = len(self.jobs)
+        gathered_rows, gathered_vals = [], []
+        for q, (features, weights) in enumerate(queries):
+            starts = self.indptr[features]
+            ends = self.indptr[features + 1]
+            lengths = ends - starts
+            keep = lengths > 0
+            if not keep.any():
+                continue
+            starts, lengths, weights = starts[keep], lengths[keep], weights[keep]
+            # Flat indices of every stored value in the query's feature columns
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            gathered_rows.append(self.rows[offsets].astype(np.int64) + q * n)
+            gathered_vals.append(self.values[offsets] * np.repeat(weights, lengths))
+        if not gathered_rows:
+            return np.zeros((len(queries), n), dtype=np.float64)
+        flat = np.bincount(
+            np.concatenate(gathered_rows),
+            weights=np.concatenate(gathered_vals),
+            minlength=len(queries) * n,
+        )
+        return flat.reshape(len(queries), n)
+
+    def top_k(self, texts: Sequence[str], k: int = 10) -> List[List[Tuple[int, float]]]:
+        """Best ``k`` (posting index, score) pairs for each text, best first"""
+        if not self.jobs:
+            return [[] for _ in texts]
+        scores = self.score_batch([self.vectorizer.transform(t) for t in texts])
+        k = min(k, len(self.jobs))
+        results = []
+        for row in scores:
+            best = np.argpartition(-row, k - 1)[:k]
+            best = best[np.argsort(-row[best], kind="stable")]
+            results.append([(int(i), float(row[i])) for i in best if row[i] > 0])
+        return results
+
+
+def resume_profile_text(skills: Sequence[str], role: str, text: str = "") -> str:
+    """Query text for a resume: detected skills and target role weigh more than the body"""
+    skill_line = " . ".join(skills)
+    return " \n".join([skill_line, skill_line, skill_line, role, role, text or ""])
+
+
+def matched_skills(job: Dict, skills: Sequence[str]) -> List[str]:
+    """Resume skills that appear in the posting's title, tags or description"""
+    haystack = " " + " ".join(analyze(posting_text(job))) + " "
+    return [s for s in skills if analyze(s) and f" {' '.join(analyze(s))} " in haystack]
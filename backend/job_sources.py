@@ -0,0 +1,134 @@
+"""Pluggable job sources and a concurrent aggregator.
+
+A ``JobSource`` returns one page of postings in the frontend job format
+(``{"jobs": [...], "total_jobs": int, "page_count": int}``) and raises on
+failure. ``JobAggregator`` queries every enabled source at once, cuts each
+off at its own ``deadline`` and merges what arrived into a single page, so a
+search takes as long as the slowest deadline rather than the sum of source
+latencies.
+
+Relevance scores are not comparable across sources (Adzuna's ranking is
+opaque, the local index uses BM25), so the merged page interleaves the
+sources' own rankings: every source's first posting, then every second
+one, and so on, in source priority order within each rank. Postings are
+deduplicated by a normalized (title, company, location) fingerprint; the
+copy from the higher-priority source wins and takes the best rank any
+copy had. Sources marked
+``fallback`` (the mock catalog) are queried alongside the others but only
+contribute when no primary source answered in time, which keeps the old
+"mock data when Adzuna fails" behaviour without waiting for the failure
+before starting the fallback.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import re
+import time
+
+log = logging.getLogger("cvision")
+
+
+def job_fingerprint(job: Dict) -> Tuple[str, str, str]:
+    """Normalized (title, company, location) identity of a posting"""
+    def norm(value: Any) -> str:
+        return re.sub(r"[^a-z0-9]+", " ", str(value or "").lower()).strip()
+    return norm(job.get("title")), norm(job.get("company")), norm(job.get("location"))
+
+
+class JobSource:
+    """Base class for job sources; subclasses implement ``search``"""
+
+    name = "source"
+    # Label reported in the response "source" field
+    label = "Source"
+    deadline = 5.0
+    # Lower values rank first and win duplicate postings
+    priority = 100
+    fallback = False
+
+    def enabled(self) -> bool:
+        return True
+
+    def describe(self) -> Dict[str, Any]:
+        """Extra source-specific state for the stats endpoint"""
+        return {}
+
+    async def search(self, page: int, keyword: str, location: str, job_type: str) -> Dict:
+        raise NotImplementedError
+
+
+class JobAggregator:
+    """Queries sources concurrently with per-source deadlines and merges their pages"""
+
+    def __init__(self, sources: Sequence[JobSource]):
+        self.sources = sorted(sources, key=lambda s: s.priority)
+        self.stats: Dict[str, Dict[str, Any]] = {
+            s.name: {"calls": 0, "ok": 0, "timeouts": 0, "errors": 0, "last_latency_ms": None}
+            for s in self.sources
+        }
+
+    async def _run(self, source: JobSource, page: int, keyword: str, location: str, job_type: str) -> Optional[Dict]:
+        stats = self.stats[source.name]
+        stats["calls"] += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(source.search(page, keyword, location, job_type), timeout=source.deadline)
+            stats["ok"] += 1
+            return result
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            log.warning(f"Job source '{source.name}' missed its {source.deadline:.1f}s deadline")
+        except Exception as e:
+            stats["errors"] += 1
+            log.warning(f"Job source '{source.name}' failed: {e}")
+        finally:
+            stats["last_latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return None
+
+    async def search(self, page: int = 0, keyword: str = "", location: str = "", job_type: str = "full_time") -> Dict:
+        """One merged, deduplicated page from all enabled sources"""
+        active = [s for s in self.sources if s.enabled()]
+        results = await asyncio.gather(*(self._run(s, page, keyword, location, job_type) for s in active))
+        answered = [(s, r) for s, r in zip(active, results) if r is not None]
+        # A primary source that answered with no postings is a real "no results", not a failure
+        primary = [(s, r) for s, r in answered if not s.fallback]
+        chosen = primary or [(s, r) for s, r in answered if s.fallback]
+
+        # fingerprint -> [(rank in its source, source priority), posting]
+        ranked: Dict[Tuple[str, str, str], List[Any]] = {}
+        duplicates = 0
+        for source, result in chosen:
+            for position, job in enumerate(result.get("jobs", [])):
+                fingerprint = job_fingerprint(job)
+                key = (position, source.priority)
+                entry = ranked.get(fingerprint)
+                if entry is None:
+                    ranked[fingerprint] = [key, job]
+                    continue
+                # Sources are visited in priority order, so the stored copy already wins
+                duplicates += 1
+                entry[0] = min(entry[0], key)
+        jobs: List[Dict] = [job for _, job in sorted(ranked.values(), key=lambda entry: entry[0])]
+
+        return {
+            "page_count": max((r.get("page_count", 0) for _, r in chosen), default=0),
+            "page": page,
+            "jobs": jobs,
+            "total_jobs": max(sum(r.get("total_jobs", 0) for _, r in chosen) - duplicates, len(jobs)),
+            "source": " + ".join(s.label for s, _ in chosen) or "No Sources",
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-source counters plus configuration, for the stats endpoint"""
+        return {
+            s.name: {
+                **self.stats[s.name],
+                "enabled": s.enabled(),
+                "deadline": s.deadline,
+                "priority": s.priority,
+                "fallback": s.fallback,
+                **s.describe(),
+            }
+            for s in self.sources
+        }
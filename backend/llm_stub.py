@@ -0,0 +1,170 @@
+"""Offline OpenAI-compatible stand-in for the AI analysis path.
+
+Serves ``POST /v1/chat/completions`` with schema-valid analysis JSON so
+``/ai-analyze-resume`` can be load-tested without OpenRouter. Point the
+backend at it with::
+
+    OPENROUTER_BASE_URL=http://localhost:8001/v1 OPENROUTER_API_KEY=stub
+
+and run it with ``uvicorn llm_stub:app --port 8001``.
+
+Behaviour is configured through environment variables:
+
+- ``STUB_LATENCY_MS``: base response latency (default 800)
+- ``STUB_JITTER_MS``: uniform +/- jitter added to the latency (default 200)
+- ``STUB_ERROR_RATE``: fraction of requests answered with HTTP 500 (default 0)
+- ``STUB_FENCE``: wrap the JSON in a ```json fence like real models do (default 1)
+- ``STUB_SEED``: seed for reproducible latencies and scores
+"""
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, List, Optional
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import uuid
+
+
+STUB_LATENCY_MS = float(os.environ.get("STUB_LATENCY_MS", "800"))
+STUB_JITTER_MS = float(os.environ.get("STUB_JITTER_MS", "200"))
+STUB_ERROR_RATE = float(os.environ.get("STUB_ERROR_RATE", "0"))
+STUB_FENCE = os.environ.get("STUB_FENCE", "1") not in {"0", "false", "no"}
+STUB_SEED = os.environ.get("STUB_SEED")
+
+_rng = random.Random(int(STUB_SEED)) if STUB_SEED else random.Random()
+
+app = FastAPI(title="CVision LLM Stub", version="0.1.0")
+
+
+def _field(prompt: str, label: str) -> str:
+    match = re.search(rf"^{re.escape(label)}: (.*)$", prompt, flags=re.M)
+    return match.group(1).strip() if match else ""
+
+
+def build_analysis(prompt: str) -> Dict:
+    """Build an analysis payload matching ``AnalyzeResponse`` from the prompt"""
+    skills = [s.strip() for s in _field(prompt, "Required Skills").split(",") if s.strip()]
+    resume_part = prompt.split("Resume Text (trimmed):", 1)[-1].split("Target Role:", 1)[0]
+    words = len(re.findall(r"\w+", resume_part))
+    lowered = resume_part.lower()
+    missing = [s for s in skills if s.lower() not in lowered]
+    km_score = round(((len(skills) - len(missing)) / max(1, len(skills))) * 100)
+    fmt_score = _rng.randint(60, 95)
+    sec_score = _rng.randint(50, 95)
+    return {
+        "ats_score": round(0.5 * km_score + 0.25 * sec_score + 0.25 * fmt_score),
+        "keyword_match": {"score": km_score},
+        "missing_skills": missing,
+        "format_score": fmt_score,
+        "section_score": sec_score,
+        "suggestions": [
+            "Quantify the impact of your most recent role with concrete metrics.",
+            "Move the strongest role-relevant project closer to the top.",
+        ] + (["Show hands-on use of: " + ", ".join(missing[:5]) + "."] if missing else []),
+        "jd_match_score": _rng.randint(40, 90) if "Job Description:" in prompt else None,
+        "contact": {
+            "has_email": bool(re.search(r"[\w.+'-]+@[\w.-]+\.[A-Za-z]{2,}", resume_part)),
+            "has_phone": bool(re.search(r"(\+?\d[\s-]?){7,}\d", resume_part)),
+            "has_linkedin": "linkedin.com" in lowered,
+            "has_github": "github.com" in lowered,
+        },
+        "metrics": {"word_count": words, "reading_time_minutes": max(1, round(words / 200))},
+    }
+
+
+def _render(prompt: str) -> str:
+    content = json.dumps(build_analysis(prompt), indent=2)
+    return f"```json\n{content}\n```" if STUB_FENCE else content
+
+
+async def _sleep_latency():
+    delay = STUB_LATENCY_MS + _rng.uniform(-STUB_JITTER_MS, STUB_JITTER_MS)
+    await asyncio.sleep(max(0.0, delay) / 1000)
+
+
+def _last_user_message(messages: List[Dict]) -> str:
+    for message in reversed(messages or []):
+        if message.get("role") == "user":
+            content = message.get("content") or ""
+            if isinstance(content, list):
+                return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+            return content
+    return ""
+
+
+def _stream_chunks(completion_id: str, model: str, content: str, chunk_size: int = 24):
+    created = int(time.time())
+
+    def chunk(delta: Dict, finish_reason: Optional[str] = None) -> str:
+        body = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    for i in range(0, len(content), chunk_size):
+        yield chunk({"content": content[i:i + chunk_size]})
+    yield chunk({}, finish_reason="stop")
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+@app.post("/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    await _sleep_latency()
+
+    if STUB_ERROR_RATE and _rng.random() < STUB_ERROR_RATE:
+        return JSONResponse(
+            status_code=500,
+            content={"error": {"message": "Injected stub failure", "type": "server_error"}},
+        )
+
+    model = body.get("model") or "stub"
+    prompt = _last_user_message(body.get("messages", []))
+    content = _render(prompt)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+
+    if body.get("stream"):
+        return StreamingResponse(
+            _stream_chunks(completion_id, model, content),
+            media_type="text/event-stream",
+        )
+
+    prompt_tokens = len(prompt.split())
+    completion_tokens = len(content.split())
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+@app.get("/v1/models")
+@app.get("/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "cvision"}]}
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
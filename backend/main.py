@@ -1,27 +1,68 @@
+from startup_profile import StartupProfile
+
+# Times this boot's import / app / warmup phases and every first import made
+# along the way; heavy subsystems are loaded lazily (see GET /api/startup-report)
+startup_profile = StartupProfile()
+startup_profile.install_import_hook()
+
 from fastapi import FastAPI, UploadFile, File, Form
-from fastapi import HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import HTTPException, Header, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Optional, Set, Tuple, Any
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+import atexit
+import hmac
 import io
 import json
+import logging
 import re
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime
-from openai import OpenAI
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
 from dotenv import load_dotenv
-import httpx
-
-try:
-    import docx  # python-docx
-    from docx.shared import Pt, Inches, RGBColor
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-except Exception:
-    docx = None
+import asyncio
+
+from docx_text import extract_docx_text
+from job_cache import SWRCache, normalize_job_query
+from job_catalog import JobCatalog
+from job_sources import JobAggregator, JobSource
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry, RequestMetricsMiddleware, Timer, current_trace
+from pdf_text import DEFAULT_PDF_CHAIN, PageParallelism, extract_pdf_text, extraction_stats, resolve_chain
+from request_log import RequestTimingMiddleware, setup_json_logging
+from request_profiling import ProfilingMiddleware, RequestProfiler
+from resilience import CircuitBreaker, TokenBucket
+from roles_registry import RolesRegistry, RolesSnapshot, SerializedBody
+from skill_tagger import SkillTagger
+from skill_taxonomy import SkillTaxonomy
+from uploads import UploadLimitMiddleware, UploadedDocument
+from zip_stream import stream_zip
+from structured_output import StructuredOutputError, build_repair_prompt, parse_structured
+
+if TYPE_CHECKING:
+    import httpx
+    from job_index import JobIndex
+    from job_matching import PostingMatrix
+
+# python-docx is only needed by the resume builder and is imported on first use
+docx = None
+
+
+@startup_profile.lazy("resume_builder")
+def resume_builder_available() -> bool:
+    """Import python-docx for the resume builder; False if it is not installed"""
+    global docx, Pt, Inches, RGBColor, WD_ALIGN_PARAGRAPH, PreparedDocx
+    try:
+        import docx as python_docx
+        from docx.shared import Pt, Inches, RGBColor
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx_templates import PreparedDocx
+    except Exception:
+        return False
+    docx = python_docx
+    return True
 
 # Load environment variables - flexible for Vercel deployment
 if os.environ.get("VERCEL"):
@@ -33,9 +74,19 @@ else:
     _DOTENV_PATH = os.path.join(_BACKEND_DIR, ".env")
     load_dotenv(dotenv_path=_DOTENV_PATH, override=True)
 
+startup_profile.end_phase("import")
 
 app = FastAPI(title="CVision Standard Analyzer", version="0.1.0")
 
+# Logs are JSON lines written by a background thread (see request_log.py);
+# REQUEST_LOG=0 keeps errors but drops the per-request lines
+log = logging.getLogger("cvision")
+_log_listener = setup_json_logging(log, getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO))
+atexit.register(_log_listener.stop)
+request_log = log.getChild("requests")
+if os.environ.get("REQUEST_LOG", "1") in {"0", "false", "no"}:
+    request_log.setLevel(logging.WARNING)
+
 # CORS - configure for Vercel deployment
 if os.environ.get("VERCEL"):
     # For Vercel deployment, allow your Vercel domain
@@ -57,6 +108,11 @@ else:
     )
     allow_credentials = allowed_origins != ["*"]
 
+# Largest accepted resume upload; bigger request bodies are refused while they stream in.
+# Added before CORSMiddleware so it runs inside it and its 413 carries the CORS headers
+UPLOAD_MAX_BYTES = int(float(os.environ.get("UPLOAD_MAX_MB", "10")) * 1024 * 1024)
+app.add_middleware(UploadLimitMiddleware, max_bytes=UPLOAD_MAX_BYTES, paths=("/analyze-resume", "/ai-analyze-resume"))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
@@ -65,14 +121,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics, scraped in Prometheus text format from GET /metrics (see metrics.py).
+# Component stats (caches, pools, breaker) are read at scrape time by
+# _collect_component_metrics at the end of this file.
+app_metrics = MetricsRegistry()
+STAGE_SECONDS = app_metrics.histogram(
+    "cvision_stage_seconds", "Time spent in each stage of request handling", ["stage"]
+)
+ERRORS = app_metrics.counter("cvision_errors_total", "Errors handled and logged by the app, by where they happened", ["where"])
+UPSTREAM_CALLS = app_metrics.counter("cvision_upstream_calls_total", "Calls to upstream services by outcome", ["upstream", "outcome"])
+POOL_BUSY = app_metrics.gauge("cvision_pool_busy_workers", "Workers of a pool currently running a task", ["pool"])
+POOL_PENDING = app_metrics.gauge("cvision_pool_pending_tasks", "Tasks submitted to a pool and not finished yet", ["pool"])
+HTTP_REQUEST_SECONDS = app_metrics.histogram(
+    "cvision_http_request_seconds", "HTTP request latency by route template and status", ["method", "route", "status"]
+)
+HTTP_IN_FLIGHT = app_metrics.gauge("cvision_http_requests_in_flight", "HTTP requests being handled")
+app.add_middleware(
+    RequestMetricsMiddleware, duration=HTTP_REQUEST_SECONDS, in_flight=HTTP_IN_FLIGHT, skip_paths=("/metrics",)
+)
+
+
+def time_stage(stage: str) -> Timer:
+    """Timing context for one stage (extract_pdf, score, ai_completion, adzuna_fetch, ...)"""
+    return STAGE_SECONDS.labels(stage).time(stage)
+
+
+def note_upload(document: UploadedDocument):
+    """Hash the uploaded document and record hash and size on the request trace (if traced).
+
+    Reads the spool unless extraction already hashed it; call it in the threadpool.
+    """
+    sha256 = document.sha256
+    trace = current_trace()
+    if trace is not None:
+        trace.attributes.update(
+            document_sha256=sha256,
+            document_bytes=document.size,
+            document_type=document.extension or None,
+        )
+
 # OpenAI client for AI analysis
+# OPENROUTER_BASE_URL can point at any OpenAI-compatible server, e.g. the
+# offline stand-in in llm_stub.py for load testing.
 openai_api_key = os.environ.get("OPENROUTER_API_KEY")
+openai_base_url = os.environ.get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+ai_model = os.environ.get("OPENROUTER_MODEL", "openai/gpt-4o-mini")
 if not openai_api_key:
-    print("Warning: OPENROUTER_API_KEY not found in environment variables. AI analysis will not work.")
-    openai_client = None
-else:
-    openai_client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
+    log.warning("OPENROUTER_API_KEY not found in environment variables. AI analysis will not work.")
+
+
+@startup_profile.lazy("ai")
+def get_openai_client():
+    """OpenAI-compatible client, created on first AI request (None without an API key)"""
+    if not openai_api_key:
+        return None
+    from openai import OpenAI
+
+    return OpenAI(
+        base_url=openai_base_url,
         api_key=openai_api_key,
         default_headers={
             "HTTP-Referer": "http://localhost:3000",
@@ -109,17 +215,19 @@ def _load_analyses_from_disk():
                 if isinstance(data, list):
                     resume_analyses_storage = data
     except Exception as e:
-        print(f"Failed to load analyses from disk: {e}")
+        ERRORS.labels("load_analyses").inc()
+        log.error(f"Failed to load analyses from disk: {e}")
         # In Vercel, start with empty storage if disk fails
         resume_analyses_storage = []
 
 def _save_analyses_to_disk():
     """Save resume analyses to disk storage"""
     try:
-        with open(_ANALYSES_JSON, "w", encoding="utf-8") as f:
+        with time_stage("persist_analyses"), open(_ANALYSES_JSON, "w", encoding="utf-8") as f:
             json.dump(resume_analyses_storage, f, ensure_ascii=False)
     except Exception as e:
-        print(f"Failed to save analyses to disk: {e}")
+        ERRORS.labels("persist_analyses").inc()
+        log.error(f"Failed to save analyses to disk: {e}")
         # In Vercel, continue without persistence
         pass
 
@@ -243,28 +351,34 @@ def _compose_contact_line(pi: PersonalInfo) -> str:
     return " \u2022 ".join([p for p in parts if p])
 
 
-def build_resume_docx(payload: ResumeBuildRequest) -> bytes:
-    if docx is None:
-        raise HTTPException(status_code=503, detail="Document service not available (python-docx missing)")
+RESUME_TEMPLATES = ("Modern", "Professional", "Minimal", "Creative")
+_ACCENT_DIVIDER = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 
-    document = docx.Document()
 
-    # Template-specific style setup
-    template = (payload.template or "Modern").strip()
-    template = template if template in {"Modern", "Professional", "Minimal", "Creative"} else "Modern"
+def normalize_template(template: str) -> str:
+    template = (template or "Modern").strip()
+    return template if template in RESUME_TEMPLATES else "Modern"
 
-    def apply_color(run, hex_rgb: str):
-        if not hex_rgb:
-            return
-        try:
-            hex_rgb = hex_rgb.lstrip('#')
-            run.font.color.rgb = RGBColor(int(hex_rgb[0:2], 16), int(hex_rgb[2:4], 16), int(hex_rgb[4:6], 16))
-        except Exception:
-            pass
 
-    # Header: Name (distinct per template)
+def apply_color(run, hex_rgb: str):
+    if not hex_rgb:
+        return
+    try:
+        hex_rgb = hex_rgb.lstrip('#')
+        run.font.color.rgb = RGBColor(int(hex_rgb[0:2], 16), int(hex_rgb[2:4], 16), int(hex_rgb[4:6], 16))
+    except Exception:
+        pass
+
+
+def prepare_resume_template(template: str):
+    """Base document of a template: everything that does not depend on the payload"""
+    if not resume_builder_available():
+        raise RuntimeError("python-docx is not installed")
+    document = docx.Document()
+
+    # Header: Name (distinct per template); the text is filled in per resume
     name_paragraph = document.add_paragraph()
-    name_run = name_paragraph.add_run(payload.personalInfo.fullName or "Your Name")
+    name_run = name_paragraph.add_run()
     name_run.bold = True
 
     if template == "Modern":
@@ -287,10 +401,31 @@ def build_resume_docx(payload: ResumeBuildRequest) -> bytes:
     # Optional accent divider for Modern/Creative
     if template in {"Modern", "Creative"}:
         divider = document.add_paragraph()
-        dr = divider.add_run("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        dr = divider.add_run(_ACCENT_DIVIDER)
         apply_color(dr, "e5e7eb")
         divider.paragraph_format.space_after = Pt(4)
 
+    return document
+
+
+# Prepared once per template (see docx_templates.py); filled at startup
+_resume_templates: Dict[str, "PreparedDocx"] = {}
+
+
+def get_resume_template(template: str) -> "PreparedDocx":
+    prepared = _resume_templates.get(template)
+    if prepared is None:
+        prepared = _resume_templates[template] = PreparedDocx(prepare_resume_template(template))
+    return prepared
+
+
+startup_profile.add_warmup("resume_templates", lambda: [get_resume_template(t) for t in RESUME_TEMPLATES])
+
+
+def fill_resume_document(document, payload: ResumeBuildRequest, template: str):
+    """Write the payload into a document created from the template's base"""
+    document.paragraphs[0].runs[0].text = payload.personalInfo.fullName or "Your Name"
+
     # Contact line (distinct alignment + subtle color)
     contact = _compose_contact_line(payload.personalInfo)
     if contact:
@@ -377,17 +512,121 @@ def build_resume_docx(payload: ResumeBuildRequest) -> bytes:
             if proj.link:
                 document.add_paragraph(proj.link)
 
-    # Serialize to bytes
-    buffer = io.BytesIO()
-    document.save(buffer)
-    buffer.seek(0)
-    return buffer.read()
+
+def resume_payload_text(payload: ResumeBuildRequest) -> str:
+    """The text the built DOCX reads back as (one paragraph per line), without building it"""
+    template = normalize_template(payload.template)
+    lines: List[str] = [payload.personalInfo.fullName or "Your Name"]
+    if template in {"Modern", "Creative"}:
+        lines.append(_ACCENT_DIVIDER)
+
+    def title(name: str):
+        lines.append(name.upper() if template in {"Professional", "Minimal"} else name)
+
+    def bullets(items: List[str]):
+        lines.extend(item.strip() for item in items if item and item.strip())
+
+    contact = _compose_contact_line(payload.personalInfo)
+    if contact:
+        lines.append(contact)
+    if payload.summary and payload.summary.strip():
+        title("Summary")
+        lines.append(payload.summary.strip())
+    skills = payload.skills
+    if any([skills.technical, skills.soft, skills.languages, skills.tools]):
+        title("Skills")
+        for label, values in [("Technical", skills.technical), ("Soft", skills.soft),
+                              ("Languages", skills.languages), ("Tools", skills.tools)]:
+            if values:
+                lines.append(f"{label}: " + ", ".join(values))
+    if payload.experience:
+        title("Experience")
+        for exp in payload.experience:
+            header = ", ".join([p for p in [exp.position, exp.company] if p])
+            dates = " - ".join([p for p in [exp.startDate, exp.endDate] if p])
+            title_line = header + (f"  |  {dates}" if dates else "")
+            if title_line:
+                lines.append(title_line)
+            if exp.description and exp.description.strip():
+                lines.append(exp.description.strip())
+            bullets(exp.responsibilities or [])
+            bullets(exp.achievements or [])
+    if payload.education:
+        title("Education")
+        for edu in payload.education:
+            header = ", ".join([p for p in [edu.degree, edu.field] if p])
+            line_parts = [part for part in [header, edu.school or "", edu.graduationDate or ""] if part]
+            if line_parts:
+                lines.append(" | ".join(line_parts))
+            if edu.gpa:
+                lines.append(f"GPA: {edu.gpa}")
+            bullets(edu.achievements or [])
+    if payload.projects:
+        title("Projects")
+        for proj in payload.projects:
+            if proj.name:
+                lines.append(proj.name + (f" — {proj.technologies}" if proj.technologies else ""))
+            if proj.description:
+                lines.append(proj.description)
+            bullets(proj.responsibilities or [])
+            bullets(proj.achievements or [])
+            if proj.link:
+                lines.append(proj.link)
+    return "\n".join(lines)
+
+
+def build_resume_docx(payload: ResumeBuildRequest) -> bytes:
+    if not resume_builder_available():
+        raise HTTPException(status_code=503, detail="Document service not available (python-docx missing)")
+
+    template = normalize_template(payload.template)
+
+    with time_stage("build_docx"):
+        prepared = get_resume_template(template)
+        document = prepared.new_document()
+        fill_resume_document(document, payload, template)
+        return prepared.render(document)
+
+
+# DOCX generation is CPU-bound; run it on a dedicated pool so it neither
+# blocks the event loop nor starves the default threadpool
+RESUME_BUILD_WORKERS = int(os.environ.get("RESUME_BUILD_WORKERS", str(min(4, os.cpu_count() or 1))))
+RESUME_BATCH_MAX = int(os.environ.get("RESUME_BATCH_MAX", "100"))
+resume_build_executor = ThreadPoolExecutor(max_workers=RESUME_BUILD_WORKERS, thread_name_prefix="resume-build")
+
+
+@app.on_event("shutdown")
+async def _shutdown_resume_build_executor():
+    resume_build_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _build_resume_docx_on_pool(payload: ResumeBuildRequest) -> bytes:
+    with POOL_BUSY.labels("resume_build").track():
+        return build_resume_docx(payload)
+
+
+def _submit_resume_build(payload: ResumeBuildRequest) -> "Future[bytes]":
+    # Counted from submit until done, so the queue depth needs no executor internals
+    pending = POOL_PENDING.labels("resume_build")
+    pending.inc()
+    try:
+        future = resume_build_executor.submit(_build_resume_docx_on_pool, payload)
+    except BaseException:
+        pending.dec()
+        raise
+    future.add_done_callback(lambda _: pending.dec())
+    return future
+
+
+async def build_resume_docx_async(payload: ResumeBuildRequest) -> bytes:
+    """build_resume_docx on the resume build pool"""
+    return await asyncio.wrap_future(_submit_resume_build(payload))
 
 
 @app.post("/build-resume")
 async def build_resume(req: ResumeBuildRequest):
     try:
-        content = build_resume_docx(req)
+        content = await build_resume_docx_async(req)
         filename = (req.personalInfo.fullName or "resume").replace(" ", "_") + ".docx"
         return StreamingResponse(
             io.BytesIO(content),
@@ -399,12 +638,60 @@ async def build_resume(req: ResumeBuildRequest):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error building resume: {e}")
+        ERRORS.labels("build_resume").inc()
+        log.error(f"Error building resume: {e}")
         raise HTTPException(status_code=500, detail="Failed to build resume")
 
 
+@app.post("/build-resume/batch")
+async def build_resume_batch(reqs: List[ResumeBuildRequest]):
+    """Build many resumes and stream them back as one ZIP, entries in completion order"""
+    if not reqs:
+        raise HTTPException(status_code=400, detail="No resumes to build")
+    if len(reqs) > RESUME_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {RESUME_BATCH_MAX} resumes per batch")
+    if not resume_builder_available():
+        raise HTTPException(status_code=503, detail="Document service not available (python-docx missing)")
+
+    async def build(index: int, req: ResumeBuildRequest):
+        try:
+            return index, req, await build_resume_docx_async(req), None
+        except Exception as e:
+            return index, req, None, e
+
+    async def entries():
+        tasks = [asyncio.ensure_future(build(i, req)) for i, req in enumerate(reqs)]
+        errors = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, req, content, error = await next_done
+                if error is not None:
+                    ERRORS.labels("build_resume").inc()
+                    log.error(f"Error building resume {index} in batch: {error}")
+                    errors.append({"index": index, "error": "Failed to build resume"})
+                    continue
+                stem = re.sub(r"[^A-Za-z0-9._-]+", "_", req.personalInfo.fullName or "resume")
+                yield f"{index + 1:03d}_{stem}.docx", content
+            if errors:
+                yield "errors.json", json.dumps(sorted(errors, key=lambda e: e["index"]), indent=2).encode("utf-8")
+        finally:
+            # Client went away or the archive is done: drop builds still queued
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(
+        stream_zip(entries()),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=\"resumes.zip\""},
+    )
+
+
 def send_feedback_email(feedback: FeedbackRequest):
     """Send feedback email to the team"""
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     try:
         # Email configuration
         sender_email = "cvision.feedback@gmail.com"  # You'll need to set up this email
@@ -444,85 +731,153 @@ def send_feedback_email(feedback: FeedbackRequest):
             server.quit()
             return True
         else:
-            print("Email password not configured. Feedback would be sent to:", recipients)
-            print("Feedback content:", body)
+            log.info("Email password not configured; feedback not sent", extra={"fields": {"recipients": recipients, "feedback": body}})
             return False
             
     except Exception as e:
-        print(f"Error sending feedback email: {e}")
+        log.error(f"Error sending feedback email: {e}")
         return False
 
 
-def _load_roles_dataset() -> Dict[str, Dict[str, List[str]]]:
-    """Load job roles dataset from roles.json file"""
-    try:
-        repo_root = os.path.dirname(os.path.abspath(__file__))
-        roles_path = os.path.join(repo_root, "roles.json")
-        with open(roles_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
+# ==== Job Search Service ====
 
 
-ROLES_DATASET = _load_roles_dataset()
+ROLES_CACHE_CONTROL = f"public, max-age={int(os.environ.get('ROLES_CACHE_MAX_AGE', '60'))}"
 
-# ==== Job Search Service ====
+
+def _if_none_match(header: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _serialized_response(request: Request, serialized: SerializedBody, roles: RolesSnapshot) -> Response:
+    """A pre-serialized roles body, or 304 when the client already has these bytes"""
+    headers = {"ETag": serialized.etag, "Cache-Control": ROLES_CACHE_CONTROL, "X-Roles-Version": roles.version}
+    if _if_none_match(request.headers.get("if-none-match"), serialized.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=serialized.body, media_type="application/json", headers=headers)
 
 
 @app.get("/job-categories")
-async def list_job_categories():
-    return {"categories": sorted(list(ROLES_DATASET.keys()))}
+async def list_job_categories(request: Request):
+    roles = roles_registry.current()
+    return _serialized_response(request, roles.categories_body, roles)
 
 
 @app.get("/job-roles")
-async def list_job_roles(category: Optional[str] = None):
+async def list_job_roles(request: Request, category: Optional[str] = None):
+    roles = roles_registry.current()
     if not category:
-        # Return nested structure compatible with frontend fallback shape
-        # { category: { role: { description: str, required_skills: [str] } } }
-        nested: Dict[str, Dict[str, Dict[str, List[str]]]] = {}
-        for cat, roles in ROLES_DATASET.items():
-            nested[cat] = {}
-            for role, skills in roles.items():
-                nested[cat][role] = {
-                    "description": "",
-                    "required_skills": skills,
-                }
-        return nested
-    roles = ROLES_DATASET.get(category, {})
-    return {"category": category, "roles": sorted(list(roles.keys()))}
+        # Nested { category: { role: { description, required_skills } } } shape
+        return _serialized_response(request, roles.roles_body, roles)
+    return _serialized_response(request, roles.category_roles_body(category), roles)
 
 
-def extract_text_from_upload(file: UploadFile) -> str:
-    """Extract text content from uploaded resume file (PDF, DOCX, or plain text)"""
-    data = file.file.read()
-    # Reset pointer so other functions can re-read if needed
-    try:
-        file.file.seek(0)
-    except Exception:
-        pass
+ADMIN_API_TOKEN = os.environ.get("ADMIN_API_TOKEN")
+
+
+def _is_admin(token: Optional[str]) -> bool:
+    return bool(ADMIN_API_TOKEN and token and hmac.compare_digest(token, ADMIN_API_TOKEN))
+
+
+def _require_admin(token: Optional[str]):
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API disabled (set ADMIN_API_TOKEN)")
+    if not _is_admin(token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@app.get("/api/roles/version")
+async def roles_version():
+    return {**roles_registry.current().describe(), "reloads": roles_registry.reloads}
+
 
-    filename = (file.filename or "").lower()
-    if filename.endswith(".pdf"):
+@app.post("/admin/roles/reload")
+async def reload_roles(x_admin_token: Optional[str] = Header(None)):
+    """Re-read roles.json now instead of waiting for the mtime check"""
+    _require_admin(x_admin_token)
+    previous = roles_registry.current().version
+    # Rebuilding the artifacts is CPU-bound; the swap itself is a single assignment
+    roles = await run_in_threadpool(roles_registry.reload)
+    return {**roles.describe(), "previous_version": previous, "changed": roles.version != previous}
+
+
+# PDF backends tried fastest first; the last one is the precise fallback (see pdf_text.py)
+PDF_EXTRACTOR_CHAIN = resolve_chain([n.strip() for n in os.environ.get("PDF_EXTRACTORS", ",".join(DEFAULT_PDF_CHAIN)).split(",") if n.strip()])
+# Opt-in: with PDF_PARALLEL_WORKERS > 1, documents of PDF_PARALLEL_MIN_PAGES to PDF_PARALLEL_MAX_PAGES
+# pages are extracted in page ranges on a process pool (measure the threshold with bench_pdf_extract.py --parallel)
+pdf_page_parallelism = PageParallelism(
+    min_pages=int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "64")),
+    workers=int(os.environ.get("PDF_PARALLEL_WORKERS", "1")),
+    pages_per_task=int(os.environ.get("PDF_PARALLEL_PAGES_PER_TASK", "16")),
+    max_tasks_per_child=int(os.environ.get("PDF_PARALLEL_TASKS_PER_WORKER", "16")),
+    max_pages=int(os.environ.get("PDF_PARALLEL_MAX_PAGES", "1000")),
+)
+
+
+@app.on_event("shutdown")
+async def _shutdown_pdf_page_pool():
+    pdf_page_parallelism.shutdown()
+
+
+@startup_profile.lazy("pdf")
+def _load_pdf_backends():
+    """pdfminer's modules, imported with the first PDF upload"""
+    import pdfminer.converter  # noqa: F401
+    import pdfminer.layout  # noqa: F401
+    import pdfminer.pdfinterp  # noqa: F401
+    import pdfminer.pdfpage  # noqa: F401
+
+
+
+
+def extract_text_from_document(document: UploadedDocument) -> str:
+    """Extract text content from an uploaded resume (PDF, DOCX, or plain text), reading it in place"""
+    extension = document.extension
+    if extension == ".pdf":
         try:
-            from pdfminer.high_level import extract_text as pdf_text
-            return pdf_text(io.BytesIO(data)) or ""
+            _load_pdf_backends()
+            with time_stage("extract_pdf"):
+                return extract_pdf_text(document.stream(), PDF_EXTRACTOR_CHAIN, pdf_page_parallelism)[0] or ""
         except Exception:
+            ERRORS.labels("extract_pdf").inc()
             return ""
-    elif filename.endswith(".docx"):
+    elif extension == ".docx":
         try:
-            import docx  # python-docx
-            doc = docx.Document(io.BytesIO(data))
-            return "\n".join([p.text for p in doc.paragraphs])
+            with time_stage("extract_docx"):
+                return extract_docx_text(document.stream())
         except Exception:
+            ERRORS.labels("extract_docx").inc()
             return ""
     else:
         # Fallback plain text
         try:
-            return data.decode("utf-8", errors="ignore")
+            with time_stage("extract_text"):
+                return document.read().decode("utf-8", errors="ignore")
         except Exception:
             return ""
 
 
+def read_upload(document: Optional[UploadedDocument], text: Optional[str]) -> str:
+    """Resume text from the form field or else the upload, hashing the upload too (blocking)"""
+    resume_text = (text or "").strip()
+    if document is not None:
+        if not resume_text:
+            resume_text = extract_text_from_document(document)
+        # After extraction: plain text uploads were hashed in the same read
+        note_upload(document)
+    return resume_text
+
+
+def extract_text_from_upload(file: UploadFile) -> str:
+    """Extract text content from uploaded resume file (PDF, DOCX, or plain text)"""
+    return extract_text_from_document(UploadedDocument(file))
+
+
 def word_present(text: str, term: str) -> bool:
     """Check if a word is present in text using word boundaries"""
     return re.search(rf"\b{re.escape(term)}\b", text, flags=re.I) is not None
@@ -542,51 +897,50 @@ def tokenize(text: str) -> Tuple[List[str], List[str]]:
     return tokens, bigrams
 
 
-ALIASES: Dict[str, List[str]] = {
-    # Languages / Core
-    "javascript": ["js", "nodejs", "node.js", "vanilla js", "ecmascript"],
-    "typescript": ["ts"],
-    "python": ["py"],
-    "java": [],
-    "sql": ["postgres", "postgresql", "mysql", "sqlite"],
-    "nosql": ["mongodb", "dynamo", "dynamodb", "cassandra"],
-    "html": ["html5"],
-    "css": ["css3", "scss", "sass", "tailwind", "bootstrap"],
-
-    # Frameworks / Libraries
-    "react": ["reactjs", "react.js", "next", "nextjs", "next.js"],
-    "next.js": ["next", "nextjs"],
-    "redux": ["redux toolkit", "rtk"],
-    "testing-library": ["react testing library"],
-    "cypress": ["e2e", "end to end testing"],
-    "webpack": [],
-    "vite": [],
-    "express": ["expressjs", "express.js"],
-    "fastapi": [],
-    "spring": ["spring boot", "springboot"],
-    "graphql": [],
-
-    # Infra / DevOps
-    "docker": [],
-    "kubernetes": ["k8s"],
-    "aws": ["amazon web services", "ec2", "s3", "lambda", "rds"],
-    "ci/cd": ["cicd", "continuous integration", "continuous delivery", "github actions", "gitlab ci"],
-    "git": ["github", "gitlab", "bitbucket"],
-    "redis": [],
-    "caching": ["cache"],
-
-    # Concepts
-    "rest": ["restful", "rest api", "apis"],
-    "system design": ["architecture", "scalability"],
-    "design patterns": ["patterns"],
-    "algorithms": ["algo"],
-    "data structures": ["ds"],
-    "machine learning": ["ml", "mlops"],
-    "model evaluation": ["evaluation", "metrics"],
-    "feature engineering": ["features"],
+def _load_skill_taxonomy() -> SkillTaxonomy:
+    """Canonical skills, aliases and display labels from skills_taxonomy.json"""
+    try:
+        return SkillTaxonomy.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json"))
+    except Exception as e:
+        log.error(f"Failed to load skill taxonomy: {e}")
+        return SkillTaxonomy({})
+
+
+# Role skills are added per roles snapshot (roles_registry.current().taxonomy)
+SKILL_TAXONOMY = _load_skill_taxonomy()
+
+
+# Skill tags for postings that come without any (Adzuna). Aliases that are
+# ordinary words in job ads would tag nearly every posting, so they only
+# count for resume matching.
+SKILL_TAG_EXCLUDED_ALIASES = {
+    "next", "patterns", "features", "metrics", "evaluation", "cache", "architecture",
+    "scalability", "apis", "ds", "algo", "e2e", "ts", "py", "lambda",
 }
 
 
+def _build_skill_tagger(roles: RolesSnapshot) -> SkillTagger:
+    taxonomy = roles.taxonomy
+    vocabulary = {skill: list(taxonomy.skill_terms(skill)[1:]) for skill in taxonomy.names}
+    labels = {skill: taxonomy.label(skill) for skill in vocabulary}
+    return SkillTagger(vocabulary, labels=labels, exclude=SKILL_TAG_EXCLUDED_ALIASES)
+
+
+# roles.json is re-read when it changes (or on POST /admin/roles/reload); everything
+# derived from it is rebuilt into a new snapshot and swapped in atomically
+roles_registry = RolesRegistry(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "roles.json"),
+    check_interval=float(os.environ.get("ROLES_RELOAD_INTERVAL", "2")),
+    taxonomy=SKILL_TAXONOMY,
+    artifact_builders={"skill_tagger": _build_skill_tagger},
+)
+
+
+def posting_skill_tagger() -> SkillTagger:
+    """Skill tagger compiled for the current roles dataset"""
+    return roles_registry.current().artifacts["skill_tagger"]
+
+
 def tokens_contain(tokens: List[str], target: str) -> bool:
     """Check if target string is contained in tokens with fuzzy matching"""
     t = target.lower()
@@ -603,36 +957,88 @@ def tokens_contain(tokens: List[str], target: str) -> bool:
 
 def fuzzy_similar(a: str, b: str, threshold: float = 0.9) -> bool:
     """Check if two strings are similar using sequence matching"""
+    a, b = a.lower(), b.lower()
+    # ratio() is at most 2*min/(len a + len b); skip pairs whose lengths alone rule a match out
+    if 2 * min(len(a), len(b)) < threshold * (len(a) + len(b)):
+        return False
     from difflib import SequenceMatcher
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio() >= threshold
+    matcher = SequenceMatcher(None, a, b)
+    return matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+
+def _compact(token: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "", token.lower())
+
+
+class ResumeTokenIndex:
+    """Lookup sets over a resume's tokens and bigrams, built once per text"""
+
+    def __init__(self, resume_tokens: List[str], resume_bigrams: List[str]):
+        terms = resume_tokens + resume_bigrams
+        self.lowered = frozenset(t.lower() for t in terms)
+        self.compacted = frozenset(_compact(t) for t in terms)
+        # Distinct non-empty compacted terms for the substring/fuzzy pass
+        self.compacted_terms = tuple(c for c in self.compacted if c)
+
+    def contains(self, target: str) -> bool:
+        """Same result as tokens_contain over tokens and bigrams"""
+        return target.lower() in self.lowered or _compact(target) in self.compacted
+
+
+@lru_cache(maxsize=65536)
+def _fuzzy_term_match(term_compact: str, candidate_compact: str) -> bool:
+    # Pure and called with the same pairs on every rescore of similar text
+    return fuzzy_similar(term_compact, candidate_compact, threshold=0.92)
+
+
+def _partial_skill_match(index: ResumeTokenIndex, candidates_compact: Sequence[str]) -> bool:
+    # Substring within tokens (e.g., "typescript" in "ts/tsx/typescript"); distinct
+    # compacted tokens are enough since only whether any token matches counts
+    for c_compact in candidates_compact:
+        for tok_compact in index.compacted_terms:
+            if c_compact in tok_compact:
+                return True
+            if len(c_compact) >= 4 and _fuzzy_term_match(tok_compact, c_compact):
+                return True
+    return False
+
 
-def match_skill(resume_tokens: List[str], resume_bigrams: List[str], skill: str) -> bool:
+def match_skill(
+    resume_tokens: List[str],
+    resume_bigrams: List[str],
+    skill: str,
+    index: Optional[ResumeTokenIndex] = None,
+    taxonomy: Optional[SkillTaxonomy] = None,
+) -> bool:
     """Match a skill against resume tokens using aliases and fuzzy matching"""
-    candidates = [skill] + ALIASES.get(skill.lower(), [])
+    if index is None:
+        index = ResumeTokenIndex(resume_tokens, resume_bigrams)
+    candidates = (taxonomy or SKILL_TAXONOMY).skill_terms(skill)
     # Exact token or bigram match
     for c in candidates:
-        if tokens_contain(resume_tokens, c) or tokens_contain(resume_bigrams, c):
+        if index.contains(c):
             return True
-    # Substring within tokens (e.g., "typescript" in "ts/tsx/typescript")
-    for c in candidates:
-        c_compact = re.sub(r"[^a-z0-9]+", "", c.lower())
-        for tok in resume_tokens + resume_bigrams:
-            tok_compact = re.sub(r"[^a-z0-9]+", "", tok.lower())
-            if c_compact and tok_compact and c_compact in tok_compact:
-                return True
-            if fuzzy_similar(tok_compact, c_compact, threshold=0.92) and len(c_compact) >= 4:
-                return True
-    return False
+    return _partial_skill_match(index, [c for c in map(_compact, candidates) if c])
 
-def score_keyword_match(text: str, skills: List[str]):
+
+def score_keyword_match(text: str, skills: List[str], taxonomy: Optional[SkillTaxonomy] = None):
     """Score how well resume matches required skills"""
+    taxonomy = taxonomy or roles_registry.current().taxonomy
     normalized = normalize_text(text)
     tokens, bigrams = tokenize(normalized)
-    present = []
+    index = ResumeTokenIndex(tokens, bigrams)
+    # Exact mentions of every wanted skill in one pass over the resume's terms,
+    # then the substring/fuzzy pass only for the skills still unmatched
+    wanted = taxonomy.bits(skills)
+    found = taxonomy.term_bits(index.lowered, index.compacted) & wanted
+    for skill_id in taxonomy.iter_ids(wanted & ~found):
+        if _partial_skill_match(index, taxonomy.compact_terms[skill_id]):
+            found |= 1 << skill_id
+    present: List[str] = []
+    missing: List[str] = []
     for s in skills:
-        if match_skill(tokens, bigrams, s):
-            present.append(s)
-    missing = [s for s in skills if s not in present]
+        matched = taxonomy.has(found, s) or (taxonomy.id(s) is None and match_skill(tokens, bigrams, s, index, taxonomy))
+        (present if matched else missing).append(s)
     score = round((len(present) / max(1, len(skills))) * 100)
     return score, missing
 
@@ -668,6 +1074,41 @@ def score_format(text: str, raw_len: int) -> int:
     return max(0, min(100, score))
 
 
+def contact_info(text: str) -> Dict[str, bool]:
+    """Detect contact details present in the resume text"""
+    lowered = text.lower()
+    return {
+        "has_email": bool(re.search(r"[\w.+'-]+@[\w.-]+\.[A-Za-z]{2,}", text)),
+        "has_phone": bool(re.search(r"(\+?\d[\s-]?){7,}\d", text)),
+        "has_linkedin": "linkedin.com" in lowered,
+        "has_github": "github.com" in lowered,
+    }
+
+
+def text_metrics(text: str) -> Dict[str, int]:
+    """Word count and estimated reading time of the resume text"""
+    word_count = len(re.findall(r"\w+", text))
+    return {"word_count": word_count, "reading_time_minutes": max(1, round(word_count / 200))}
+
+
+def local_analysis_fields(text: str, skills: List[str], raw_len: int, taxonomy: Optional[SkillTaxonomy] = None) -> Dict[str, Any]:
+    """Locally scored values for every AnalyzeResponse field, used to fill gaps in AI replies"""
+    km_score, missing = score_keyword_match(text, skills, taxonomy)
+    sec_score = score_sections(text)
+    fmt_score = score_format(text, raw_len)
+    return {
+        "ats_score": round(0.5 * km_score + 0.25 * sec_score + 0.25 * fmt_score),
+        "keyword_match": {"score": km_score},
+        "missing_skills": missing,
+        "format_score": fmt_score,
+        "section_score": sec_score,
+        "suggestions": [],
+        "jd_match_score": None,
+        "contact": contact_info(text),
+        "metrics": text_metrics(text),
+    }
+
+
 class AnalyzeResponse(BaseModel):
     ats_score: int
     keyword_match: Dict[str, int]
@@ -680,32 +1121,28 @@ class AnalyzeResponse(BaseModel):
     metrics: Dict[str, int]
 
 
-@app.post("/analyze-resume", response_model=AnalyzeResponse)
-async def analyze_resume(
-    file: Optional[UploadFile] = File(None),
-    job_category: str = Form(...),
-    job_role: str = Form(...),
-    custom_job_description: Optional[str] = Form(None),
-    text: Optional[str] = Form(None),
-    user_id: str = Form("default_user"),
-):
-    if not file and not text:
-        raise HTTPException(status_code=400, detail="Provide either a file or text")
-
-    raw = b""
-    if file:
-        raw = file.file.read()
-        try:
-            file.file.seek(0)
-        except Exception:
-            pass
-
-    resume_text = (text or "").strip() or (extract_text_from_upload(file) if file else "")
-
-    skills = ROLES_DATASET.get(job_category, {}).get(job_role, [])
-    km_score, missing = score_keyword_match(resume_text, skills)
+# Built once; validating through a prepared adapter avoids per-call schema setup
+_ANALYZE_RESPONSE_ADAPTER = TypeAdapter(AnalyzeResponse)
+_ANALYZE_RESPONSE_NESTED_KEYS = {
+    "keyword_match": ["score"],
+    "contact": ["has_email", "has_phone", "has_linkedin", "has_github"],
+    "metrics": ["word_count", "reading_time_minutes"],
+}
+# Fields only the model can provide; a reply without them goes to the repair round
+_ANALYZE_RESPONSE_REQUIRED = ("ats_score", "suggestions")
+
+
+def score_resume_text(
+    resume_text: str,
+    skills: List[str],
+    raw_len: int,
+    custom_job_description: Optional[str] = None,
+    taxonomy: Optional[SkillTaxonomy] = None,
+) -> Dict[str, Any]:
+    """Standard (non-AI) analysis of resume text against a role's skills"""
+    km_score, missing = score_keyword_match(resume_text, skills, taxonomy)
     sec_score = score_sections(resume_text)
-    fmt_score = score_format(resume_text, len(raw))
+    fmt_score = score_format(resume_text, raw_len)
     ats = round(0.5 * km_score + 0.25 * sec_score + 0.25 * fmt_score)
 
     suggestions: List[str] = []
@@ -731,12 +1168,7 @@ async def analyze_resume(
         )
 
     # Contact info checks
-    contact = {
-        "has_email": bool(re.search(r"[\w.+'-]+@[\w.-]+\.[A-Za-z]{2,}", resume_text)),
-        "has_phone": bool(re.search(r"(\+?\d[\s-]?){7,}\d", resume_text)),
-        "has_linkedin": "linkedin.com" in resume_text.lower(),
-        "has_github": "github.com" in resume_text.lower(),
-    }
+    contact = contact_info(resume_text)
     if not contact["has_email"]:
         suggestions.append("Add a professional email address in the header.")
     if not contact["has_phone"]:
@@ -762,10 +1194,9 @@ async def analyze_resume(
                 suggestions.append("Mirror the language of the job description where appropriate.")
 
     # Metrics
-    word_count = len(re.findall(r"\w+", resume_text))
-    reading_time_minutes = max(1, round(word_count / 200))
+    metrics = text_metrics(resume_text)
 
-    result = {
+    return {
         "ats_score": ats,
         "keyword_match": {"score": km_score},
         "missing_skills": missing,
@@ -774,8 +1205,36 @@ async def analyze_resume(
         "suggestions": suggestions,
         "jd_match_score": jd_match_score,
         "contact": contact,
-        "metrics": {"word_count": word_count, "reading_time_minutes": reading_time_minutes},
+        "metrics": metrics,
     }
+
+
+@app.post("/analyze-resume", response_model=AnalyzeResponse)
+async def analyze_resume(
+    response: Response,
+    file: Optional[UploadFile] = File(None),
+    job_category: str = Form(...),
+    job_role: str = Form(...),
+    custom_job_description: Optional[str] = Form(None),
+    text: Optional[str] = Form(None),
+    user_id: str = Form("default_user"),
+):
+    if not file and not text:
+        raise HTTPException(status_code=400, detail="Provide either a file or text")
+
+    # Read in place from the parser's spool; no bytes copy of the whole file
+    document = UploadedDocument(file, UPLOAD_MAX_BYTES) if file else None
+    raw_len = document.size if document else 0
+
+    # Extraction is CPU-bound (and may wait on the PDF page pool) and hashing reads
+    # the whole spool; keep both off the event loop
+    resume_text = await run_in_threadpool(read_upload, document, text)
+
+    roles = roles_registry.current()
+    response.headers["X-Roles-Version"] = roles.version
+    skills = roles.skills(job_category, job_role) or []
+    with time_stage("score"):
+        result = score_resume_text(resume_text, skills, raw_len, custom_job_description, roles.taxonomy)
     
     # Store the analysis for dashboard
     try:
@@ -784,15 +1243,16 @@ async def analyze_resume(
         
         # Persist upload to disk if provided
         saved_path = None
-        if file and raw:
+        if document and document.size:
             safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", file.filename or "resume")
             unique_prefix = datetime.now().strftime("%Y%m%d%H%M%S%f")
             saved_path = os.path.join(_UPLOADS_DIR, f"{unique_prefix}_{safe_name}")
             try:
-                with open(saved_path, "wb") as out:
-                    out.write(raw)
+                with time_stage("persist_upload"):
+                    document.save(saved_path)
             except Exception as e:
-                print(f"Failed to save upload: {e}")
+                ERRORS.labels("persist_upload").inc()
+                log.error(f"Failed to save upload: {e}")
 
         analysis_data = {
             "id": str(uuid.uuid4()),
@@ -801,10 +1261,12 @@ async def analyze_resume(
             "job_category": job_category,
             "job_role": job_role,
             "analysis_type": "standard",
+            "roles_version": roles.version,
             "analysis_result": result,
             "created_at": datetime.now().isoformat(),
             "file_name": file.filename if file else None,
             "file_path": saved_path,
+            "file_sha256": document.sha256 if document else None,
             "file_mime": (
                 "application/pdf" if (file and (file.filename or "").lower().endswith(".pdf")) else (
                     "application/vnd.openxmlformats-officedocument.wordprocessingml.document" if (file and (file.filename or "").lower().endswith(".docx")) else "text/plain"
@@ -814,13 +1276,49 @@ async def analyze_resume(
         resume_analyses_storage.append(analysis_data)
         _save_analyses_to_disk()
     except Exception as e:
-        print(f"Failed to store analysis: {e}")
+        ERRORS.labels("store_analysis").inc()
+        log.error(f"Failed to store analysis: {e}")
     
     return result
 
 
+class StructuredAnalyzeRequest(ResumeBuildRequest):
+    job_category: str
+    job_role: str
+    custom_job_description: Optional[str] = None
+
+
+@app.post("/analyze-structured", response_model=AnalyzeResponse)
+async def analyze_structured(req: StructuredAnalyzeRequest, response: Response):
+    """Score a resume-builder payload directly, as /analyze-resume would score its DOCX"""
+    resume_text = resume_payload_text(req)
+    roles = roles_registry.current()
+    response.headers["X-Roles-Version"] = roles.version
+    skills = roles.skills(req.job_category, req.job_role) or []
+    # The built DOCX is never empty, so any text counts as a non-empty upload
+    with time_stage("score"):
+        return score_resume_text(resume_text, skills, len(resume_text), req.custom_job_description, roles.taxonomy)
+
+
+def _ai_complete(prompt: str, max_tokens: int, temperature: float) -> str:
+    try:
+        with time_stage("ai_completion"):
+            completion = get_openai_client().chat.completions.create(
+                model=ai_model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+    except Exception:
+        UPSTREAM_CALLS.labels("ai", "error").inc()
+        raise
+    UPSTREAM_CALLS.labels("ai", "ok").inc()
+    return (completion.choices[0].message.content or "").strip()
+
+
 @app.post("/ai-analyze-resume", response_model=AnalyzeResponse)
 async def ai_analyze_resume(
+    response: Response,
     file: Optional[UploadFile] = File(None),
     job_category: str = Form(...),
     job_role: str = Form(...),
@@ -831,21 +1329,21 @@ async def ai_analyze_resume(
     if not file and not text:
         raise HTTPException(status_code=400, detail="Provide either a file or text")
 
-    raw = b""
-    if file:
-        raw = file.file.read()
-        try:
-            file.file.seek(0)
-        except Exception:
-            pass
+    # Read in place from the parser's spool; no bytes copy of the whole file
+    document = UploadedDocument(file, UPLOAD_MAX_BYTES) if file else None
+    raw_len = document.size if document else 0
 
-    resume_text = (text or "").strip() or (extract_text_from_upload(file) if file else "")
+    # Extraction is CPU-bound (and may wait on the PDF page pool) and hashing reads
+    # the whole spool; keep both off the event loop
+    resume_text = await run_in_threadpool(read_upload, document, text)
     
     if not resume_text.strip():
         raise HTTPException(status_code=400, detail="No text could be extracted from the provided file")
 
     # Get role skills for context
-    skills = ROLES_DATASET.get(job_category, {}).get(job_role, [])
+    roles = roles_registry.current()
+    response.headers["X-Roles-Version"] = roles.version
+    skills = roles.skills(job_category, job_role) or []
     present_sections = get_present_sections(resume_text)
     
     # Build the AI prompt (broader, avoids redundant suggestions)
@@ -879,83 +1377,80 @@ Return ONLY valid JSON in this schema:
 }}
 """
 
-    if not openai_client:
+    if not openai_api_key:
         raise HTTPException(status_code=503, detail="AI analysis service not configured. Please set OPENROUTER_API_KEY environment variable.")
-    
+
+    def local_fields() -> Dict[str, Any]:
+        # Only computed when the model omitted or garbled a field
+        return local_analysis_fields(resume_text, skills, raw_len, roles.taxonomy)
+
     try:
-        completion = openai_client.chat.completions.create(
-            model="openai/gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=1500,
-        )
-        ai_response = completion.choices[0].message.content.strip()
-        # Try to parse the JSON response
+        ai_response = _ai_complete(prompt, max_tokens=1500, temperature=0.3)
+    except Exception as e:
+        ERRORS.labels("ai_completion").inc()
+        log.error(f"OpenAI API error: {e}")
+        raise HTTPException(status_code=500, detail="AI analysis service unavailable")
+
+    try:
+        parsed, filled = parse_structured(ai_response, _ANALYZE_RESPONSE_ADAPTER, local_fields, _ANALYZE_RESPONSE_NESTED_KEYS, _ANALYZE_RESPONSE_REQUIRED)
+    except StructuredOutputError as e:
+        # One cheap repair round: send back only the broken reply, not the resume
+        log.warning(f"AI response parsing failed ({e}); attempting repair")
         try:
-            if ai_response.startswith("```json"):
-                ai_response = ai_response[7:]
-            if ai_response.endswith("```"):
-                ai_response = ai_response[:-3]
-            analysis_data = json.loads(ai_response)
-            result = {
-                "ats_score": analysis_data.get("ats_score", 0),
-                "keyword_match": analysis_data.get("keyword_match", {"score": 0}),
-                "missing_skills": analysis_data.get("missing_skills", []),
-                "format_score": analysis_data.get("format_score", 0),
-                "section_score": analysis_data.get("section_score", 0),
-                "suggestions": analysis_data.get("suggestions", []),
-                "jd_match_score": analysis_data.get("jd_match_score"),
-                "contact": analysis_data.get("contact", {"has_email": False, "has_phone": False, "has_linkedin": False, "has_github": False}),
-                "metrics": analysis_data.get("metrics", {"word_count": len(re.findall(r"\\w+", resume_text)), "reading_time_minutes": max(1, round(len(re.findall(r"\\w+", resume_text)) / 200))}),
-            }
-            
-            # Store the analysis for dashboard
+            repaired = _ai_complete(build_repair_prompt(ai_response, str(e)), max_tokens=1200, temperature=0)
+            parsed, filled = parse_structured(repaired, _ANALYZE_RESPONSE_ADAPTER, local_fields, _ANALYZE_RESPONSE_NESTED_KEYS, _ANALYZE_RESPONSE_REQUIRED)
+        except Exception as repair_error:
+            ERRORS.labels("ai_parse").inc()
+            log.error(f"AI response repair failed: {repair_error}", extra={"fields": {"ai_response": ai_response}})
+            raise HTTPException(status_code=500, detail="AI analysis failed - using standard analysis")
+    if filled:
+        log.warning("AI response was missing fields; filled from local scoring")
+    result = parsed.model_dump()
+
+    # Store the analysis for dashboard
+    try:
+        import uuid
+        from datetime import datetime
+
+        # Persist upload to disk if provided
+        saved_path = None
+        if document and document.size:
+            safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", file.filename or "resume")
+            unique_prefix = datetime.now().strftime("%Y%m%d%H%M%S%f")
+            saved_path = os.path.join(_UPLOADS_DIR, f"{unique_prefix}_{safe_name}")
             try:
-                import uuid
-                from datetime import datetime
-            
-                # Persist upload to disk if provided
-                saved_path = None
-                if file and raw:
-                    safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", file.filename or "resume")
-                    unique_prefix = datetime.now().strftime("%Y%m%d%H%M%S%f")
-                    saved_path = os.path.join(_UPLOADS_DIR, f"{unique_prefix}_{safe_name}")
-                    try:
-                        with open(saved_path, "wb") as out:
-                            out.write(raw)
-                    except Exception as e:
-                        print(f"Failed to save upload: {e}")
-
-                analysis_data = {
-                    "id": str(uuid.uuid4()),
-                    "user_id": user_id or "default_user",
-                    "resume_name": file.filename if file else "Text Resume",
-                    "job_category": job_category,
-                    "job_role": job_role,
-                    "analysis_type": "ai",
-                    "analysis_result": result,
-                    "created_at": datetime.now().isoformat(),
-                    "file_name": file.filename if file else None,
-                    "file_path": saved_path,
-                    "file_mime": (
-                        "application/pdf" if (file and (file.filename or "").lower().endswith(".pdf")) else (
-                            "application/vnd.openxmlformats-officedocument.wordprocessingml.document" if (file and (file.filename or "").lower().endswith(".docx")) else "text/plain"
-                        )
-                    ) if file else None,
-                }
-                resume_analyses_storage.append(analysis_data)
-                _save_analyses_to_disk()
+                with time_stage("persist_upload"):
+                    document.save(saved_path)
             except Exception as e:
-                print(f"Failed to store AI analysis: {e}")
-            
-            return result
-        except json.JSONDecodeError as e:
-            print(f"AI response parsing failed: {e}")
-            print(f"AI response: {ai_response}")
-            raise HTTPException(status_code=500, detail="AI analysis failed - using standard analysis")
+                ERRORS.labels("persist_upload").inc()
+                log.error(f"Failed to save upload: {e}")
+
+        analysis_data = {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id or "default_user",
+            "resume_name": file.filename if file else "Text Resume",
+            "job_category": job_category,
+            "job_role": job_role,
+            "analysis_type": "ai",
+            "roles_version": roles.version,
+            "analysis_result": result,
+            "created_at": datetime.now().isoformat(),
+            "file_name": file.filename if file else None,
+            "file_path": saved_path,
+            "file_sha256": document.sha256 if document else None,
+            "file_mime": (
+                "application/pdf" if (file and (file.filename or "").lower().endswith(".pdf")) else (
+                    "application/vnd.openxmlformats-officedocument.wordprocessingml.document" if (file and (file.filename or "").lower().endswith(".docx")) else "text/plain"
+                )
+            ) if file else None,
+        }
+        resume_analyses_storage.append(analysis_data)
+        _save_analyses_to_disk()
     except Exception as e:
-        print(f"OpenAI API error: {e}")
-        raise HTTPException(status_code=500, detail="AI analysis service unavailable")
+        ERRORS.labels("store_analysis").inc()
+        log.error(f"Failed to store AI analysis: {e}")
+
+    return result
 
 
 @app.get("/health")
@@ -964,11 +1459,12 @@ async def health():
 
 
 @app.get("/job-skills")
-async def list_job_skills(category: str, role: str):
-    skills = ROLES_DATASET.get(category, {}).get(role)
-    if skills is None:
+async def list_job_skills(request: Request, category: str, role: str):
+    roles = roles_registry.current()
+    serialized = roles.role_skills_body(category, role)
+    if serialized is None:
         raise HTTPException(status_code=404, detail="Category or role not found")
-    return {"category": category, "role": role, "skills": skills}
+    return _serialized_response(request, serialized, roles)
 
 
 @app.post("/store-analysis")
@@ -1011,7 +1507,8 @@ async def download_resume(analysis_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Failed to download resume: {e}")
+        ERRORS.labels("download_resume").inc()
+        log.error(f"Failed to download resume: {e}")
         raise HTTPException(status_code=500, detail="Failed to download resume")
 
 
@@ -1030,424 +1527,29 @@ async def send_feedback(feedback: FeedbackRequest):
 
 # ==== Job Data Functions ====
 
+def _load_mock_job_catalog() -> JobCatalog:
+    """Load and index the fallback job catalog from mock_jobs.json"""
+    try:
+        repo_root = os.path.dirname(os.path.abspath(__file__))
+        return JobCatalog.from_file(os.path.join(repo_root, "mock_jobs.json"))
+    except Exception as e:
+        log.error(f"Failed to load mock job catalog: {e}")
+        return JobCatalog([])
+
+
+MOCK_JOB_CATALOG = _load_mock_job_catalog()
+
+
 def get_enhanced_mock_jobs(page: int = 0, keyword: str = "", location: str = "", job_type: str = "full_time") -> dict:
     """Enhanced mock data as fallback"""
-    all_jobs = [
-        {
-            "id": 1,
-            "title": "Senior Software Engineer",
-            "company": "GitHub",
-            "location": "San Francisco, CA",
-            "type": "Full-time",
-            "salary": "$120,000 - $180,000",
-            "experience": "Senior Level",
-            "description": "Join GitHub's engineering team to build the future of software development. Work on distributed systems, API design, and developer tools used by millions worldwide.",
-            "posted": "2 days ago",
-            "logo": "GH",
-            "landing_page": "https://github.com/careers",
-            "categories": ["Engineering"],
-            "tags": ["Python", "Go", "Kubernetes", "Cloud"]
-        },
-        {
-            "id": 101,
-            "title": "Software Engineering Intern",
-            "company": "Google",
-            "location": "Mountain View, CA",
-            "type": "Internship",
-            "salary": "$6,000 - $8,000/month",
-            "experience": "Entry Level",
-            "description": "Join Google's engineering team as an intern. Work on real projects, learn from experienced engineers, and contribute to products used by billions.",
-            "posted": "3 days ago",
-            "logo": "GO",
-            "landing_page": "https://careers.google.com",
-            "categories": ["Engineering"],
-            "tags": ["Python", "Java", "Machine Learning", "Internship"]
-        },
-        {
-            "id": 102,
-            "title": "Data Science Intern",
-            "company": "Meta",
-            "location": "Menlo Park, CA",
-            "type": "Internship",
-            "salary": "$5,500 - $7,500/month",
-            "experience": "Entry Level",
-            "description": "Work on data science projects at Meta. Analyze user behavior, build ML models, and contribute to data-driven decision making.",
-            "posted": "1 week ago",
-            "logo": "ME",
-            "landing_page": "https://careers.meta.com",
-            "categories": ["Data Science"],
-            "tags": ["Python", "R", "SQL", "Machine Learning", "Internship"]
-        },
-        {
-            "id": 103,
-            "title": "Frontend Developer (Part-time)",
-            "company": "Shopify",
-            "location": "Remote",
-            "type": "Part-time",
-            "salary": "$40 - $60/hour",
-            "experience": "Mid Level",
-            "description": "Part-time frontend development role. Work on Shopify's merchant tools and help small businesses succeed online.",
-            "posted": "5 days ago",
-            "logo": "SH",
-            "landing_page": "https://careers.shopify.com",
-            "categories": ["Engineering"],
-            "tags": ["React", "JavaScript", "CSS", "Part-time"]
-        },
-        {
-            "id": 104,
-            "title": "DevOps Engineer (Contract)",
-            "company": "Netflix",
-            "location": "Los Gatos, CA",
-            "type": "Contract",
-            "salary": "$80 - $120/hour",
-            "experience": "Senior Level",
-            "description": "Contract DevOps role to help scale Netflix's infrastructure. Work on cloud migration and automation projects.",
-            "posted": "2 weeks ago",
-            "logo": "NF",
-            "landing_page": "https://jobs.netflix.com",
-            "categories": ["Engineering"],
-            "tags": ["AWS", "Kubernetes", "Terraform", "Contract"]
-        },
-        {
-            "id": 105,
-            "title": "Software Engineer Intern",
-            "company": "Amazon",
-            "location": "New York, NY",
-            "type": "Internship",
-            "salary": "$5,000 - $7,000/month",
-            "experience": "Entry Level",
-            "description": "Join Amazon's engineering team in NYC. Work on AWS services and e-commerce platforms.",
-            "posted": "4 days ago",
-            "logo": "AM",
-            "landing_page": "https://amazon.jobs",
-            "categories": ["Engineering"],
-            "tags": ["Java", "AWS", "Python", "Internship"]
-        },
-        {
-            "id": 106,
-            "title": "Data Analyst (Part-time)",
-            "company": "Uber",
-            "location": "Chicago, IL",
-            "type": "Part-time",
-            "salary": "$35 - $50/hour",
-            "experience": "Mid Level",
-            "description": "Part-time data analysis role. Analyze ride-sharing data and help optimize operations.",
-            "posted": "1 week ago",
-            "logo": "UB",
-            "landing_page": "https://careers.uber.com",
-            "categories": ["Data Science"],
-            "tags": ["Python", "SQL", "Analytics", "Part-time"]
-        },
-        {
-            "id": 107,
-            "title": "Frontend Developer",
-            "company": "Airbnb",
-            "location": "Austin, TX",
-            "type": "Full-time",
-            "salary": "$100,000 - $140,000",
-            "experience": "Mid Level",
-            "description": "Build user interfaces for Airbnb's platform. Work on booking flows and user experience.",
-            "posted": "6 days ago",
-            "logo": "AB",
-            "landing_page": "https://careers.airbnb.com",
-            "categories": ["Engineering"],
-            "tags": ["React", "JavaScript", "CSS", "Frontend"]
-        },
-        {
-            "id": 108,
-            "title": "Machine Learning Engineer",
-            "company": "Tesla",
-            "location": "Palo Alto, CA",
-            "type": "Full-time",
-            "salary": "$130,000 - $180,000",
-            "experience": "Senior Level",
-            "description": "Work on autonomous driving algorithms and AI systems for Tesla vehicles.",
-            "posted": "3 days ago",
-            "logo": "TS",
-            "landing_page": "https://www.tesla.com/careers",
-            "categories": ["Engineering"],
-            "tags": ["Python", "TensorFlow", "Computer Vision", "AI"]
-        },
-        {
-            "id": 109,
-            "title": "Product Manager",
-            "company": "Slack",
-            "location": "Denver, CO",
-            "type": "Full-time",
-            "salary": "$120,000 - $160,000",
-            "experience": "Mid Level",
-            "description": "Lead product development for Slack's collaboration tools and features.",
-            "posted": "1 week ago",
-            "logo": "SL",
-            "landing_page": "https://slack.com/careers",
-            "categories": ["Product"],
-            "tags": ["Product Management", "Strategy", "Analytics"]
-        },
-        {
-            "id": 110,
-            "title": "Backend Developer (Remote)",
-            "company": "Stripe",
-            "location": "Remote",
-            "type": "Full-time",
-            "salary": "$110,000 - $150,000",
-            "experience": "Mid Level",
-            "description": "Build payment processing systems and APIs. Work remotely with a distributed team.",
-            "posted": "5 days ago",
-            "logo": "ST",
-            "landing_page": "https://stripe.com/jobs",
-            "categories": ["Engineering"],
-            "tags": ["Go", "Python", "APIs", "Payments", "Remote"]
-        },
-        {
-            "id": 2,
-            "title": "Frontend Developer",
-            "company": "Microsoft",
-            "location": "Seattle, WA",
-            "type": "Full-time",
-            "salary": "$100,000 - $150,000",
-            "experience": "Mid Level",
-            "description": "Build user-facing features for Microsoft's cloud platforms. Collaborate with design and backend teams to create intuitive user experiences.",
-            "posted": "1 week ago",
-            "logo": "MS",
-            "landing_page": "https://careers.microsoft.com",
-            "categories": ["Engineering"],
-            "tags": ["React", "TypeScript", "Azure", "CSS"]
-        },
-        {
-            "id": 3,
-            "title": "DevOps Engineer",
-            "company": "Amazon",
-            "location": "Seattle, WA",
-            "type": "Full-time",
-            "salary": "$110,000 - $160,000",
-            "experience": "Mid Level",
-            "description": "Manage infrastructure and deployment pipelines for AWS services. Automate processes and ensure high availability of critical systems.",
-            "posted": "3 days ago",
-            "logo": "AM",
-            "landing_page": "https://amazon.jobs",
-            "categories": ["Engineering"],
-            "tags": ["AWS", "Docker", "Kubernetes", "Terraform"]
-        },
-        {
-            "id": 4,
-            "title": "Data Scientist",
-            "company": "Google",
-            "location": "Mountain View, CA",
-            "type": "Full-time",
-            "salary": "$130,000 - $200,000",
-            "experience": "Senior Level",
-            "description": "Apply machine learning and data analysis to solve complex problems. Work with large datasets to drive product decisions and user insights.",
-            "posted": "5 days ago",
-            "logo": "GO",
-            "landing_page": "https://careers.google.com",
-            "categories": ["Data Science"],
-            "tags": ["Python", "Machine Learning", "TensorFlow", "SQL"]
-        },
-        {
-            "id": 5,
-            "title": "Full Stack Developer",
-            "company": "Netflix",
-            "location": "Los Gatos, CA",
-            "type": "Full-time",
-            "salary": "$115,000 - $170,000",
-            "experience": "Mid Level",
-            "description": "Develop end-to-end solutions for Netflix's streaming platform. Build features that enhance the viewing experience for 200+ million subscribers.",
-            "posted": "1 week ago",
-            "logo": "NF",
-            "landing_page": "https://jobs.netflix.com",
-            "categories": ["Engineering"],
-            "tags": ["JavaScript", "Node.js", "React", "AWS"]
-        },
-        {
-            "id": 6,
-            "title": "Backend Engineer",
-            "company": "Stripe",
-            "location": "San Francisco, CA",
-            "type": "Full-time",
-            "salary": "$125,000 - $185,000",
-            "experience": "Senior Level",
-            "description": "Build scalable payment processing systems. Design APIs and services that handle billions of dollars in transactions securely and reliably.",
-            "posted": "4 days ago",
-            "logo": "ST",
-            "landing_page": "https://stripe.com/jobs",
-            "categories": ["Engineering"],
-            "tags": ["Python", "PostgreSQL", "Redis", "Microservices"]
-        },
-        {
-            "id": 7,
-            "title": "Mobile Developer",
-            "company": "Uber",
-            "location": "San Francisco, CA",
-            "type": "Full-time",
-            "salary": "$105,000 - $155,000",
-            "experience": "Mid Level",
-            "description": "Develop mobile applications for Uber's platform. Create seamless experiences for riders and drivers across iOS and Android platforms.",
-            "posted": "6 days ago",
-            "logo": "UB",
-            "landing_page": "https://www.uber.com/careers",
-            "categories": ["Engineering"],
-            "tags": ["React Native", "iOS", "Android", "JavaScript"]
-        },
-        {
-            "id": 8,
-            "title": "Security Engineer",
-            "company": "Cloudflare",
-            "location": "San Francisco, CA",
-            "type": "Full-time",
-            "salary": "$120,000 - $180,000",
-            "experience": "Senior Level",
-            "description": "Protect Cloudflare's infrastructure and customer data. Implement security measures and respond to threats across our global network.",
-            "posted": "2 days ago",
-            "logo": "CF",
-            "landing_page": "https://www.cloudflare.com/careers",
-            "categories": ["Security"],
-            "tags": ["Security", "Python", "Go", "Network Security"]
-        },
-        {
-            "id": 9,
-            "title": "Product Manager",
-            "company": "Meta",
-            "location": "Menlo Park, CA",
-            "type": "Full-time",
-            "salary": "$140,000 - $200,000",
-            "experience": "Senior Level",
-            "description": "Lead product strategy for Meta's family of apps. Work with engineering and design teams to build products used by billions of people.",
-            "posted": "1 day ago",
-            "logo": "ME",
-            "landing_page": "https://www.metacareers.com",
-            "categories": ["Product"],
-            "tags": ["Product Management", "Strategy", "Analytics", "Leadership"]
-        },
-        {
-            "id": 10,
-            "title": "Junior Software Engineer",
-            "company": "Slack",
-            "location": "Remote",
-            "type": "Full-time",
-            "salary": "$80,000 - $120,000",
-            "experience": "Entry Level",
-            "description": "Join Slack's engineering team as a junior developer. Learn from experienced engineers while building features for workplace collaboration.",
-            "posted": "3 days ago",
-            "logo": "SL",
-            "landing_page": "https://slack.com/careers",
-            "categories": ["Engineering"],
-            "tags": ["JavaScript", "Python", "API", "Collaboration Tools"]
-        },
-        {
-            "id": 11,
-            "title": "UX Designer",
-            "company": "Airbnb",
-            "location": "San Francisco, CA",
-            "type": "Full-time",
-            "salary": "$110,000 - $160,000",
-            "experience": "Mid Level",
-            "description": "Design intuitive experiences for Airbnb's platform. Research user needs and create designs that help people belong anywhere.",
-            "posted": "1 week ago",
-            "logo": "AB",
-            "landing_page": "https://careers.airbnb.com",
-            "categories": ["Design"],
-            "tags": ["UI/UX", "Figma", "User Research", "Design Systems"]
-        },
-        {
-            "id": 12,
-            "title": "Machine Learning Engineer",
-            "company": "OpenAI",
-            "location": "San Francisco, CA",
-            "type": "Full-time",
-            "salary": "$150,000 - $250,000",
-            "experience": "Senior Level",
-            "description": "Develop and deploy large-scale machine learning models. Work on cutting-edge AI research and applications that benefit humanity.",
-            "posted": "Today",
-            "logo": "OA",
-            "landing_page": "https://openai.com/careers",
-            "categories": ["AI/ML"],
-            "tags": ["Machine Learning", "PyTorch", "Deep Learning", "NLP"]
-        },
-        {
-            "id": 13,
-            "title": "React Developer",
-            "company": "Spotify",
-            "location": "Stockholm, Sweden",
-            "type": "Full-time",
-            "salary": "$95,000 - $140,000",
-            "experience": "Mid Level",
-            "description": "Build engaging user interfaces for Spotify's music streaming platform. Work with React, TypeScript, and modern web technologies.",
-            "posted": "2 days ago",
-            "logo": "SP",
-            "landing_page": "https://www.spotifyjobs.com",
-            "categories": ["Engineering"],
-            "tags": ["React", "TypeScript", "JavaScript", "Frontend"]
-        },
-        {
-            "id": 14,
-            "title": "Python Developer",
-            "company": "Dropbox",
-            "location": "Remote",
-            "type": "Full-time",
-            "salary": "$110,000 - $165,000",
-            "experience": "Mid Level",
-            "description": "Develop backend services and APIs using Python. Work on distributed systems that handle billions of files.",
-            "posted": "1 week ago",
-            "logo": "DB",
-            "landing_page": "https://jobs.dropbox.com",
-            "categories": ["Engineering"],
-            "tags": ["Python", "Django", "API", "Distributed Systems"]
-        },
-        {
-            "id": 15,
-            "title": "DevOps Specialist",
-            "company": "GitLab",
-            "location": "Remote",
-            "type": "Full-time",
-            "salary": "$100,000 - $150,000",
-            "experience": "Senior Level",
-            "description": "Manage CI/CD pipelines and infrastructure for GitLab's platform. Work with Kubernetes, Docker, and cloud technologies.",
-            "posted": "3 days ago",
-            "logo": "GL",
-            "landing_page": "https://about.gitlab.com/jobs",
-            "categories": ["Engineering"],
-            "tags": ["DevOps", "Kubernetes", "Docker", "CI/CD"]
-        }
-    ]
-    
-    # Filter jobs based on keyword, location, and job type
-    filtered_jobs = all_jobs
-    
-    # Filter by location if provided
-    if location:
-        location_lower = location.lower()
-        filtered_jobs = [
-            job for job in filtered_jobs 
-            if location_lower in job['location'].lower() or
-               (location_lower == "remote" and job['location'].lower() == "remote")
-        ]
-    
-    # Filter by job type
-    if job_type and job_type != "full_time":
-        job_type_map = {
-            "internship": "Internship",
-            "part_time": "Part-time", 
-            "contract": "Contract",
-            "full_time": "Full-time"
-        }
-        target_type = job_type_map.get(job_type, "Full-time")
-        filtered_jobs = [job for job in filtered_jobs if job['type'] == target_type]
-    
-    # Filter by keyword if provided
-    if keyword:
-        keyword_lower = keyword.lower()
-        filtered_jobs = [
-            job for job in filtered_jobs 
-            if keyword_lower in job['title'].lower() or 
-               keyword_lower in job['company'].lower() or
-               any(keyword_lower in tag.lower() for tag in job['tags'])
-        ]
+    # Filter jobs based on keyword, location, and job type (index lookups)
+    filtered_jobs = MOCK_JOB_CATALOG.search(keyword, location, job_type)
     
     # Pagination logic
     jobs_per_page = 10
     start_idx = page * jobs_per_page
     end_idx = start_idx + jobs_per_page
-    page_jobs = filtered_jobs[start_idx:end_idx]
+    page_jobs = [dict(job) for job in filtered_jobs[start_idx:end_idx]]
     
     return {
         "page_count": (len(filtered_jobs) + jobs_per_page - 1) // jobs_per_page,
@@ -1457,114 +1559,343 @@ def get_enhanced_mock_jobs(page: int = 0, keyword: str = "", location: str = "",
         "source": "Mock Data"
     }
 
-async def fetch_adzuna_jobs(page: int = 0, keyword: str = "", location: str = "us", job_type: str = "full_time") -> dict:
-    """Fetch real jobs from Adzuna API"""
-    
-    # Get API credentials from environment
-    app_id = os.environ.get("ADZUNA_APP_ID")
-    api_key = os.environ.get("ADZUNA_API_KEY")
-    
-    if not app_id or not api_key:
-        print("Adzuna API credentials not found, using fallback")
-        return get_enhanced_mock_jobs(page, keyword, location, job_type)
-    
+# Shared Adzuna HTTP client: one connection pool for the app's lifetime so job
+# searches reuse keep-alive TCP/TLS connections instead of handshaking per call
+ADZUNA_CONNECT_TIMEOUT = float(os.environ.get("ADZUNA_CONNECT_TIMEOUT", "3.0"))
+ADZUNA_READ_TIMEOUT = float(os.environ.get("ADZUNA_READ_TIMEOUT", "8.0"))
+ADZUNA_MAX_CONNECTIONS = int(os.environ.get("ADZUNA_MAX_CONNECTIONS", "20"))
+ADZUNA_MAX_KEEPALIVE = int(os.environ.get("ADZUNA_MAX_KEEPALIVE", "10"))
+
+_adzuna_client: Optional["httpx.AsyncClient"] = None
+
+
+@startup_profile.lazy("http_client")
+def _httpx():
+    """httpx, imported with the first upstream job search"""
+    import httpx
+
+    return httpx
+
+
+def _http2_available() -> bool:
     try:
-        # Adzuna API URL
-        base_url = f"https://api.adzuna.com/v1/api/jobs/{location}/search/{page + 1}"
-        
-        params = {
-            "app_id": app_id,
-            "app_key": api_key,
-            "results_per_page": 10,
-            "what": keyword or "software engineer",
-            "content-type": "application/json"
-        }
-        
-        # Add job type filter for Adzuna API
-        if job_type and job_type != "full_time":
-            job_type_map = {
-                "internship": "internship",
-                "part_time": "part_time", 
-                "contract": "contract",
-                "full_time": "full_time"
-            }
-            params["employment_type"] = job_type_map.get(job_type, "full_time")
-        
-        if location and location != "us":
-            params["where"] = location
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-        # Transform Adzuna response to match our frontend format
-        jobs = []
-        for idx, job in enumerate(data.get("results", [])):
-            # Generate a unique ID
-            job_id = job.get("id", f"{page}_{idx}")
-            
-            # Extract salary info
-            salary_min = job.get("salary_min")
-            salary_max = job.get("salary_max")
-            salary = ""
-            if salary_min and salary_max:
-                salary = f"${salary_min:,.0f} - ${salary_max:,.0f}"
-            elif salary_min:
-                salary = f"${salary_min:,.0f}+"
-            
-            # Format the job posting date
-            created = job.get("created")
+        import h2  # noqa: F401  (optional, enables HTTP/2 in httpx)
+        return True
+    except ImportError:
+        return False
+
+
+def _create_adzuna_client() -> "httpx.AsyncClient":
+    httpx = _httpx()
+    return httpx.AsyncClient(
+        base_url="https://api.adzuna.com/v1/api/jobs",
+        http2=_http2_available(),
+        timeout=httpx.Timeout(
+            connect=ADZUNA_CONNECT_TIMEOUT,
+            read=ADZUNA_READ_TIMEOUT,
+            write=ADZUNA_READ_TIMEOUT,
+            pool=ADZUNA_CONNECT_TIMEOUT,
+        ),
+        limits=httpx.Limits(
+            max_connections=ADZUNA_MAX_CONNECTIONS,
+            max_keepalive_connections=ADZUNA_MAX_KEEPALIVE,
+            keepalive_expiry=30.0,
+        ),
+    )
+
+
+def get_adzuna_client() -> "httpx.AsyncClient":
+    """Return the shared Adzuna client, creating it on first use"""
+    global _adzuna_client
+    if _adzuna_client is None or _adzuna_client.is_closed:
+        _adzuna_client = _create_adzuna_client()
+    return _adzuna_client
+
+
+startup_profile.add_warmup("adzuna_client", get_adzuna_client)
+
+
+@app.on_event("shutdown")
+async def _close_adzuna_client():
+    global _adzuna_client
+    if _adzuna_client is not None:
+        await _adzuna_client.aclose()
+        _adzuna_client = None
+
+
+def transform_adzuna_job(job: dict, fallback_id: str) -> dict:
+    """Transform one Adzuna result to match our frontend job format"""
+    # Generate a unique ID
+    job_id = job.get("id", fallback_id)
+
+    # Extract salary info
+    salary_min = job.get("salary_min")
+    salary_max = job.get("salary_max")
+    salary = ""
+    if salary_min and salary_max:
+        salary = f"${salary_min:,.0f} - ${salary_max:,.0f}"
+    elif salary_min:
+        salary = f"${salary_min:,.0f}+"
+
+    # Format the job posting date
+    created = job.get("created")
+    posted = "Recently"
+    if created:
+        try:
+            from datetime import datetime
+            created_date = datetime.fromisoformat(created.replace('Z', '+00:00'))
+            days_ago = (datetime.now() - created_date.replace(tzinfo=None)).days
+            if days_ago == 0:
+                posted = "Today"
+            elif days_ago == 1:
+                posted = "1 day ago"
+            elif days_ago < 7:
+                posted = f"{days_ago} days ago"
+            elif days_ago < 30:
+                weeks = days_ago // 7
+                posted = f"{weeks} week{'s' if weeks > 1 else ''} ago"
+            else:
+                posted = "1+ month ago"
+        except:
             posted = "Recently"
-            if created:
-                try:
-                    from datetime import datetime
-                    created_date = datetime.fromisoformat(created.replace('Z', '+00:00'))
-                    days_ago = (datetime.now() - created_date.replace(tzinfo=None)).days
-                    if days_ago == 0:
-                        posted = "Today"
-                    elif days_ago == 1:
-                        posted = "1 day ago"
-                    elif days_ago < 7:
-                        posted = f"{days_ago} days ago"
-                    elif days_ago < 30:
-                        weeks = days_ago // 7
-                        posted = f"{weeks} week{'s' if weeks > 1 else ''} ago"
-                    else:
-                        posted = "1+ month ago"
-                except:
-                    posted = "Recently"
-            
-            transformed_job = {
-                "id": job_id,
-                "title": job.get("title", "Job Title Not Available"),
-                "company": job.get("company", {}).get("display_name", "Company Not Listed"),
-                "location": job.get("location", {}).get("display_name", "Location Not Specified"),
-                "type": "Full-time",  # Adzuna doesn't always provide this
-                "salary": salary,
-                "experience": "Not Specified",  # Map from category if available
-                "description": job.get("description", "No description available."),
-                "posted": posted,
-                "logo": job.get("company", {}).get("display_name", "Company")[:2].upper(),
-                "landing_page": job.get("redirect_url", "#"),
-                "categories": [job.get("category", {}).get("label", "Other")] if job.get("category") else ["Other"],
-                "tags": []  # Adzuna doesn't provide tags, could extract from description
-            }
-            jobs.append(transformed_job)
-        
-        return {
-            "page_count": data.get("count", 0) // 10 + 1,
-            "page": page,
-            "jobs": jobs,
-            "total_jobs": data.get("count", 0),
-            "source": "Adzuna API"
+
+    return {
+        "id": job_id,
+        "title": job.get("title", "Job Title Not Available"),
+        "company": job.get("company", {}).get("display_name", "Company Not Listed"),
+        "location": job.get("location", {}).get("display_name", "Location Not Specified"),
+        "type": "Full-time",  # Adzuna doesn't always provide this
+        "salary": salary,
+        "experience": "Not Specified",  # Map from category if available
+        "description": job.get("description", "No description available."),
+        "posted": posted,
+        "logo": job.get("company", {}).get("display_name", "Company")[:2].upper(),
+        "landing_page": job.get("redirect_url", "#"),
+        "categories": [job.get("category", {}).get("label", "Other")] if job.get("category") else ["Other"],
+        "tags": []  # Adzuna doesn't provide tags; filled in by posting_skill_tagger
+    }
+
+
+# Adzuna health and quota guards: an open circuit or an empty bucket skips the
+# request so the aggregator serves the fallback immediately
+adzuna_breaker = CircuitBreaker(
+    failure_rate=float(os.environ.get("ADZUNA_BREAKER_FAILURE_RATE", "0.5")),
+    min_calls=int(os.environ.get("ADZUNA_BREAKER_MIN_CALLS", "5")),
+    window_seconds=float(os.environ.get("ADZUNA_BREAKER_WINDOW", "60")),
+    open_seconds=float(os.environ.get("ADZUNA_BREAKER_OPEN_SECONDS", "30")),
+    half_open_calls=int(os.environ.get("ADZUNA_BREAKER_HALF_OPEN_CALLS", "1")),
+)
+ADZUNA_RATE_PER_MINUTE = float(os.environ.get("ADZUNA_RATE_PER_MINUTE", "25"))
+adzuna_rate_limiter = TokenBucket(
+    rate=ADZUNA_RATE_PER_MINUTE / 60.0,
+    capacity=float(os.environ.get("ADZUNA_RATE_BURST", str(ADZUNA_RATE_PER_MINUTE))),
+)
+
+
+def _adzuna_credentials() -> Tuple[Optional[str], Optional[str]]:
+    return os.environ.get("ADZUNA_APP_ID"), os.environ.get("ADZUNA_API_KEY")
+
+
+async def request_adzuna_jobs(page: int = 0, keyword: str = "", location: str = "us", job_type: str = "full_time") -> dict:
+    """Fetch one page of real jobs from the Adzuna API; raises on failure"""
+    app_id, api_key = _adzuna_credentials()
+    if not app_id or not api_key:
+        raise RuntimeError("Adzuna API credentials not found")
+
+    # Adzuna API path (relative to the shared client's base URL)
+    search_path = f"/{location}/search/{page + 1}"
+
+    params = {
+        "app_id": app_id,
+        "app_key": api_key,
+        "results_per_page": 10,
+        "what": keyword or "software engineer",
+        "content-type": "application/json"
+    }
+
+    # Add job type filter for Adzuna API
+    if job_type and job_type != "full_time":
+        job_type_map = {
+            "internship": "internship",
+            "part_time": "part_time", 
+            "contract": "contract",
+            "full_time": "full_time"
         }
-        
-    except Exception as e:
-        print(f"Error fetching from Adzuna API: {e}")
-        # Fallback to mock data
+        params["employment_type"] = job_type_map.get(job_type, "full_time")
+
+    if location and location != "us":
+        params["where"] = location
+
+    # Fail fast while Adzuna is unhealthy or our quota is used up
+    adzuna_breaker.check()
+    try:
+        adzuna_rate_limiter.acquire()
+        with time_stage("adzuna_fetch"):
+            response = await get_adzuna_client().get(search_path, params=params)
+    except _httpx().TransportError:
+        UPSTREAM_CALLS.labels("adzuna", "transport_error").inc()
+        adzuna_breaker.record_failure()
+        raise
+    except BaseException:
+        adzuna_breaker.release()
+        raise
+    UPSTREAM_CALLS.labels("adzuna", f"{response.status_code // 100}xx").inc()
+    if response.status_code >= 500 or response.status_code == 429:
+        adzuna_breaker.record_failure()
+    else:
+        adzuna_breaker.record_success()
+    response.raise_for_status()
+    data = response.json()
+
+    # Transform Adzuna response to match our frontend format, tagging skills once per posting
+    jobs = posting_skill_tagger().tag(
+        transform_adzuna_job(job, f"{page}_{idx}")
+        for idx, job in enumerate(data.get("results", []))
+    )
+
+    return {
+        "page_count": data.get("count", 0) // 10 + 1,
+        "page": page,
+        "jobs": jobs,
+        "total_jobs": data.get("count", 0),
+        "source": "Adzuna API"
+    }
+
+
+# Local BM25 job index, used instead of live Adzuna calls when
+# JOB_SEARCH_BACKEND=local (offline search, relevance ranking). Populate it
+# with `python job_index.py ingest-adzuna ...`, also while the server runs:
+# every worker picks up the new manifest within a couple of seconds. An empty
+# index is seeded with the mock catalog.
+JOB_SEARCH_BACKEND = os.environ.get("JOB_SEARCH_BACKEND", "adzuna").strip().lower()
+JOB_INDEX_DIR = os.environ.get("JOB_INDEX_DIR", os.path.join(_STORAGE_DIR, "job_index"))
+
+_job_index: Optional["JobIndex"] = None
+
+
+@startup_profile.lazy("job_index", warmup=False)
+def get_job_index() -> "JobIndex":
+    """Open the local job index on first use"""
+    global _job_index
+    from job_index import JobIndex
+
+    index = JobIndex(JOB_INDEX_DIR)
+    if not len(index):
+        index.add(MOCK_JOB_CATALOG.jobs)
+        index.flush()
+    _job_index = index
+    return index
+
+
+if JOB_SEARCH_BACKEND == "local":
+    startup_profile.add_warmup("job_index", get_job_index)
+
+
+@app.on_event("shutdown")
+async def _close_job_index():
+    if _job_index is not None:
+        _job_index.close()
+
+
+# Popular searches repeat across users; serve them from memory and refresh in the background
+JOBS_CACHE_PREFETCH = os.environ.get("JOBS_CACHE_PREFETCH", "1") not in {"0", "false", "no"}
+jobs_cache = SWRCache(
+    fresh_ttl=float(os.environ.get("JOBS_CACHE_FRESH_TTL", "300")),
+    stale_ttl=float(os.environ.get("JOBS_CACHE_STALE_TTL", "3600")),
+    max_entries=int(os.environ.get("JOBS_CACHE_MAX_ENTRIES", "512")),
+)
+
+
+def _is_live_result(result: dict) -> bool:
+    # Mock fallbacks are cheap to rebuild and must not mask Adzuna recovering
+    return result.get("source") != "Mock Data"
+
+
+async def cached_job_search(page: int, keyword: str, location: str, job_type: str) -> dict:
+    """request_adzuna_jobs behind the stale-while-revalidate cache"""
+    key = normalize_job_query(keyword, location, job_type, page)
+    result = await jobs_cache.get_or_fetch(
+        key,
+        lambda: request_adzuna_jobs(page, keyword, location, job_type),
+        cacheable=_is_live_result,
+    )
+    # Prefetching spends Adzuna quota, so only do it while there is plenty to spare
+    spare_quota = adzuna_breaker.state == "closed" and adzuna_rate_limiter.tokens > adzuna_rate_limiter.capacity / 2
+    if JOBS_CACHE_PREFETCH and spare_quota and _is_live_result(result) and page + 1 < result.get("page_count", 0):
+        jobs_cache.prefetch(
+            normalize_job_query(keyword, location, job_type, page + 1),
+            lambda: request_adzuna_jobs(page + 1, keyword, location, job_type),
+            cacheable=_is_live_result,
+        )
+    return result
+
+
+class AdzunaJobSource(JobSource):
+    name = "adzuna"
+    label = "Adzuna API"
+    deadline = 4.0
+    priority = 10
+
+    def enabled(self) -> bool:
+        return all(_adzuna_credentials())
+
+    def describe(self) -> dict:
+        return {"breaker": adzuna_breaker.snapshot(), "rate_limiter": adzuna_rate_limiter.snapshot()}
+
+    async def search(self, page: int, keyword: str, location: str, job_type: str) -> dict:
+        task = asyncio.ensure_future(cached_job_search(page, keyword, location, job_type))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        # Shielded: a request cut off by the deadline still completes and warms the cache
+        return await asyncio.shield(task)
+
+
+class LocalIndexJobSource(JobSource):
+    name = "local"
+    label = "Local Index"
+    deadline = 2.0
+    priority = 20
+
+    async def search(self, page: int, keyword: str, location: str, job_type: str) -> dict:
+        # Opening the index and scoring are blocking; off the loop, the deadline can cut them off
+        return await run_in_threadpool(lambda: get_job_index().search(keyword, location, job_type, page))
+
+
+class MockJobSource(JobSource):
+    name = "mock"
+    label = "Mock Data"
+    deadline = 1.0
+    priority = 90
+    fallback = True
+
+    async def search(self, page: int, keyword: str, location: str, job_type: str) -> dict:
         return get_enhanced_mock_jobs(page, keyword, location, job_type)
 
+
+JOB_SOURCE_TYPES = {cls.name: cls for cls in (AdzunaJobSource, LocalIndexJobSource, MockJobSource)}
+
+
+def _build_job_sources() -> List[JobSource]:
+    """Sources named in JOB_SOURCES, with optional JOB_SOURCE_DEADLINE_<NAME> overrides"""
+    default = "local" if JOB_SEARCH_BACKEND == "local" else "adzuna,mock"
+    sources = []
+    for name in os.environ.get("JOB_SOURCES", default).split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in JOB_SOURCE_TYPES:
+            log.warning(f"Unknown job source '{name}' in JOB_SOURCES, ignoring")
+            continue
+        source = JOB_SOURCE_TYPES[name]()
+        deadline = os.environ.get(f"JOB_SOURCE_DEADLINE_{name.upper()}")
+        if deadline:
+            source.deadline = float(deadline)
+        sources.append(source)
+    return sources or [MockJobSource()]
+
+
+job_aggregator = JobAggregator(_build_job_sources())
+
+
 @app.get("/api/jobs")
 async def search_jobs(
     page: int = 0,
@@ -1573,33 +1904,138 @@ async def search_jobs(
     job_type: str = "full_time"
 ):
     """Search jobs using Adzuna API with fallback to mock data"""
-    print(f"Job search request: keyword='{keyword}', location='{location}', job_type='{job_type}', page={page}")
-    
     try:
-        # Use Adzuna API for live data
-        return await fetch_adzuna_jobs(page, keyword, location, job_type)
+        # All enabled sources at once, each bounded by its own deadline
+        return await job_aggregator.search(page, keyword, location, job_type)
     except Exception as e:
-        print(f"Error in job search: {e}")
-        import traceback
-        traceback.print_exc()
+        ERRORS.labels("job_search").inc()
+        log.exception(f"Error in job search: {e}")
         # Fallback to mock data
         return get_enhanced_mock_jobs(page, keyword, location, job_type)
 
+
+@app.get("/api/jobs/cache-stats")
+async def job_cache_stats():
+    """Hit-rate and size metrics for the job search cache"""
+    return jobs_cache.snapshot()
+
+
+# Resume-to-posting recommendations. Candidates are the mock catalog plus
+# every posting currently held in the search cache, or the whole local index
+# when JOB_SEARCH_BACKEND=local; the posting matrix is rebuilt only when
+# that pool changes.
+_job_matcher: Optional[Tuple[Tuple, "PostingMatrix"]] = None
+
+
+@startup_profile.lazy("job_matching")
+def _job_matching():
+    """The posting matcher module (numpy), imported with the first recommendation"""
+    import job_matching
+
+    return job_matching
+
+
+def _recommendation_pool_version() -> Tuple:
+    if JOB_SEARCH_BACKEND == "local":
+        return ("local", get_job_index().generation)
+    # Expired searches leave the pool too
+    jobs_cache.prune()
+    return ("cache", jobs_cache.generation)
+
+
+def _recommendation_pool() -> Callable[[], List[dict]]:
+    """Loader for the candidate postings; the cache is read here, on the event loop that owns it"""
+    if JOB_SEARCH_BACKEND == "local":
+        index = get_job_index()
+        return lambda: list(index.iter_docs())
+    pool = {str(job["id"]): job for job in MOCK_JOB_CATALOG.jobs}
+    for result in jobs_cache.values():
+        for job in result.get("jobs", []):
+            pool[str(job["id"])] = job
+    postings = list(pool.values())
+    return lambda: postings
+
+
+async def get_job_matcher() -> "PostingMatrix":
+    """Posting matrix for the current candidate pool, rebuilt when the pool changes"""
+    global _job_matcher
+    version = _recommendation_pool_version()
+    if _job_matcher is None or _job_matcher[0] != version:
+        load_pool = _recommendation_pool()
+        # Building the matrix is CPU-bound; keep it off the event loop
+        matrix = await run_in_threadpool(lambda: _job_matching().PostingMatrix(load_pool()))
+        _job_matcher = (version, matrix)
+    return _job_matcher[1]
+
+
+@lru_cache(maxsize=128)
+def _stored_resume_text(file_path: str, file_name: str) -> str:
+    """Text of an uploaded resume kept on disk (memoized; uploads never change)"""
+    with open(file_path, "rb") as f:
+        return extract_text_from_upload(UploadFile(file=f, filename=file_name))
+
+
+@app.get("/api/jobs/recommended/{analysis_id}")
+async def recommended_jobs(analysis_id: str, limit: int = 10):
+    """Postings ranked by similarity to a stored resume analysis"""
+    record = next((a for a in resume_analyses_storage if a["id"] == analysis_id), None)
+    if not record:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    limit = max(1, min(limit, 50))
+
+    try:
+        # Skills the role asks for that the analysis did not report missing
+        roles = roles_registry.current()
+        role_skills = roles.skills(record.get("job_category"), record.get("job_role")) or []
+        missing = roles.taxonomy.bits((record.get("analysis_result") or {}).get("missing_skills", []))
+        skills = [s for s in role_skills if not roles.taxonomy.has(missing, s)]
+
+        text = ""
+        file_path = record.get("file_path")
+        if file_path and os.path.exists(file_path):
+            text = await run_in_threadpool(
+                _stored_resume_text, file_path, record.get("file_name") or os.path.basename(file_path)
+            )
+
+        matcher = await get_job_matcher()
+        ranked = matcher.top_k([_job_matching().resume_profile_text(skills, record.get("job_role") or "", text)], limit)[0]
+    except Exception as e:
+        ERRORS.labels("recommend_jobs").inc()
+        log.error(f"Failed to recommend jobs: {e}")
+        raise HTTPException(status_code=500, detail="Failed to recommend jobs")
+
+    jobs = []
+    for index, score in ranked:
+        job = dict(matcher.jobs[index])
+        job["match_score"] = round(score * 100)
+        job["matched_skills"] = _job_matching().matched_skills(job, skills)
+        jobs.append(job)
+    return {
+        "analysis_id": analysis_id,
+        "jobs": jobs,
+        "total_candidates": len(matcher),
+        "source": "Local Index" if JOB_SEARCH_BACKEND == "local" else "Catalog + Cached Searches",
+    }
+
+
+@app.get("/api/jobs/source-stats")
+async def job_source_stats():
+    """Per-source call, timeout and error counters of the job aggregator"""
+    return job_aggregator.snapshot()
+
+
 @app.get("/api/jobs/{job_id}")
 async def get_job_details(job_id: str):
     """Get detailed information about a specific job"""
     try:
-        job_id_int = int(job_id)
-        
-        # Get all jobs from the mock data function
-        all_jobs_data = get_enhanced_mock_jobs(0, "", "")  # Get all jobs without filtering
-        all_jobs = all_jobs_data.get("jobs", [])
-        
-        # Find job by ID
-        job = next((j for j in all_jobs if j["id"] == job_id_int), None)
+        # Find job by ID in the local index or the indexed mock catalog
+        job = get_job_index().get(job_id) if JOB_SEARCH_BACKEND == "local" else None
+        if job is None:
+            job = MOCK_JOB_CATALOG.get(int(job_id))
         
         if job:
-            # Add additional details for the detailed view
+            # Add additional details for the detailed view (on a copy of the shared record)
+            job = dict(job)
             job["how_to_apply"] = "Please visit the company's careers page to apply for this position."
             job["company_url"] = job.get("landing_page", "#")
             return job
@@ -1611,6 +2047,171 @@ async def get_job_details(job_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error fetching job details: {e}")
+        ERRORS.labels("job_details").inc()
+        log.error(f"Error fetching job details: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch job details")
 
+
+
+# ==== Metrics ====
+
+_BREAKER_STATES = ("closed", "half_open", "open")
+
+
+@app_metrics.collector
+def _collect_component_metrics():
+    """Gauges and counters that caches, pools and upstream guards already keep"""
+    jobs = jobs_cache.snapshot()
+    lru_caches = {"fuzzy_term_match": _fuzzy_term_match.cache_info(), "stored_resume_text": _stored_resume_text.cache_info()}
+    yield "cvision_cache_requests_total", "counter", "Cache lookups by result", [
+        *(({"cache": "jobs", "result": result}, jobs[key]) for result, key in (("hit", "hits"), ("stale_hit", "stale_hits"), ("miss", "misses"))),
+        *(({"cache": name, "result": result}, value) for name, info in lru_caches.items() for result, value in (("hit", info.hits), ("miss", info.misses))),
+    ]
+    yield "cvision_cache_hit_ratio", "gauge", "Share of cache lookups served from the cache", [
+        ({"cache": "jobs"}, jobs["hit_rate"]),
+        *(({"cache": name}, info.hits / (info.hits + info.misses) if info.hits + info.misses else 0.0) for name, info in lru_caches.items()),
+    ]
+    yield "cvision_cache_entries", "gauge", "Entries held by a cache", [
+        ({"cache": "jobs"}, jobs["entries"]),
+        *(({"cache": name}, info.currsize) for name, info in lru_caches.items()),
+    ]
+    yield "cvision_jobs_cache_inflight", "gauge", "Job searches being fetched for the cache", [({}, jobs["inflight"])]
+
+    # Pool usage: queued resume builds are the submitted ones no worker has picked up yet
+    pdf_pool = pdf_page_parallelism.snapshot()
+    yield "cvision_pool_workers", "gauge", "Configured workers of a pool", [
+        ({"pool": "resume_build"}, RESUME_BUILD_WORKERS),
+        ({"pool": "pdf_pages"}, pdf_pool["workers"]),
+    ]
+    yield "cvision_pool_queue_depth", "gauge", "Tasks waiting for a pool worker", [
+        ({"pool": "resume_build"}, max(0, POOL_PENDING.labels("resume_build").value - POOL_BUSY.labels("resume_build").value)),
+    ]
+    yield "cvision_pdf_documents_total", "counter", "PDF documents extracted, by mode", [
+        ({"mode": mode}, pdf_pool[mode]) for mode in ("sequential", "parallel", "fallbacks")
+    ]
+    yield "cvision_pdf_extractor_results_total", "counter", "PDF extractor outcomes, by backend", [
+        ({"extractor": name, "outcome": outcome}, count)
+        for name, stats in extraction_stats.items()
+        for outcome, count in stats.items()
+    ]
+
+    breaker = adzuna_breaker.snapshot()
+    yield "cvision_circuit_breaker_state", "gauge", "Current state of an upstream circuit breaker (1 = in that state)", [
+        ({"upstream": "adzuna", "state": state}, 1 if breaker["state"] == state else 0) for state in _BREAKER_STATES
+    ]
+    yield "cvision_rate_limiter_tokens", "gauge", "Tokens left in an upstream rate limiter", [
+        ({"upstream": "adzuna"}, adzuna_rate_limiter.tokens)
+    ]
+    yield "cvision_job_source_calls_total", "counter", "Job source calls by outcome", [
+        ({"source": name, "outcome": outcome}, stats[outcome])
+        for name, stats in job_aggregator.stats.items()
+        for outcome in ("ok", "timeouts", "errors")
+    ]
+
+    roles = roles_registry.current()
+    yield "cvision_roles_info", "gauge", "Version of the active roles dataset", [({"version": roles.version}, 1)]
+    yield "cvision_roles_reloads_total", "counter", "Roles dataset reloads since boot", [({}, roles_registry.reloads)]
+    yield "cvision_stored_analyses", "gauge", "Resume analyses held in storage", [({}, len(resume_analyses_storage))]
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of request, stage and component metrics"""
+    return Response(content=app_metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+# ==== Request profiling ====
+# With REQUEST_PROFILING=1, a request sent with "X-Profile: 1" (or ?profile=1)
+# and a valid X-Admin-Token runs under cProfile; the capture is stored with
+# the request's stage timings and document hash (see request_profiling.py).
+# Off by default, and then the middleware is not installed at all.
+REQUEST_PROFILING = os.environ.get("REQUEST_PROFILING", "0") in {"1", "true", "yes"}
+request_profiler = RequestProfiler(
+    os.environ.get("REQUEST_PROFILES_DIR", os.path.join(_STORAGE_DIR, "profiles")),
+    max_profiles=int(os.environ.get("REQUEST_PROFILES_MAX", "50")),
+)
+if REQUEST_PROFILING:
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler, authorize=_is_admin)
+
+
+@app.get("/admin/profiles")
+async def list_request_profiles(x_admin_token: Optional[str] = Header(None)):
+    """Stored request profiles, newest first"""
+    _require_admin(x_admin_token)
+    return {"enabled": REQUEST_PROFILING, "profiles": await run_in_threadpool(request_profiler.list)}
+
+
+@app.get("/admin/profiles/{profile_id}")
+async def get_request_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """One profile's metadata, stage timings and top functions"""
+    _require_admin(x_admin_token)
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@app.get("/admin/profiles/{profile_id}/download")
+async def download_request_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """The raw pstats dump (python -m pstats, snakeviz)"""
+    _require_admin(x_admin_token)
+    path = request_profiler.stats_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+
+# ==== Request timing ====
+# Server-Timing groups of the time_stage stages; stages not listed keep their own name
+SERVER_TIMING_GROUPS = {
+    "extract_pdf": "extract",
+    "extract_docx": "extract",
+    "extract_text": "extract",
+    "score": "score",
+    "ai_completion": "ai",
+    "persist_upload": "persist",
+    "persist_analyses": "persist",
+    "adzuna_fetch": "upstream",
+    "build_docx": "build",
+}
+
+# Added last so it is the outermost middleware and its trace covers the others
+app.add_middleware(
+    RequestTimingMiddleware,
+    logger=request_log,
+    group=lambda stage: SERVER_TIMING_GROUPS.get(stage, stage),
+    skip_log_paths=("/metrics", "/health"),
+)
+
+
+# ==== Startup ====
+# Nothing heavy is loaded at import; STARTUP_WARMUP names subsystems to load
+# before the first request instead ("all" for every one), e.g. on long-lived
+# servers where boot time matters less than first-request latency.
+STARTUP_WARMUP = [n.strip() for n in os.environ.get("STARTUP_WARMUP", "").split(",") if n.strip()]
+_STARTUP_REPORTS_JSONL = os.path.join(_STORAGE_DIR, "startup_reports.jsonl")
+
+
+@app.on_event("startup")
+async def _warm_up():
+    # Server setup between import and this hook is not ours to measure
+    startup_profile.skip_to_now()
+    warmed = startup_profile.warmup(STARTUP_WARMUP) if STARTUP_WARMUP else {}
+    startup_profile.end_phase("warmup")
+    report = {**startup_profile.report(), "warmup": warmed}
+    log.info("startup", extra={"fields": {"phases": report["phases"], "modules_loaded": report["modules_loaded"]}})
+    try:
+        with open(_STARTUP_REPORTS_JSONL, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report) + "\n")
+    except Exception as e:
+        log.error(f"Failed to record startup report: {e}")
+
+
+@app.get("/api/startup-report")
+async def startup_report():
+    """Phase timings and import profile of this boot, plus subsystems loaded since"""
+    return {**startup_profile.report(), "available_warmups": sorted(startup_profile.warmups)}
+
+
+startup_profile.end_phase("app")
+startup_profile.finish()
@@ -0,0 +1,366 @@
+"""In-process metrics with a Prometheus text exposition.
+
+Three instrument types, each optionally split by label values:
+
+- ``Counter``: monotonically increasing totals (requests, errors);
+- ``Gauge``: current values (in-flight requests, pool usage);
+- ``Histogram``: latency distributions over fixed buckets.
+
+Recording is a lock, a bisect and two additions, cheap enough for every
+stage of every request. ``Histogram.labels(...).time()`` is the timing
+context used across the app::
+
+    with STAGE_SECONDS.labels("extract").time("extract"):
+        text = extract(...)
+
+Given a stage name, the timer also adds its duration to the current
+``RequestTrace`` (if the request is being traced, see ``trace_request``), so
+per-request breakdowns come from the same measurements as the histograms.
+
+State that other components already keep (cache and breaker stats, pool
+queues) is not duplicated: ``MetricsRegistry.collector`` registers a
+function that reports it at scrape time. ``render()`` produces the
+Prometheus text format (version 0.0.4) served at ``GET /metrics``.
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import logging
+import math
+import threading
+import time
+
+log = logging.getLogger("cvision")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cached lookup (~1 ms) to a slow AI completion (~30 s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (name, type, help, [(labels, value), ...]) as reported by a collector
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+class RequestTrace:
+    """Stage timings and notes (document hash, sizes) gathered while handling one request"""
+
+    __slots__ = ("stages", "attributes")
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.attributes: Dict[str, Any] = {}
+
+    def add_stage(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """The trace of the request being handled, or None if it is not traced"""
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_request() -> Iterator[RequestTrace]:
+    """Trace the enclosed request handling (joins the trace already active, if any)"""
+    trace = _current_trace.get()
+    if trace is not None:
+        yield trace
+        return
+    trace = RequestTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value != value:
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """The child for one combination of label values (created on first use)"""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for key, child in list(self._children.items()):
+            for suffix, extra, value in child.samples():
+                yield self.name + suffix, {**dict(zip(self.labelnames, key)), **extra}, value
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        yield "", {}, self.value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def track(self) -> "_Tracked":
+        """Context manager: +1 while the block runs (in-flight work, busy workers)"""
+        return _Tracked(self)
+
+    def samples(self):
+        yield "", {}, self.value
+
+
+class _Tracked:
+    __slots__ = ("_gauge",)
+
+    def __init__(self, gauge: _GaugeChild):
+        self._gauge = gauge
+
+    def __enter__(self):
+        self._gauge.inc()
+        return self
+
+    def __exit__(self, *exc):
+        self._gauge.dec()
+        return False
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def track(self) -> _Tracked:
+        return self.labels().track()
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self, stage: Optional[str] = None) -> "Timer":
+        """Context manager observing the block's wall time (also when it raises)"""
+        return Timer(self, stage)
+
+    def samples(self):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            yield "_bucket", {"le": _format_value(bound)}, cumulative
+        yield "_sum", {}, total
+        yield "_count", {}, cumulative
+
+
+class Timer:
+    """``with histogram.labels(...).time():`` records the elapsed seconds on exit"""
+
+    __slots__ = ("_histogram", "_stage", "_start", "elapsed")
+
+    def __init__(self, histogram: _HistogramChild, stage: Optional[str] = None):
+        self._histogram = histogram
+        self._stage = stage
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self._start
+        self._histogram.observe(self.elapsed)
+        if self._stage is not None:
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.add_stage(self._stage, self.elapsed)
+        return False
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self, stage: Optional[str] = None) -> Timer:
+        return self.labels().time(stage)
+
+
+class MetricsRegistry:
+    """Named instruments plus scrape-time collectors, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def collector(self, collect: Callable[[], Iterable[Family]]) -> Callable[[], Iterable[Family]]:
+        """Decorator: ``collect()`` yields (name, type, help, samples) families at scrape time"""
+        self._collectors.append(collect)
+        return collect
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help: str, samples: Iterable[Tuple[str, Dict[str, str], float]]):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+
+        for metric in list(self._metrics.values()):
+            family(metric.name, metric.kind, metric.help, metric._samples())
+        for collect in self._collectors:
+            try:
+                for name, kind, help, samples in collect():
+                    family(name, kind, help, ((name, labels, value) for labels, value in samples))
+            except Exception as e:
+                # One broken collector must not take the whole scrape down
+                log.exception(f"Metrics collector {getattr(collect, '__name__', collect)} failed: {e}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware: request latency by route template and status, plus in-flight requests"""
+
+    def __init__(self, app, duration: Histogram, in_flight: Gauge, skip_paths: Sequence[str] = ()):
+        self.app = app
+        self.duration = duration
+        self.in_flight = in_flight
+        self.skip_paths = frozenset(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        with self.in_flight.track():
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # The route template ("/api/jobs/{job_id}") keeps label cardinality bounded
+                route = scope.get("route")
+                path = getattr(route, "path", None) or "unmatched"
+                self.duration.labels(scope.get("method", ""), path, str(status[0])).observe(time.perf_counter() - start)
@@ -0,0 +1,332 @@
+"""PDF text extraction backends and the policy that picks one.
+
+Every backend declares a speed and a quality rank. ``extract_pdf_text``
+tries the configured chain fastest first and returns the first output
+that does not look degenerate (near-empty or garbled, see
+``degenerate_reason``); the last backend in the chain is the precise
+fallback and its output is always accepted.
+
+Built-in backends:
+
+- ``pdfminer``: pdfminer.six with default ``LAParams``, i.e. exactly what
+  ``pdfminer.high_level.extract_text`` returns (the previous behaviour);
+- ``pdfminer-fast``: the same, but with the hierarchical text-box ordering
+  (``boxes_flow``) and vertical-text detection turned off; lines and words
+  are still grouped, only the costly box ordering is skipped;
+- ``pdfminer-raw``: no layout analysis at all, text in content-stream order;
+- ``pypdf``: pypdf's extractor, registered only when pypdf is installed.
+
+Other backends can be added with ``register_pdf_extractor``.
+
+Large documents can be split into page ranges and extracted in parallel
+across a process pool (``PageParallelism``); the ranges are reassembled in
+page order, so the text is identical to a sequential run. The ranges come
+from the page tree itself, never from the document's declared ``/Count``.
+
+Documents are passed as bytes or as a seekable binary file (e.g. the
+upload's spooled temp file), which the backends read in place.
+"""
+
+from typing import TYPE_CHECKING, BinaryIO, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import io
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+PdfData = Union[bytes, BinaryIO]
+
+log = logging.getLogger("cvision")
+
+
+def _open(data: PdfData) -> BinaryIO:
+    """Seekable stream over the document, without copying a file that is already open"""
+    if isinstance(data, (bytes, bytearray)):
+        return io.BytesIO(data)
+    data.seek(0)
+    return data
+
+
+class PdfExtractor:
+    """A named text extraction backend.
+
+    ``extract_pages(data, page_numbers)`` returns the text of each selected
+    page (all pages for ``None``); the document text is the page texts
+    joined with ``page_joiner``, so page ranges can be extracted separately
+    and reassembled into exactly the same output.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        extract_pages: Callable[[PdfData, Optional[Sequence[int]]], List[str]],
+        speed: int,
+        quality: int,
+        page_joiner: str = "",
+    ):
+        self.name = name
+        self.extract_pages = extract_pages
+        # Higher is faster / more faithful; used to order the fallback chain
+        self.speed = speed
+        self.quality = quality
+        self.page_joiner = page_joiner
+
+    def extract(self, data: PdfData) -> Tuple[str, int]:
+        """Whole-document text and page count"""
+        pages = self.extract_pages(data, None)
+        return self.page_joiner.join(pages), len(pages)
+
+
+PDF_EXTRACTORS: Dict[str, PdfExtractor] = {}
+extraction_stats: Dict[str, Dict[str, int]] = {}
+
+
+def register_pdf_extractor(extractor: PdfExtractor):
+    PDF_EXTRACTORS[extractor.name] = extractor
+    extraction_stats.setdefault(extractor.name, {"accepted": 0, "rejected": 0, "errors": 0})
+
+
+def _pdfminer_backend(laparams_factory: Optional[Callable[[], object]]) -> Callable[[PdfData, Optional[Sequence[int]]], List[str]]:
+    def extract_pages(data: PdfData, page_numbers: Optional[Sequence[int]] = None) -> List[str]:
+        from pdfminer.converter import TextConverter
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        resources = PDFResourceManager(caching=True)
+        out = io.StringIO()
+        device = TextConverter(resources, out, laparams=laparams_factory() if laparams_factory else None)
+        interpreter = PDFPageInterpreter(resources, device)
+        pages: List[str] = []
+        written = 0
+        try:
+            pagenos = set(page_numbers) if page_numbers is not None else None
+            for page in PDFPage.get_pages(_open(data), pagenos=pagenos, caching=True):
+                interpreter.process_page(page)
+                text = out.getvalue()
+                pages.append(text[written:])
+                written = len(text)
+        finally:
+            device.close()
+        return pages
+    return extract_pages
+
+
+def _default_laparams():
+    from pdfminer.layout import LAParams
+    return LAParams()
+
+
+def _fast_laparams():
+    from pdfminer.layout import LAParams
+    return LAParams(boxes_flow=None, detect_vertical=False, all_texts=False)
+
+
+def _pypdf_extract_pages(data: PdfData, page_numbers: Optional[Sequence[int]] = None) -> List[str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(_open(data))
+    numbers = range(len(reader.pages)) if page_numbers is None else page_numbers
+    return [reader.pages[n].extract_text() or "" for n in numbers]
+
+
+register_pdf_extractor(PdfExtractor("pdfminer", _pdfminer_backend(_default_laparams), speed=1, quality=3))
+register_pdf_extractor(PdfExtractor("pdfminer-fast", _pdfminer_backend(_fast_laparams), speed=2, quality=2))
+register_pdf_extractor(PdfExtractor("pdfminer-raw", _pdfminer_backend(None), speed=3, quality=1))
+try:
+    import pypdf  # noqa: F401  (optional faster pure-Python backend)
+    register_pdf_extractor(PdfExtractor("pypdf", _pypdf_extract_pages, speed=3, quality=2, page_joiner="\n"))
+except ImportError:
+    pass
+
+# Only these exist in freshly spawned workers; later registrations run in-process
+_BUILTIN_EXTRACTORS = frozenset(PDF_EXTRACTORS)
+
+# pdfminer-fast measured no faster than pdfminer and the fast-then-fallback chain slower than
+# either, so the precise backend alone is the default until a backend is measurably faster
+DEFAULT_PDF_CHAIN = ("pdfminer",)
+
+_WORD_RE = re.compile(r"\S+")
+_CID_RE = re.compile(r"\(cid:\d+\)")
+
+
+def degenerate_reason(text: str, pages: int) -> Optional[str]:
+    """Why an extraction looks unusable, or None if it looks like real text"""
+    stripped = text.strip()
+    if len(stripped) < 40 * max(1, pages):
+        return "near-empty"
+    words = _WORD_RE.findall(stripped)
+    if not words:
+        return "near-empty"
+    # Missing ToUnicode maps show up as (cid:NN) or replacement characters
+    if len(_CID_RE.findall(stripped)) * 5 > len(words) or stripped.count("�") * 20 > len(stripped):
+        return "garbled"
+    letters = sum(ch.isalpha() for ch in stripped)
+    if letters < 0.5 * len(stripped.replace(" ", "").replace("\n", "")):
+        return "garbled"
+    # Spacing lost: words glued together into long runs
+    if sum(len(w) for w in words) / len(words) > 14:
+        return "glued"
+    return None
+
+
+def resolve_chain(names: Optional[Sequence[str]] = None) -> List[PdfExtractor]:
+    """Registered backends from ``names``, fastest first, most faithful last"""
+    chain = [PDF_EXTRACTORS[n] for n in (names or DEFAULT_PDF_CHAIN) if n in PDF_EXTRACTORS]
+    if not chain:
+        chain = [PDF_EXTRACTORS["pdfminer"]]
+    return sorted(chain, key=lambda e: (-e.speed, e.quality))
+
+
+def count_pdf_pages(data: PdfData, limit: Optional[int] = None) -> int:
+    """Pages in the page tree, without interpreting any page; stops once past ``limit``
+
+    The tree is walked rather than trusting the catalog's ``/Count``, which a
+    document can set to anything.
+    """
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    count = 0
+    for _ in PDFPage.create_pages(PDFDocument(PDFParser(_open(data)))):
+        count += 1
+        if limit is not None and count > limit:
+            break
+    return count
+
+
+def _extract_page_range(name: str, path: str, start: int, stop: int) -> List[str]:
+    """Worker entry point: page texts of ``[start, stop)`` with a built-in backend"""
+    with open(path, "rb") as f:
+        return PDF_EXTRACTORS[name].extract_pages(f, range(start, stop))
+
+
+class PageParallelism:
+    """Extracts documents of ``min_pages`` to ``max_pages`` pages in page ranges on a process pool.
+
+    Each task handles at most ``pages_per_task`` pages and workers are
+    replaced after ``max_tasks_per_child`` tasks, so a worker's memory is
+    bounded by one page range rather than by the largest document seen.
+    The document is written once to a temporary file that every task opens,
+    instead of being pickled into each task. ``extract`` blocks until all
+    ranges are done, so callers run it off the event loop.
+    """
+
+    def __init__(
+        self,
+        min_pages: int = 64,
+        workers: int = 1,
+        pages_per_task: int = 16,
+        max_tasks_per_child: int = 16,
+        max_pages: int = 1000,
+    ):
+        self.min_pages = min_pages
+        self.workers = workers
+        self.pages_per_task = max(1, pages_per_task)
+        self.max_tasks_per_child = max_tasks_per_child
+        self.max_pages = max_pages
+        self._executor: Optional["ProcessPoolExecutor"] = None
+        self._lock = threading.Lock()
+        self.stats = {"parallel": 0, "sequential": 0, "fallbacks": 0}
+
+    def enabled(self) -> bool:
+        return self.workers > 1 and self.min_pages > 0
+
+    def _pool(self) -> "ProcessPoolExecutor":
+        with self._lock:
+            if self._executor is None:
+                # multiprocessing is only imported once a document is large enough
+                from concurrent.futures import ProcessPoolExecutor
+                import multiprocessing
+
+                # spawn: workers only import this module, never the app that forked them
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+            return self._executor
+
+    def extract(self, extractor: PdfExtractor, data: PdfData) -> Tuple[str, int]:
+        """Same result as ``extractor.extract(data)``, in parallel for large documents"""
+        pages = count_pdf_pages(data, self.max_pages) if self.enabled() and extractor.name in _BUILTIN_EXTRACTORS else 0
+        # Past max_pages the document is not worth a pool (and may be hostile)
+        if pages < max(self.min_pages, 2) or pages > self.max_pages:
+            self.stats["sequential"] += 1
+            return extractor.extract(data)
+        path = None
+        try:
+            with tempfile.NamedTemporaryFile("wb", suffix=".pdf", delete=False) as out:
+                path = out.name
+                if isinstance(data, (bytes, bytearray)):
+                    out.write(data)
+                else:
+                    shutil.copyfileobj(_open(data), out)
+            pool = self._pool()
+            futures = [
+                pool.submit(_extract_page_range, extractor.name, path, start, min(start + self.pages_per_task, pages))
+                for start in range(0, pages, self.pages_per_task)
+            ]
+            texts: List[str] = []
+            for future in futures:
+                texts.extend(future.result())
+        except Exception as e:
+            # A broken pool (e.g. no process support on the host) must not fail the upload
+            log.warning(f"Parallel PDF extraction failed, extracting sequentially: {e}")
+            self.stats["fallbacks"] += 1
+            self.shutdown()
+            return extractor.extract(data)
+        finally:
+            if path is not None:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        if len(texts) != pages:
+            # The ranges did not cover the document as counted; never return partial text
+            log.warning(f"Parallel PDF extraction returned {len(texts)} of {pages} pages, extracting sequentially")
+            self.stats["fallbacks"] += 1
+            return extractor.extract(data)
+        self.stats["parallel"] += 1
+        return extractor.page_joiner.join(texts), len(texts)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "min_pages": self.min_pages,
+            "max_pages": self.max_pages,
+            "workers": self.workers if self.enabled() else 0,
+            **self.stats,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pdf_text(
+    data: PdfData,
+    chain: Optional[Sequence[PdfExtractor]] = None,
+    parallel: Optional[PageParallelism] = None,
+) -> Tuple[str, str]:
+    """Text of a PDF and the backend that produced it ("" and "none" if all fail)"""
+    chain = list(chain or resolve_chain())
+    for position, extractor in enumerate(chain):
+        stats = extraction_stats[extractor.name]
+        try:
+            text, pages = parallel.extract(extractor, data) if parallel else extractor.extract(data)
+        except Exception as e:
+            stats["errors"] += 1
+            log.warning(f"PDF extractor {extractor.name} failed: {e}")
+            continue
+        if position == len(chain) - 1 or degenerate_reason(text, pages) is None:
+            stats["accepted"] += 1
+            return text, extractor.name
+        stats["rejected"] += 1
+    return "", "none"
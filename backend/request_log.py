@@ -0,0 +1,171 @@
+"""Per-request timing: ``Server-Timing`` headers and one JSON log line per request.
+
+``RequestTimingMiddleware`` traces every request (see ``metrics.trace_request``):
+the stage timers the handlers already run add to the trace, and when the
+response starts the stages are summed per group into a ``Server-Timing``
+header (``extract;dur=41.2, score;dur=3.1, total;dur=47.9``) that browser
+devtools show next to the request. After the response, one JSON line with
+route, status, sizes and timings goes to the ``cvision.requests`` logger.
+
+Logging never blocks a request: ``setup_json_logging`` puts a
+``QueueHandler`` on the app's logger and a ``QueueListener`` thread does the
+formatting and writing. Every record is a JSON object, and records logged
+while handling a request carry its ``request_id`` (also returned in the
+``X-Request-ID`` header) so errors can be matched to their request line.
+"""
+
+from typing import Callable, Dict, Optional, Sequence
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+import uuid
+
+from metrics import current_trace, trace_request
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; structured fields come from ``extra={"fields": {...}}``"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    # The default prepare() appends the traceback to the message; keep it in its own field
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class _RequestIdFilter(logging.Filter):
+    # Runs in the request's context (before the queue), so the trace is still current
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace = current_trace()
+        if trace is not None and not hasattr(record, "request_id"):
+            record.request_id = trace.attributes.get("request_id")
+        return True
+
+
+def setup_json_logging(logger: logging.Logger, level: int = logging.INFO, stream=None) -> logging.handlers.QueueListener:
+    """Route ``logger`` through a queue to a JSON stream handler; returns the started listener"""
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(_RequestIdFilter())
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def server_timing(stages: Dict[str, float], group: Callable[[str], Optional[str]], total: float) -> str:
+    """``Server-Timing`` value: stage seconds summed per group, plus the total so far"""
+    grouped: Dict[str, float] = {}
+    for stage, seconds in stages.items():
+        name = group(stage)
+        if name:
+            grouped[name] = grouped.get(name, 0.0) + seconds
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in grouped.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class RequestTimingMiddleware:
+    """ASGI middleware adding Server-Timing / X-Request-ID headers and logging each request"""
+
+    def __init__(
+        self,
+        app,
+        logger: logging.Logger,
+        group: Callable[[str], Optional[str]] = lambda stage: stage,
+        skip_log_paths: Sequence[str] = (),
+    ):
+        self.app = app
+        self.logger = logger
+        self.group = group
+        self.skip_log_paths = frozenset(skip_log_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+        request_bytes = [0]
+        response_bytes = [0]
+
+        with trace_request() as trace:
+            request_id = None
+            for key, value in scope.get("headers", ()):
+                if key == b"x-request-id":
+                    request_id = value.decode("latin-1")[:64]
+                    break
+            request_id = trace.attributes.setdefault("request_id", request_id or uuid.uuid4().hex[:16])
+
+            async def counting_receive():
+                message = await receive()
+                request_bytes[0] += len(message.get("body", b""))
+                return message
+
+            async def timing_send(message):
+                if message["type"] == "http.response.start":
+                    status[0] = message["status"]
+                    timing = server_timing(trace.stages, self.group, time.perf_counter() - start)
+                    message = {
+                        **message,
+                        "headers": [
+                            *message.get("headers", []),
+                            (b"server-timing", timing.encode("latin-1")),
+                            (b"x-request-id", request_id.encode("latin-1")),
+                        ],
+                    }
+                elif message["type"] == "http.response.body":
+                    response_bytes[0] += len(message.get("body", b""))
+                await send(message)
+
+            try:
+                await self.app(scope, counting_receive, timing_send)
+            finally:
+                if scope.get("path") not in self.skip_log_paths:
+                    route = scope.get("route")
+                    attributes = {k: v for k, v in trace.attributes.items() if k != "request_id"}
+                    self.logger.info("request", extra={"request_id": request_id, "fields": {
+                        "method": scope.get("method"),
+                        "route": getattr(route, "path", None),
+                        "path": scope.get("path"),
+                        "query": scope.get("query_string", b"").decode("latin-1") or None,
+                        "status": status[0],
+                        "request_bytes": request_bytes[0],
+                        "response_bytes": response_bytes[0],
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                        "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in trace.stages.items()},
+                        **({"attributes": attributes} if attributes else {}),
+                    }})
@@ -0,0 +1,198 @@
+"""Opt-in profiling of single requests, for reproducing slow analyses.
+
+With ``REQUEST_PROFILING=1`` the app installs ``ProfilingMiddleware``. A
+request that asks for a profile (``X-Profile: 1`` header or ``?profile=1``)
+and carries a valid admin token is run under ``cProfile``; everything else
+passes straight through. Without the setting the middleware is not
+installed at all, so normal traffic pays nothing.
+
+Each capture is saved under ``directory`` as ``<id>.prof`` (pstats format,
+for ``python -m pstats`` or snakeviz) and ``<id>.json`` (route, status,
+duration, the request's stage timings and notes such as the document hash,
+and the top functions). Only the newest ``max_profiles`` captures are kept.
+
+cProfile follows the event loop thread, so it sees the handler's own work
+(scoring runs there) but not work handed to other threads (text extraction,
+resume builds), whose time still shows in the capture's stage timings; it
+also sees other requests that interleave on the loop meanwhile. One
+request is profiled at a time; a second one asking concurrently is served
+unprofiled.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import secrets
+import threading
+import time
+
+from metrics import trace_request
+
+log = logging.getLogger("cvision")
+
+_PROFILE_ID = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$")
+
+
+class RequestProfiler:
+    """Stores request profiles on disk and lists them"""
+
+    def __init__(self, directory: str, max_profiles: int = 50, top: int = 40):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self.top = top
+        self._lock = threading.Lock()
+
+    def new_id(self) -> str:
+        return time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + "-" + secrets.token_hex(4)
+
+    def acquire(self) -> bool:
+        """Claim the profiler for one request; False while another request holds it"""
+        return self._lock.acquire(blocking=False)
+
+    def release(self):
+        self._lock.release()
+
+    def save(self, profile_id: str, profiler: cProfile.Profile, meta: Dict[str, Any]) -> Dict[str, Any]:
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(os.path.join(self.directory, f"{profile_id}.prof"))
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(self.top)
+        meta = {"id": profile_id, **meta, "summary": summary.getvalue()}
+        with open(os.path.join(self.directory, f"{profile_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        self._prune()
+        return meta
+
+    def _ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        # Ids start with their UTC timestamp, so name order is capture order
+        return sorted(n[:-5] for n in names if n.endswith(".json") and _PROFILE_ID.match(n[:-5]))
+
+    def _prune(self):
+        for profile_id in self._ids()[:-self.max_profiles or None]:
+            for suffix in (".json", ".prof"):
+                try:
+                    os.remove(os.path.join(self.directory, profile_id + suffix))
+                except OSError:
+                    pass
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Metadata of the stored profiles, newest first (without the text summary)"""
+        profiles = []
+        for profile_id in reversed(self._ids()):
+            meta = self.get(profile_id)
+            if meta is not None:
+                meta.pop("summary", None)
+                profiles.append(meta)
+        return profiles
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(os.path.join(self.directory, f"{profile_id}.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def stats_path(self, profile_id: str) -> Optional[str]:
+        """Path of the pstats dump of ``profile_id`` (None if unknown)"""
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.prof")
+        return path if os.path.exists(path) else None
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _wants_profile(scope) -> bool:
+    if _header(scope, b"x-profile") in ("1", "true"):
+        return True
+    return re.search(rb"(?:^|&)profile=(?:1|true)(?:&|$)", scope.get("query_string", b"")) is not None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware running admin-requested requests under cProfile"""
+
+    def __init__(self, app, profiler: RequestProfiler, authorize: Callable[[Optional[str]], bool]):
+        self.app = app
+        self.profiler = profiler
+        self.authorize = authorize
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _wants_profile(scope) or not self.authorize(_header(scope, b"x-admin-token")):
+            await self.app(scope, receive, send)
+            return
+        if not self.profiler.acquire():
+            await self.app(scope, receive, self._with_header(send, b"busy"))
+            return
+
+        profile_id = self.profiler.new_id()
+        status = [500]
+        request_bytes = [0]
+        response_bytes = [0]
+
+        async def counting_receive():
+            message = await receive()
+            request_bytes[0] += len(message.get("body", b""))
+            return message
+
+        labelled_send = self._with_header(send, profile_id.encode())
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes[0] += len(message.get("body", b""))
+            await labelled_send(message)
+
+        profiler = cProfile.Profile()
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            with trace_request() as trace:
+                profiler.enable()
+                try:
+                    await self.app(scope, counting_receive, counting_send)
+                finally:
+                    profiler.disable()
+        finally:
+            try:
+                route = scope.get("route")
+                self.profiler.save(profile_id, profiler, {
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "route": getattr(route, "path", None),
+                    "status": status[0],
+                    "started_at": started_at,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                    "request_bytes": request_bytes[0],
+                    "response_bytes": response_bytes[0],
+                    "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in trace.stages.items()},
+                    "attributes": dict(trace.attributes),
+                })
+            except Exception as e:
+                log.exception(f"Failed to save request profile {profile_id}: {e}")
+            finally:
+                self.profiler.release()
+
+    @staticmethod
+    def _with_header(send, value: bytes):
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", value)]}
+            await send(message)
+        return send_with_header
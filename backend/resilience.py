@@ -0,0 +1,174 @@
+"""Circuit breaker and token-bucket rate limiter for upstream APIs.
+
+Both fail fast instead of waiting: callers check ``allow``/``try_acquire``
+before the request and serve their fallback right away when the upstream is
+known to be unhealthy or the quota is used up.
+
+Breaker states:
+
+- ``closed``: calls go through; outcomes are kept in a sliding time window
+  and the breaker opens once the window holds at least ``min_calls`` calls
+  with a failure rate of ``failure_rate`` or more;
+- ``open``: calls are rejected for ``open_seconds``;
+- ``half_open``: up to ``half_open_calls`` trial calls go through; a success
+  closes the breaker, a failure opens it again.
+"""
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+
+class RateLimitedError(RuntimeError):
+    """Raised instead of calling an upstream whose request quota is used up"""
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker over a sliding time window"""
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window_seconds: float = 60.0,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self.stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def _trim(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self.stats["opened"] += 1
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; counts a rejection if not"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._trials < self.half_open_calls:
+            self._trials += 1
+            return True
+        self.stats["rejected"] += 1
+        return False
+
+    def check(self):
+        """Like ``allow`` but raises ``CircuitOpenError``"""
+        if not self.allow():
+            raise CircuitOpenError("Circuit open, upstream skipped")
+
+    def release(self):
+        """Give back a permitted call that was never made"""
+        if self._state == HALF_OPEN and self._trials:
+            self._trials -= 1
+
+    def record_success(self):
+        self.stats["successes"] += 1
+        if self._state == HALF_OPEN:
+            self._state = CLOSED
+            self._outcomes.clear()
+            return
+        now = self._clock()
+        self._outcomes.append((now, True))
+        self._trim(now)
+
+    def record_failure(self):
+        self.stats["failures"] += 1
+        if self._state == HALF_OPEN:
+            self._open()
+            return
+        now = self._clock()
+        self._outcomes.append((now, False))
+        self._trim(now)
+        calls = len(self._outcomes)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        if calls >= self.min_calls and failures / calls >= self.failure_rate:
+            self._open()
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        calls = len(self._outcomes)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return {
+            **self.stats,
+            "state": state,
+            "window_calls": calls,
+            "window_failure_rate": round(failures / calls, 4) if calls else 0.0,
+            "retry_in": round(max(0.0, self.open_seconds - (self._clock() - self._opened_at)), 1) if state == OPEN else 0.0,
+        }
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second"""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self.stats = {"granted": 0, "rejected": 0}
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` if available, without waiting"""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            self.stats["granted"] += 1
+            return True
+        self.stats["rejected"] += 1
+        return False
+
+    def acquire(self, tokens: float = 1.0):
+        """Like ``try_acquire`` but raises ``RateLimitedError``"""
+        if not self.try_acquire(tokens):
+            raise RateLimitedError("Request quota exhausted, upstream skipped")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "tokens": round(self.tokens, 2),
+            "capacity": self.capacity,
+            "rate_per_minute": round(self.rate * 60, 2),
+        }
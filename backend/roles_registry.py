@@ -0,0 +1,190 @@
+"""Versioned, hot-reloadable job roles dataset.
+
+``roles.json`` maps category -> role -> required skills. ``RolesRegistry``
+loads it into an immutable ``RolesSnapshot`` that carries everything derived
+from the data: sorted categories, canonical skill ids and per-role skill
+bitsets (see skill_taxonomy.py), the serialized category/role/skills
+response bodies with their ETags, and any artifacts registered by the app
+(e.g. the posting skill tagger). A reload builds a complete new snapshot
+off to the side and swaps it in with a single assignment, so a request
+that took ``registry.current()`` once keeps a consistent view even if the
+file changes mid-request.
+
+Reloads happen when the file's mtime or size changes (checked at most every
+``check_interval`` seconds, on access) or when ``reload()`` is called. A
+file that fails to parse never replaces a working snapshot.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from skill_taxonomy import SkillTaxonomy
+
+log = logging.getLogger("cvision")
+
+RolesData = Dict[str, Dict[str, List[str]]]
+
+
+try:
+    import orjson  # installed with fastapi; several times faster than json for these bodies
+
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(value)
+except ImportError:
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class SerializedBody:
+    """A JSON response body serialized once, with a strong ETag over its bytes"""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, value: Any):
+        self.body = _dumps(value)
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=10).hexdigest() + '"'
+
+
+class RolesSnapshot:
+    """One immutable version of the roles dataset and its precompiled artifacts"""
+
+    def __init__(
+        self,
+        dataset: RolesData,
+        version: str,
+        taxonomy: Optional[SkillTaxonomy] = None,
+        artifact_builders: Optional[Dict[str, Callable[["RolesSnapshot"], Any]]] = None,
+    ):
+        # Interned so the many repeated skill names share one string object
+        self.dataset: RolesData = {
+            sys.intern(category): {sys.intern(role): [sys.intern(s) for s in skills] for role, skills in roles.items()}
+            for category, roles in dataset.items()
+        }
+        self.version = version
+        self.loaded_at = time.time()
+        self.categories: List[str] = sorted(self.dataset)
+
+        # Canonical skill ids cover the taxonomy plus every skill a role asks for
+        role_skills = {s.lower() for roles in self.dataset.values() for skills in roles.values() for s in skills}
+        self.taxonomy = (taxonomy or SkillTaxonomy({})).extended(role_skills)
+        self.skill_names: List[str] = self.taxonomy.names
+        self.skill_ids: Dict[str, int] = self.taxonomy.ids
+        self.role_skill_ids: Dict[Tuple[str, str], Tuple[int, ...]] = {
+            (category, role): tuple(self.skill_ids[s.lower()] for s in skills)
+            for category, roles in self.dataset.items()
+            for role, skills in roles.items()
+        }
+
+        # Response bodies, serialized once per version
+        self.categories_body = SerializedBody({"categories": self.categories})
+        # Nested shape the frontend falls back to: { category: { role: { description, required_skills } } }
+        self.roles_body = SerializedBody({
+            category: {role: {"description": "", "required_skills": skills} for role, skills in roles.items()}
+            for category, roles in self.dataset.items()
+        })
+        self.category_roles_bodies: Dict[str, SerializedBody] = {
+            category: SerializedBody({"category": category, "roles": sorted(roles)})
+            for category, roles in self.dataset.items()
+        }
+        self.role_skills_bodies: Dict[Tuple[str, str], SerializedBody] = {
+            (category, role): SerializedBody({"category": category, "role": role, "skills": skills})
+            for category, roles in self.dataset.items()
+            for role, skills in roles.items()
+        }
+
+        self.artifacts: Dict[str, Any] = {}
+        for name, build in (artifact_builders or {}).items():
+            self.artifacts[name] = build(self)
+
+    def skills(self, category: Optional[str], role: Optional[str]) -> Optional[List[str]]:
+        """Required skills of a role, or None if the category or role is unknown"""
+        return self.dataset.get(category or "", {}).get(role or "")
+
+    def category_roles_body(self, category: str) -> SerializedBody:
+        body = self.category_roles_bodies.get(category)
+        return body if body is not None else SerializedBody({"category": category, "roles": []})
+
+    def role_skills_body(self, category: str, role: str) -> Optional[SerializedBody]:
+        return self.role_skills_bodies.get((category, role))
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "categories": len(self.categories),
+            "roles": len(self.role_skill_ids),
+            "skills": len(self.skill_names),
+        }
+
+
+class RolesRegistry:
+    """Holds the current ``RolesSnapshot`` and swaps in a new one when roles.json changes"""
+
+    def __init__(
+        self,
+        path: str,
+        check_interval: float = 2.0,
+        taxonomy: Optional[SkillTaxonomy] = None,
+        artifact_builders: Optional[Dict[str, Callable[[RolesSnapshot], Any]]] = None,
+    ):
+        self.path = path
+        self.check_interval = check_interval
+        self.taxonomy = taxonomy
+        self.artifact_builders = dict(artifact_builders or {})
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self.reloads = 0
+        dataset, version = self._read()
+        self._snapshot = RolesSnapshot(dataset, version, self.taxonomy, self.artifact_builders)
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read(self) -> Tuple[RolesData, str]:
+        """Parsed dataset and content version; an unreadable file yields an empty dataset"""
+        self._signature = self._stat()
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            return json.loads(raw), hashlib.sha1(raw).hexdigest()[:12]
+        except Exception as e:
+            log.error(f"Failed to load roles dataset {self.path}: {e}")
+            return {}, "empty"
+
+    def current(self) -> RolesSnapshot:
+        """The active snapshot; checks the file for changes at most every check_interval seconds"""
+        if self.check_interval > 0 and time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + self.check_interval
+            if self._stat() != self._signature:
+                self.reload()
+        return self._snapshot
+
+    def reload(self) -> RolesSnapshot:
+        """Re-read roles.json and swap in the new version (a broken file keeps the old one)"""
+        with self._lock:
+            signature = self._stat()
+            try:
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                version = hashlib.sha1(raw).hexdigest()[:12]
+                if version != self._snapshot.version:
+                    snapshot = RolesSnapshot(json.loads(raw), version, self.taxonomy, self.artifact_builders)
+                    self._snapshot = snapshot
+                    self.reloads += 1
+                    log.info(f"Roles dataset reloaded: version {version}")
+            except Exception as e:
+                log.error(f"Roles dataset reload failed, keeping version {self._snapshot.version}: {e}")
+            # Remember the signature even on failure so a broken file is not re-parsed on every request
+            self._signature = signature
+            return self._snapshot
@@ -0,0 +1,89 @@
+"""Skill tagging of job postings.
+
+Postings from Adzuna carry no tags, so filters and matching that look at
+``tags`` find nothing for live jobs. ``SkillTagger`` derives tags from the
+title and description with the same skill vocabulary the resume analyzer
+uses (role skills plus their aliases).
+
+Every vocabulary phrase is compiled once into a dict keyed by its token
+tuple, so tagging a posting is a single pass over its tokens with one dict
+lookup per n-gram. Results are cached per posting id and content hash,
+because the same postings come back on every page refresh.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+import zlib
+
+_TOKEN_RE = re.compile(r"[a-z0-9+.#-]+")
+
+
+def _phrase_key(tokens: Iterable[str]) -> Tuple[str, ...]:
+    # Same leniency as tokens_contain in main: punctuation inside a token is ignored
+    return tuple(t for t in (re.sub(r"[^a-z0-9+#]+", "", tok) for tok in tokens) if t)
+
+
+class SkillTagger:
+    """Extracts vocabulary skills from posting text in one pass per posting"""
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, Iterable[str]],
+        labels: Optional[Dict[str, str]] = None,
+        exclude: Iterable[str] = (),
+        max_tags: int = 10,
+        cache_size: int = 4096,
+    ):
+        excluded = {e.lower() for e in exclude}
+        labels = labels or {}
+        self.max_tags = max_tags
+        self.cache_size = cache_size
+        self._phrases: Dict[Tuple[str, ...], List[str]] = {}
+        for skill, aliases in vocabulary.items():
+            label = labels.get(skill.lower()) or skill
+            for phrase in [skill, *aliases]:
+                if phrase.lower() in excluded and phrase != skill:
+                    continue
+                key = _phrase_key(_TOKEN_RE.findall(phrase.lower()))
+                if key and label not in self._phrases.setdefault(key, []):
+                    self._phrases[key].append(label)
+        self._max_len = max((len(k) for k in self._phrases), default=0)
+        self._cache: "OrderedDict[Tuple[str, int], List[str]]" = OrderedDict()
+        self.stats = {"tagged": 0, "cache_hits": 0}
+
+    def extract(self, text: str) -> List[str]:
+        """Skills mentioned in ``text``, in order of first mention"""
+        tokens = _phrase_key(_TOKEN_RE.findall((text or "").lower()))
+        found: Dict[str, None] = {}
+        for i in range(len(tokens)):
+            for n in range(1, min(self._max_len, len(tokens) - i) + 1):
+                for label in self._phrases.get(tokens[i:i + n], ()):
+                    found.setdefault(label)
+            if len(found) >= self.max_tags:
+                break
+        return list(found)[:self.max_tags]
+
+    def tags_for(self, job: Dict) -> List[str]:
+        """Tags of one posting, served from the cache when unchanged"""
+        text = f"{job.get('title', '')}\n{job.get('description', '')}"
+        key = (str(job.get("id", "")), zlib.crc32(text.encode("utf-8")))
+        tags = self._cache.get(key)
+        if tags is not None:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return list(tags)
+        tags = self.extract(text)
+        self.stats["tagged"] += 1
+        self._cache[key] = tags
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return list(tags)
+
+    def tag(self, jobs: Iterable[Dict]) -> List[Dict]:
+        """Fill in ``tags`` of every posting in the batch that has none"""
+        jobs = list(jobs)
+        for job in jobs:
+            if not job.get("tags"):
+                job["tags"] = self.tags_for(job)
+        return jobs
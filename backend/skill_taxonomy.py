@@ -0,0 +1,116 @@
+"""Canonical skill taxonomy with integer ids and bitset skill sets.
+
+``skills_taxonomy.json`` lists canonical skills with their aliases (and
+display labels). Aliases can name other canonical skills ("react" lists
+"next.js", which has aliases of its own), so each skill's match terms are
+the transitive closure over that graph. Every canonical skill gets a dense
+integer id, and a set of skills is a plain ``int`` with bit ``id`` set: role
+requirements, what a resume mentions, and the diff between them are single
+integer operations.
+
+The reverse map goes from any term (lower-cased, and punctuation-free
+"compact" form) to the bitset of canonical skills it denotes, so the exact
+matches in a resume are found with one dictionary lookup per resume term.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import json
+import re
+
+
+def compact_term(term: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "", term.lower())
+
+
+class SkillTaxonomy:
+    """Canonical skills, their alias closures and the term -> skills reverse map"""
+
+    def __init__(self, aliases: Dict[str, Sequence[str]], labels: Optional[Dict[str, str]] = None, extra_skills: Iterable[str] = ()):
+        self.aliases: Dict[str, List[str]] = {skill.lower(): list(terms) for skill, terms in aliases.items()}
+        self.labels: Dict[str, str] = dict(labels or {})
+        self.names: List[str] = sorted(set(self.aliases) | {s.lower() for s in extra_skills})
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        # Match terms per id: the skill itself first, then its alias closure in discovery order
+        self.terms: List[Tuple[str, ...]] = [self._closure(name) for name in self.names]
+        self.compact_terms: List[Tuple[str, ...]] = [
+            tuple(dict.fromkeys(c for c in map(compact_term, terms) if c)) for terms in self.terms
+        ]
+
+        self.lowered_bits: Dict[str, int] = {}
+        self.compacted_bits: Dict[str, int] = {}
+        for skill_id, terms in enumerate(self.terms):
+            bit = 1 << skill_id
+            for term in terms:
+                lowered, compacted = term.lower(), compact_term(term)
+                self.lowered_bits[lowered] = self.lowered_bits.get(lowered, 0) | bit
+                if compacted:
+                    self.compacted_bits[compacted] = self.compacted_bits.get(compacted, 0) | bit
+
+    def _closure(self, name: str) -> Tuple[str, ...]:
+        terms = [name]
+        seen = {name}
+        stack = list(reversed(self.aliases.get(name, [])))
+        while stack:
+            term = stack.pop()
+            if term.lower() in seen:
+                continue
+            seen.add(term.lower())
+            terms.append(term)
+            stack.extend(reversed(self.aliases.get(term.lower(), [])))
+        return tuple(terms)
+
+    @classmethod
+    def load(cls, path: str, extra_skills: Iterable[str] = ()) -> "SkillTaxonomy":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("aliases", {}), data.get("labels", {}), extra_skills)
+
+    def extended(self, extra_skills: Iterable[str]) -> "SkillTaxonomy":
+        """A taxonomy that also knows ``extra_skills`` (e.g. every role's skills)"""
+        return SkillTaxonomy(self.aliases, self.labels, list(extra_skills) + self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def id(self, skill: str) -> Optional[int]:
+        return self.ids.get(skill.lower())
+
+    def label(self, skill: str) -> str:
+        skill = skill.lower()
+        return self.labels.get(skill, skill.title() if " " in skill else skill.capitalize())
+
+    def skill_terms(self, skill: str) -> Tuple[str, ...]:
+        """Terms that count as a mention of ``skill`` (just the skill itself if unknown)"""
+        skill_id = self.id(skill)
+        return self.terms[skill_id] if skill_id is not None else (skill,)
+
+    def bits(self, skills: Iterable[str]) -> int:
+        """Bitset of the known skills among ``skills``"""
+        bits = 0
+        for skill in skills:
+            skill_id = self.ids.get(skill.lower())
+            if skill_id is not None:
+                bits |= 1 << skill_id
+        return bits
+
+    def term_bits(self, lowered_terms: Iterable[str], compacted_terms: Iterable[str]) -> int:
+        """Skills denoted exactly by any of the given (lower-cased / compacted) terms"""
+        bits = 0
+        lowered_bits, compacted_bits = self.lowered_bits, self.compacted_bits
+        for term in lowered_terms:
+            bits |= lowered_bits.get(term, 0)
+        for term in compacted_terms:
+            bits |= compacted_bits.get(term, 0)
+        return bits
+
+    @staticmethod
+    def iter_ids(bits: int) -> Iterator[int]:
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def has(self, bits: int, skill: str) -> bool:
+        skill_id = self.id(skill)
+        return skill_id is not None and bool(bits >> skill_id & 1)
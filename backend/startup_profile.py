@@ -0,0 +1,140 @@
+"""Boot-time profile of the app: phases, imports and lazily loaded subsystems.
+
+A boot has three phases: ``import`` (module-level imports), ``app``
+(building the app: routes, registries, caches) and ``warmup`` (optional
+preloading in the startup hook, see ``STARTUP_WARMUP``). While the profile
+is recording, an ``__import__`` hook times every first import made from
+our own code, inclusive of whatever it pulls in, and attributes it to the
+top-level package. Heavy subsystems are not imported at boot at all; they
+go through ``lazy()`` loaders whose first call is timed into the same
+report, so the cost that moved out of startup stays visible.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import builtins
+import functools
+import logging
+import sys
+import threading
+import time
+
+log = logging.getLogger("cvision")
+
+
+class StartupProfile:
+    """Phase timings, import profile and lazy-load timings of one boot"""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.started_at = time.time()
+        self._mark = clock()
+        self.phases: List[Tuple[str, float]] = []
+        self.imports: Dict[str, float] = {}
+        self.lazy_loads: Dict[str, float] = {}
+        self.warmups: Dict[str, Callable[[], Any]] = {}
+        self._original_import: Optional[Callable] = None
+        self._depth = 0
+
+    # ---- import profile ----
+
+    def install_import_hook(self):
+        """Start timing first-time imports (until ``finish``)"""
+        if self._original_import is not None:
+            return
+        original = self._original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Only the outermost new import is timed; nested ones are part of it
+            if self._depth or level or name in sys.modules or threading.current_thread() is not threading.main_thread():
+                return original(name, globals, locals, fromlist, level)
+            self._depth += 1
+            start = self._clock()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+                package = name.partition(".")[0]
+                self.imports[package] = self.imports.get(package, 0.0) + self._clock() - start
+
+        builtins.__import__ = timed_import
+
+    def remove_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    # ---- phases ----
+
+    def end_phase(self, name: str):
+        """Close the phase that started at the previous mark"""
+        now = self._clock()
+        self.phases.append((name, now - self._mark))
+        self._mark = now
+
+    def skip_to_now(self):
+        """Exclude the time since the last mark (e.g. server setup before the startup hook)"""
+        self._mark = self._clock()
+
+    # ---- lazy subsystems and warmup ----
+
+    def lazy(self, name: str, warmup: bool = True) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+        """Decorator: run a loader once, on first use, and record how long it took.
+
+        With ``warmup`` the loader can also be run ahead of time via ``STARTUP_WARMUP``.
+        """
+        def decorate(load: Callable[[], Any]) -> Callable[[], Any]:
+            lock = threading.Lock()
+            result: List[Any] = []
+
+            @functools.wraps(load)
+            def get() -> Any:
+                if not result:
+                    with lock:
+                        if not result:
+                            start = self._clock()
+                            value = load()
+                            self.lazy_loads[name] = self._clock() - start
+                            result.append(value)
+                return result[0]
+
+            get.loaded = lambda: bool(result)
+            if warmup:
+                self.add_warmup(name, get)
+            return get
+        return decorate
+
+    def add_warmup(self, name: str, warm: Callable[[], Any]):
+        self.warmups.setdefault(name, warm)
+
+    def warmup(self, names: List[str]) -> Dict[str, str]:
+        """Load the named subsystems now ("all" for every one); returns per-name status"""
+        selected = list(self.warmups) if "all" in names else [n for n in names if n in self.warmups]
+        status = {}
+        for name in selected:
+            try:
+                self.warmups[name]()
+                status[name] = "ok"
+            except Exception as e:
+                log.warning(f"Warmup of {name} failed: {e}")
+                status[name] = f"failed: {e}"
+        return status
+
+    # ---- report ----
+
+    def finish(self):
+        """Stop recording imports; the boot is over"""
+        self.remove_import_hook()
+
+    def report(self, top: int = 15) -> Dict[str, Any]:
+        phases = {name: round(seconds, 4) for name, seconds in self.phases}
+        return {
+            "started_at": self.started_at,
+            "phases": phases,
+            "total_seconds": round(sum(phases.values()), 4),
+            "modules_loaded": len(sys.modules),
+            "imports": [
+                {"package": package, "seconds": round(seconds, 4)}
+                for package, seconds in sorted(self.imports.items(), key=lambda item: -item[1])[:top]
+            ],
+            "lazy_loads": {name: round(seconds, 4) for name, seconds in self.lazy_loads.items()},
+        }
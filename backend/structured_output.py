@@ -0,0 +1,238 @@
+"""Structured-output parsing for LLM replies.
+
+Models rarely return exactly the JSON we asked for: replies come wrapped in
+code fences or prose, carry trailing commas, or drop fields. This module
+turns such a reply into a validated object without another paid completion
+whenever a cheap local fix is enough:
+
+1. find the balanced ``{...}`` objects in the reply and take the first
+   one that decodes as JSON;
+2. if none does, repair common syntax slips (trailing commas, smart quotes
+   around keys and values, Python literals) and decode again;
+3. check that the reply itself provides the fields no local default can
+   stand in for (``required_fields``), so an unrelated object such as
+   ``{"error": "rate limited"}`` is not passed off as an answer;
+4. fill other missing or invalid top-level fields from caller-supplied
+   defaults;
+5. validate against a precompiled pydantic ``TypeAdapter``.
+
+Only when no usable JSON can be recovered locally should the caller spend
+its single repair completion (see ``build_repair_prompt``).
+"""
+
+from pydantic import TypeAdapter, ValidationError
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import json
+import re
+
+
+class StructuredOutputError(ValueError):
+    """Raised when no valid object can be recovered from a reply"""
+
+
+def _balanced_objects(text: str) -> Iterator[str]:
+    """Balanced ``{...}`` spans of ``text`` in order, ignoring braces inside strings"""
+    if not text:
+        return
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = False
+        escaped = False
+        end = -1
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    end = i + 1
+                    break
+        if end != -1:
+            yield text[start:end]
+            # Continue after this object, not inside it
+            start = text.find("{", end)
+        else:
+            # Unbalanced from this brace; try the next candidate
+            start = text.find("{", start + 1)
+
+
+def _loads(candidate: str) -> Optional[Any]:
+    try:
+        return json.loads(candidate)
+    except (ValueError, RecursionError):
+        return None
+
+
+_OPEN_QUOTES = {"“": "”", "”": "”"}
+_SINGLE_SMART_QUOTES = {"‘": "'", "’": "'"}
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+def _repair_json(candidate: str) -> str:
+    """Fix trailing commas, smart quotes and Python literals outside of strings.
+
+    A string opened by a smart quote is closed by the matching smart quote;
+    curly quotes inside ordinary strings are content and left alone.
+    """
+    out: List[str] = []
+    closer: Optional[str] = None  # quote that ends the current string, None outside strings
+    escaped = False
+    i = 0
+    n = len(candidate)
+    while i < n:
+        ch = candidate[i]
+        if closer is not None:
+            if escaped:
+                escaped = False
+                out.append(ch)
+            elif ch == "\\":
+                escaped = True
+                out.append(ch)
+            elif ch == closer:
+                out.append('"')
+                closer = None
+            elif ch == '"':
+                # A straight quote inside a smart-quoted string is content
+                out.append('\\"')
+            else:
+                out.append(ch)
+            i += 1
+            continue
+        if ch == '"' or ch in _OPEN_QUOTES:
+            closer = '"' if ch == '"' else _OPEN_QUOTES[ch]
+            out.append('"')
+            i += 1
+            continue
+        if ch == ",":
+            j = i + 1
+            while j < n and candidate[j].isspace():
+                j += 1
+            if j < n and candidate[j] in "}]":
+                i += 1
+                continue
+        if ch.isalpha():
+            match = _WORD_RE.match(candidate, i)
+            if match is not None:
+                word = match.group(0)
+                out.append(_PY_LITERALS.get(word, word))
+                i += len(word)
+                continue
+        out.append(_SINGLE_SMART_QUOTES.get(ch, ch))
+        i += 1
+    return "".join(out)
+
+
+def decode_json_object(text: str) -> Dict[str, Any]:
+    """Decode the first JSON object in ``text``, repairing it if none decodes as-is"""
+    candidates = list(_balanced_objects(text))
+    if not candidates:
+        raise StructuredOutputError("No JSON object found in reply")
+    for candidate in candidates:
+        data = _loads(candidate)
+        if isinstance(data, dict):
+            return data
+    error = "no candidate decodes"
+    for candidate in candidates:
+        try:
+            data = json.loads(_repair_json(candidate))
+        except (ValueError, RecursionError) as e:
+            error = str(e)
+            continue
+        if isinstance(data, dict):
+            return data
+    raise StructuredOutputError(f"Invalid JSON: {error}")
+
+
+def validate_with_defaults(
+    data: Dict[str, Any],
+    adapter: TypeAdapter,
+    defaults: Callable[[], Dict[str, Any]],
+    required_keys: Optional[Dict[str, Iterable[str]]] = None,
+    required_fields: Iterable[str] = (),
+) -> Tuple[Any, bool]:
+    """Validate ``data``, filling missing or invalid top-level fields from ``defaults()``.
+
+    ``required_fields`` must come valid from ``data`` itself; if any is
+    missing or invalid, ``StructuredOutputError`` is raised instead of
+    filling it. ``required_keys`` lists keys that free-form dict fields must
+    carry; a dict missing any of them is completed from the defaults as
+    well. ``defaults``
+    is only called when something needs filling, so expensive local scoring
+    is skipped for well-formed replies. Returns the validated object and
+    whether any field was filled.
+    """
+    required_fields = list(required_fields)
+    missing = [field for field in required_fields if data.get(field) is None]
+    if missing:
+        raise StructuredOutputError(f"Reply lacks required fields: {', '.join(missing)}")
+    bad_fields = {
+        field for field, keys in (required_keys or {}).items()
+        if not isinstance(data.get(field), dict) or not set(keys) <= data[field].keys()
+    }
+    try:
+        validated = adapter.validate_python(data)
+        if not bad_fields:
+            return validated, False
+    except ValidationError as e:
+        bad_fields |= {err["loc"][0] for err in e.errors() if err.get("loc")}
+    invalid = [field for field in required_fields if field in bad_fields]
+    if invalid:
+        raise StructuredOutputError(f"Reply has invalid required fields: {', '.join(invalid)}")
+
+    fallback = defaults()
+    patched = dict(data)
+    for field in bad_fields:
+        if field in fallback:
+            value = fallback[field]
+            current = patched.get(field)
+            # Keep the valid parts of partially correct nested objects
+            if isinstance(value, dict) and isinstance(current, dict):
+                value = {**value, **{k: v for k, v in current.items() if k in value}}
+            patched[field] = value
+    try:
+        return adapter.validate_python(patched), True
+    except ValidationError:
+        # Nested values were still invalid; fall back to the local values wholesale
+        for field in bad_fields:
+            if field in fallback:
+                patched[field] = fallback[field]
+        try:
+            return adapter.validate_python(patched), True
+        except ValidationError as e:
+            raise StructuredOutputError(f"Reply does not match schema: {e.error_count()} errors") from e
+
+
+def parse_structured(
+    text: str,
+    adapter: TypeAdapter,
+    defaults: Callable[[], Dict[str, Any]],
+    required_keys: Optional[Dict[str, Iterable[str]]] = None,
+    required_fields: Iterable[str] = (),
+) -> Tuple[Any, bool]:
+    """Parse an LLM reply into a validated object; see module docstring"""
+    return validate_with_defaults(decode_json_object(text), adapter, defaults, required_keys, required_fields)
+
+
+def build_repair_prompt(reply: str, error: str, max_chars: int = 4000) -> str:
+    """Prompt asking the model to re-emit its own reply as valid JSON.
+
+    Only the broken reply is sent back, not the original input, which keeps
+    the repair completion small and cheap.
+    """
+    return (
+        "The following reply was supposed to be a single JSON object but could not be parsed "
+        f"({error}). Return ONLY the corrected JSON object, with no prose and no code fences.\n\n"
+        f"{reply[:max_chars]}"
+    )
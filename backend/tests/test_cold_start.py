@@ -0,0 +1,49 @@
+"""Cold-start budget for the FastAPI app.
+
+Each check imports ``main`` in a fresh interpreter, the way a worker or a
+serverless instance boots. Heavy subsystems must stay out of the boot, and
+the import + app phases must fit the budget (COLD_START_BUDGET seconds;
+generous by default so slow CI machines pass, tighten it locally).
+
+    python -m pytest tests/test_cold_start.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_SECONDS = float(os.environ.get("COLD_START_BUDGET", "1.5"))
+
+# Loaded on first use only (see the startup_profile.lazy loaders in main.py)
+LAZY_MODULES = ("openai", "httpx", "docx", "numpy", "pdfminer", "smtplib", "multiprocessing", "job_index", "job_matching")
+
+_BOOT = """
+import json, sys
+import main
+print(json.dumps({"report": main.startup_profile.report(), "modules": sorted(sys.modules)}))
+"""
+
+
+def boot() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _BOOT],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_subsystems_are_not_imported_at_boot():
+    modules = set(boot()["modules"])
+    loaded = [name for name in LAZY_MODULES if name in modules]
+    assert not loaded, f"imported at boot: {loaded}"
+
+
+def test_boot_fits_the_budget():
+    # Best of three: the budget is about regressions, not scheduler noise
+    seconds = min(sum(boot()["report"]["phases"].values()) for _ in range(3))
+    assert seconds <= BUDGET_SECONDS, f"import + app took {seconds:.3f}s (budget {BUDGET_SECONDS}s)"
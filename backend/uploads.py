@@ -0,0 +1,128 @@
+"""Size-capped resume uploads, read in place instead of copied around.
+
+The multipart parser already spools each uploaded file into a
+``SpooledTemporaryFile`` (in memory up to 1 MB, then on disk).
+``UploadedDocument`` works on that spool directly: its size comes from a
+seek, its SHA-256 from one chunked pass in the threadpool next to
+extraction (or from ``read``, which holds the bytes anyway), the
+extractors read the same file object, and saving the upload copies it in
+chunks. A request holds at most the spool itself, not two or three
+``bytes`` copies of the file.
+
+``UploadLimitMiddleware`` caps the request body of the upload routes while
+it streams in: a ``Content-Length`` over the limit is refused before the
+body is read, and a body that keeps going past the limit (chunked
+encoding, lying header) is cut off as soon as it crosses it.
+"""
+
+from typing import BinaryIO, Optional, Sequence
+import hashlib
+import json
+import os
+import shutil
+
+from fastapi import HTTPException, UploadFile
+
+CHUNK_SIZE = 1024 * 1024
+# Multipart framing and the small form fields next to the file
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload too large (limit {max_bytes // (1024 * 1024)} MB)")
+
+
+class UploadLimitMiddleware:
+    """ASGI middleware rejecting request bodies over ``max_bytes`` on ``paths``, while streaming"""
+
+    def __init__(self, app, max_bytes: int, paths: Sequence[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.max_body = max_bytes + FORM_OVERHEAD_BYTES
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") not in self.paths or self.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        for key, value in scope.get("headers", ()):
+            if key == b"content-length" and value.isdigit() and int(value) > self.max_body:
+                await self._reject(send)
+                return
+
+        received = [0]
+
+        async def limited_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                received[0] += len(message.get("body", b""))
+                if received[0] > self.max_body:
+                    # Raised inside form parsing; FastAPI re-raises HTTPExceptions from there as-is
+                    raise _too_large(self.max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": _too_large(self.max_bytes).detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class UploadedDocument:
+    """An uploaded file read in place: size, hash, the stream for extractors, and saving"""
+
+    def __init__(self, upload: UploadFile, max_bytes: int = 0):
+        self.filename = upload.filename or ""
+        self.file: BinaryIO = upload.file
+        self.file.seek(0, os.SEEK_END)
+        self.size = self.file.tell()
+        self.file.seek(0)
+        if max_bytes > 0 and self.size > max_bytes:
+            raise _too_large(max_bytes)
+        self._sha256: Optional[str] = None
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.filename.lower())[1]
+
+    @property
+    def sha256(self) -> str:
+        """SHA-256 of the content, in one chunked pass over the spool (computed once)"""
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            for chunk in self.chunks():
+                digest.update(chunk)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    def chunks(self):
+        self.file.seek(0)
+        while True:
+            chunk = self.file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    def stream(self) -> BinaryIO:
+        """The spooled file at offset 0, for extractors that take a binary file"""
+        self.file.seek(0)
+        return self.file
+
+    def read(self) -> bytes:
+        """The whole content as bytes (the one copy, for plain-text decoding), hashed on the way"""
+        self.file.seek(0)
+        data = self.file.read()
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(data).hexdigest()
+        return data
+
+    def save(self, path: str):
+        self.file.seek(0)
+        with open(path, "wb") as out:
+            shutil.copyfileobj(self.file, out, CHUNK_SIZE)
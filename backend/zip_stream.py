@@ -0,0 +1,50 @@
+"""Streaming ZIP archives.
+
+``stream_zip`` turns an async iterator of ``(name, bytes)`` entries into an
+async iterator of archive chunks, emitting each entry as soon as it arrives
+instead of building the whole archive in memory first. ``zipfile`` writes
+to the non-seekable sink with data descriptors, so no back-patching of
+headers is needed and the output is a standard archive.
+"""
+
+from typing import AsyncIterable, AsyncIterator, List, Tuple
+import io
+import zipfile
+
+
+class ZipSink(io.RawIOBase):
+    """Write-only, non-seekable buffer that hands out what was written so far"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_zip(
+    entries: AsyncIterable[Tuple[str, bytes]],
+    compression: int = zipfile.ZIP_STORED,
+) -> AsyncIterator[bytes]:
+    """Yield a ZIP archive chunk by chunk, one chunk per entry plus the directory.
+
+    The default ``ZIP_STORED`` suits entries that are already compressed
+    (DOCX files are ZIP archives themselves).
+    """
+    sink = ZipSink()
+    archive = zipfile.ZipFile(sink, "w", compression)
+    async for name, data in entries:
+        archive.writestr(name, data)
+        yield sink.drain()
+    archive.close()
+    yield sink.drain()